@@ -0,0 +1,33 @@
+import os
+
+from fastapi import APIRouter, Depends
+
+from db import cache
+from services.login_history import login_history_writer
+from services.outbox import outbox_relay
+from services.revocation import revocation_filter
+from services.token_validation import require_service_token
+from services.user_agents import user_agent_cache
+
+router = APIRouter(prefix='/internal', tags=['internal'])
+
+
+@router.get(
+    '/metrics',
+    summary='Счётчики кешей и фоновых задач воркера',
+    dependencies=[Depends(require_service_token)]
+)
+async def metrics() -> dict:
+    """
+    Счётчики процесса, обработавшего запрос: у каждого воркера gunicorn
+    свои кеши и буферы, поэтому сборщик метрик опрашивает их по pid.
+    Доступ - по ключу сервиса, как у /auth/introspect.
+    """
+    return {
+        'pid': os.getpid(),
+        'cache': cache.cache_storage.stats(),
+        'revocation_filter': revocation_filter.stats(),
+        'login_history': login_history_writer.stats(),
+        'outbox': outbox_relay.stats(),
+        'user_agents': user_agent_cache.stats(),
+    }
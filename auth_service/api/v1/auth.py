@@ -1,21 +1,26 @@
-from fastapi import Depends, APIRouter, status, Request
+import time
+
+from fastapi import Depends, APIRouter, status, Request, Response
 from fastapi.security import (
     HTTPBearer, OAuth2PasswordRequestForm, HTTPAuthorizationCredentials
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from redis.asyncio import Redis
 
-from models.user import User
+from schemas.token import IntrospectRequest, IntrospectResponse
 from schemas.user import (
     UserCreate, UserLoginRequest, UserInDB,
-    TokenResponse, ChangeCredentialsRequest
+    TokenResponse, ChangeCredentialsRequest, UserPrincipal
+)
+from core.config import settings
+from services.token_validation import (
+    introspect_tokens, require_service_token, verify_authorization
 )
 from services.user import get_current_user
 from services.registration import AuthService, get_auth_service
 from services.user_profile import change_user_credentials
 from services.authentication import authenticate_user, handle_refresh_token
 from db.postgres import get_session
-from db.cache import get_cache_storage
+from db.cache import CacheStorage, get_cache_storage
 
 
 refresh_scheme = HTTPBearer()
@@ -64,14 +69,15 @@ async def login(
 async def refresh_token(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(refresh_scheme),
-    redis: Redis = Depends(get_cache_storage),
+    redis: CacheStorage = Depends(get_cache_storage),
+    session: AsyncSession = Depends(get_session),
 ) -> TokenResponse:
     """
     Принимает refresh-токен в Authorization: Bearer <token>.
     Возвращает новую пару токенов для того же device_id.
     """
     token = credentials.credentials
-    return await handle_refresh_token(token, redis, request)
+    return await handle_refresh_token(token, redis, request, session)
 
 
 @router.post(
@@ -81,9 +87,66 @@ async def refresh_token(
 )
 async def change_credentials(
     data: ChangeCredentialsRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
     """Изменение логина и/или пароля текущего пользователя."""
     await change_user_credentials(user_id=current_user.id, data=data, db=db)
     return {'message': 'Данные успешно изменены'}
+
+
+@router.post(
+    '/introspect',
+    response_model=IntrospectResponse,
+    summary='Пакетная проверка access-токенов',
+    dependencies=[Depends(require_service_token)]
+)
+async def introspect(
+    data: IntrospectRequest,
+    cache: CacheStorage = Depends(get_cache_storage),
+) -> IntrospectResponse:
+    """
+    Проверяет подпись, срок действия и отзыв пакета access-токенов.
+    Только для внутренних сервисов с заголовком X-Service-Token.
+    Для каждого токена возвращает признак активности, пользователя,
+    роли и срок действия; результаты идут в порядке запроса.
+    """
+    return IntrospectResponse(
+        results=await introspect_tokens(cache, data.tokens)
+    )
+
+
+@router.get(
+    '/verify',
+    response_class=Response,
+    status_code=status.HTTP_200_OK,
+    summary='Проверка access-токена для nginx auth_request'
+)
+async def verify(
+    request: Request,
+    cache: CacheStorage = Depends(get_cache_storage),
+) -> Response:
+    """
+    Проверяет access-токен из заголовка Authorization без обращения к БД.
+    Ответ без тела: 200 с заголовками X-User-Id и X-User-Roles или 401.
+    Успешный ответ может кешироваться прокси по ключу-токену, но не дольше
+    VERIFY_CACHE_MAX_AGE и не дольше срока действия токена.
+    """
+    principal = await verify_authorization(
+        cache, request.headers.get('Authorization')
+    )
+    if principal is None:
+        return Response(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            headers={'Cache-Control': 'no-store'}
+        )
+    max_age = settings.verify_cache_max_age
+    if principal.exp is not None:
+        max_age = max(0, min(max_age, principal.exp - int(time.time())))
+    return Response(headers={
+        'X-User-Id': str(principal.id),
+        'X-User-Roles': ','.join(principal.roles),
+        'Cache-Control': f'max-age={max_age}',
+        # nginx учитывает этот заголовок раньше Cache-Control
+        'X-Accel-Expires': str(max_age),
+    })
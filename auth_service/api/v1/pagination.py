@@ -1,7 +1,83 @@
-from fastapi import Query
+import base64
+from datetime import datetime
+from typing import Any, Callable
+
+import orjson
+from fastapi import HTTPException, Query, status
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Непрозрачный курсор: ключ сортировки и id последней записи страницы.
+    Следующая страница начинается строго после этой записи, поэтому
+    её стоимость не зависит от того, сколько страниц уже пройдено.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, *types: Callable[[str], Any]) -> tuple:
+    """
+    Разбирает курсор и приводит значения к типам types.
+    Курсоры выдаются сервисом, поэтому все значения - строки;
+    любой другой курсор отклоняется с 400.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = orjson.loads(data)
+        if (
+            not isinstance(values, list)
+            or len(values) != len(types)
+            or not all(isinstance(value, str) for value in values)
+        ):
+            raise ValueError
+        return tuple(cast(value) for cast, value in zip(types, values))
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Неверный курсор'
+        )
+
+
+def naive_datetime(value: str) -> datetime:
+    """
+    Время из курсора для сравнения с колонкой без часового пояса.
+    Сервис выдаёт курсоры без смещения, время со смещением отклоняется.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        raise ValueError
+    return parsed
+
+
+class CursorParams:
+    """Пагинация по курсору; без page_size возвращаются все записи."""
+
+    def __init__(
+        self,
+        cursor: str | None = Query(
+            None, description='Курсор следующей страницы (next_cursor)'
+        ),
+        page_size: int | None = Query(
+            None,
+            ge=1,
+            le=100,
+            description='Количество записей на странице'
+        ),
+    ):
+        self.cursor = cursor
+        self.page_size = page_size
 
 
 class PaginationParams:
+    """
+    Пагинация по номеру страницы или по курсору.
+    Номер страницы оставлен для совместимости: глубокие страницы
+    читаются через OFFSET, а курсор - через индекс с той же стоимостью,
+    что и первая страница.
+    """
+
     def __init__(
         self,
         page_number: int = Query(
@@ -13,6 +89,15 @@ class PaginationParams:
             le=100,
             description='Количество записей на странице'
         ),
+        cursor: str | None = Query(
+            None, description='Курсор следующей страницы (next_cursor)'
+        ),
     ):
+        if cursor and page_number > 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='Укажите либо номер страницы, либо курсор'
+            )
         self.page_number = page_number
         self.page_size = page_size
+        self.cursor = cursor
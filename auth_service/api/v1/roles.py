@@ -1,11 +1,12 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.v1.pagination import NEXT_CURSOR_HEADER, CursorParams
 from db.postgres import get_session
-from models.user import User
 from schemas.role import RoleOperation, RoleCreateDto, RoleDto
+from schemas.user import UserPrincipal
 from services.roles import RoleService, UserRoleService, get_role_service
 from services.user import get_current_user
 
@@ -19,7 +20,7 @@ router = APIRouter(prefix='/roles', tags=['roles'])
 )
 async def assign_role(
     role_operation: RoleOperation,
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
     """Добавление роли пользователю."""
@@ -34,7 +35,7 @@ async def assign_role(
 )
 async def remove_role(
     role_operation: RoleOperation,
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ) -> None:
     """Удаление роли пользователя."""
@@ -51,7 +52,7 @@ async def remove_role(
 async def update_role(
     role_id: UUID,
     request_obj: RoleCreateDto,
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_user),
     role_service: RoleService = Depends(get_role_service)
 ) -> RoleDto:
     """Обновление роли."""
@@ -67,7 +68,7 @@ async def update_role(
 )
 async def delete_role(
     role_id: UUID,
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_user),
     role_service: RoleService = Depends(get_role_service)
 ) -> None:
     """Удаление роли."""
@@ -81,11 +82,22 @@ async def delete_role(
     status_code=status.HTTP_200_OK
 )
 async def get_roles_list(
-    user: User = Depends(get_current_user),
-    role_service: RoleService = Depends(get_role_service)
+    response: Response,
+    user: UserPrincipal = Depends(get_current_user),
+    role_service: RoleService = Depends(get_role_service),
+    pagination: CursorParams = Depends()
 ) -> list[RoleDto]:
-    """Вывод списка существующих ролей."""
-    return await role_service.get_roles_list(current_user=user)
+    """
+    Вывод списка существующих ролей.
+    Без page_size выводятся все роли; курсор следующей страницы
+    передаётся в заголовке X-Next-Cursor.
+    """
+    roles, next_cursor = await role_service.get_roles_list(
+        current_user=user, pagination=pagination
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return roles
 
 
 @router.post(
@@ -96,7 +108,7 @@ async def get_roles_list(
 )
 async def create_role(
     request_obj: RoleCreateDto,
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_user),
     role_service: RoleService = Depends(get_role_service)
 ) -> RoleDto:
     """Создание роли."""
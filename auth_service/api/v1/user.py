@@ -1,13 +1,11 @@
 from fastapi import (
     APIRouter, Depends, status, Response, Request
 )
-from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.responses import ORJSONResponse
 
 from api.v1.pagination import PaginationParams
-from schemas.user import PaginatedLoginHistory
+from schemas.user import PaginatedLoginHistory, UserPrincipal, UserProfile
 from services.user import UserService, get_user_service, get_current_user
-from models.user import User
-from utils.jwt import scheme
 
 router = APIRouter(prefix='/user', tags=['user'])
 
@@ -19,15 +17,32 @@ router = APIRouter(prefix='/user', tags=['user'])
     status_code=status.HTTP_200_OK
 )
 async def get_login_history(
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
     pagination: PaginationParams = Depends()
-) -> PaginatedLoginHistory:
-    """Вывод истории входов пользователя."""
-    return await user_service.get_user_login_history(
+) -> ORJSONResponse:
+    """
+    Вывод истории входов пользователя.
+    Ответ сериализуется напрямую из строк БД, схема задаёт только документацию.
+    """
+    return ORJSONResponse(await user_service.get_user_login_history(
         request_user=user,
         pagination=pagination
-    )
+    ))
+
+
+@router.get(
+    '/me',
+    summary='Профиль текущего пользователя',
+    response_model=UserProfile,
+    status_code=status.HTTP_200_OK
+)
+async def get_profile(
+    user: UserPrincipal = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+) -> UserProfile:
+    """Профиль пользователя с числом входов и временем последнего входа."""
+    return await user_service.get_profile(user)
 
 
 @router.post(
@@ -38,9 +53,8 @@ async def get_login_history(
 async def logout_user(
     request: Request,
     response: Response,
-    token: HTTPAuthorizationCredentials = Depends(scheme),
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service)
 ) -> None:
     """Выход пользователя из аккаунта."""
-    await user_service.logout_user(user, token.credentials, request, response)
+    await user_service.logout_user(user, request, response)
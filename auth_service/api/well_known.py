@@ -0,0 +1,34 @@
+import hashlib
+
+import orjson
+from fastapi import APIRouter, Request, Response, status
+
+from core.config import settings
+from utils.jwt import token_engine
+
+router = APIRouter(prefix='/.well-known', tags=['well-known'])
+
+
+def _jwks_response() -> tuple[bytes, str]:
+    body = orjson.dumps(token_engine.jwks())
+    # ETag одинаков во всех воркерах с одинаковым набором ключей
+    return body, f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+
+JWKS_BODY, JWKS_ETAG = _jwks_response()
+
+
+@router.get('/jwks.json', summary='Открытые ключи подписи токенов')
+async def jwks(request: Request) -> Response:
+    """
+    Набор открытых ключей (JWKS) для локальной проверки токенов
+    другими сервисами. Ключи меняются только при перезапуске,
+    поэтому ответ кешируется клиентами и прокси.
+    """
+    headers = {
+        'Cache-Control': f'public, max-age={settings.jwks_max_age}',
+        'ETag': JWKS_ETAG,
+    }
+    if request.headers.get('If-None-Match') == JWKS_ETAG:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(JWKS_BODY, media_type='application/json', headers=headers)
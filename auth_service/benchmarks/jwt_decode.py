@@ -0,0 +1,68 @@
+"""
+Сравнение проверки access-токена: python-jose (прежний decode_jwt)
+и TokenEngine без кеша и с кешем проверенных токенов.
+
+Запуск из каталога auth_service:
+    python -m benchmarks.jwt_decode
+"""
+import os
+import timeit
+import uuid
+from datetime import datetime, timedelta
+
+os.environ.setdefault('REDIS_HOST', 'localhost')
+os.environ.setdefault('REDIS_PORT', '6379')
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+
+from jose import jwt  # noqa: E402
+
+from core.config import settings  # noqa: E402
+from utils.token_engine import TokenEngine, create_backend  # noqa: E402
+
+NUMBER = 20000
+
+
+def jose_decode(token: str) -> dict:
+    return jwt.decode(
+        token,
+        settings.jwt_secret,
+        algorithms=[settings.jwt_algorithm],
+        options={'verify_exp': True}
+    )
+
+
+def main() -> None:
+    claims = {
+        'sub': str(uuid.uuid4()),
+        'type': 'access',
+        'device_id': str(uuid.uuid4()),
+        'roles': ['admin', 'subscriber'],
+        'jti': 'bench-jti',
+    }
+    expire = datetime.utcnow() + timedelta(minutes=15)
+    jose_token = jwt.encode(
+        {**claims, 'exp': expire},
+        settings.jwt_secret,
+        algorithm=settings.jwt_algorithm
+    )
+    backend = create_backend(settings.jwt_algorithm, settings.jwt_secret)
+    cold = TokenEngine(backend)
+    warm = TokenEngine(
+        backend, cache_size=1000, cache_ttl=settings.access_token_expire_seconds
+    )
+    token = cold.encode({**claims, 'exp': int(expire.timestamp())})
+
+    print(f'Размер токена: jose {len(jose_token)} Б, engine {len(token)} Б')
+    cases = {
+        'jose decode': lambda: jose_decode(jose_token),
+        'engine encode': lambda: cold.encode(claims),
+        'engine decode': lambda: cold.decode(token),
+        'engine decode (кеш)': lambda: warm.decode(token),
+    }
+    for name, func in cases.items():
+        elapsed = min(timeit.repeat(func, number=NUMBER, repeat=3))
+        print(f'{name:<22} {elapsed / NUMBER * 1e6:8.2f} мкс')
+
+
+if __name__ == '__main__':
+    main()
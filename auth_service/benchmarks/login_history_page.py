@@ -0,0 +1,137 @@
+"""
+Страница истории входов: объекты ORM и схемы pydantic (прежний путь)
+против выборки колонок кортежами с сериализацией словарей в orjson.
+Запросы выполняются к SQLite в памяти, чтобы сравнивалась только
+обработка строк на стороне сервиса.
+
+Запуск из каталога auth_service:
+    python -m benchmarks.login_history_page
+"""
+import os
+import timeit
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+os.environ.setdefault('REDIS_HOST', 'localhost')
+os.environ.setdefault('REDIS_PORT', '6379')
+
+import orjson  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from models import Base, LoginHistory, User, UserAgent  # noqa: E402
+from schemas.user import LoginHistoryDto, PaginatedLoginHistory  # noqa: E402
+from services.user import (  # noqa: E402
+    LOGIN_HISTORY_COLUMNS, LOGIN_HISTORY_JOINS
+)
+from services.user_agents import agent_digest  # noqa: E402
+
+PAGE_SIZE = 100
+NUMBER = 200
+
+
+def seed(session: Session) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    session.execute(insert(User).values(
+        id=user_id, login='bench', password='x'
+    ))
+    user_agent = 'Mozilla/5.0 (X11; Linux x86_64) Firefox/128.0'
+    agent_id = session.execute(
+        insert(UserAgent)
+        .values(digest=agent_digest(user_agent), value=user_agent)
+        .returning(UserAgent.id)
+    ).scalar_one()
+    now = datetime.utcnow()
+    session.execute(insert(LoginHistory).values([
+        {
+            'id': uuid.uuid4(),
+            'user_id': user_id,
+            'user_agent_id': agent_id,
+            'login_at': now - timedelta(minutes=i),
+        }
+        for i in range(PAGE_SIZE * 2)
+    ]))
+    session.commit()
+    return user_id
+
+
+def orm_page(session: Session, user_id: uuid.UUID) -> bytes:
+    items = session.execute(
+        select(LoginHistory)
+        .where(LoginHistory.user_id == user_id)
+        .order_by(LoginHistory.login_at.desc(), LoginHistory.id.desc())
+        .limit(PAGE_SIZE)
+    ).scalars().all()
+    agents = {
+        agent.id: agent.value
+        for agent in session.execute(select(UserAgent)).scalars()
+    }
+    page = PaginatedLoginHistory(
+        total=PAGE_SIZE * 2, page=1, size=PAGE_SIZE,
+        items=[
+            LoginHistoryDto(
+                id=item.id,
+                user_agent=agents.get(item.user_agent_id),
+                login_at=item.login_at
+            )
+            for item in items
+        ]
+    )
+    # Объекты ORM остаются в identity map до конца запроса
+    session.expunge_all()
+    return page.model_dump_json().encode()
+
+
+def projection_page(session: Session, user_id: uuid.UUID) -> bytes:
+    stmt = select(*(
+        getattr(LoginHistory, column) if isinstance(column, str) else column
+        for column in LOGIN_HISTORY_COLUMNS
+    ))
+    for target, onclause in LOGIN_HISTORY_JOINS:
+        stmt = stmt.outerjoin(target, onclause)
+    result = session.execute(
+        stmt.where(LoginHistory.user_id == user_id)
+        .order_by(LoginHistory.login_at.desc(), LoginHistory.id.desc())
+        .limit(PAGE_SIZE)
+    )
+    return orjson.dumps({
+        'total': PAGE_SIZE * 2, 'page': 1, 'size': PAGE_SIZE,
+        'items': [row._asdict() for row in result],
+        'next_cursor': None, 'summary': None,
+    })
+
+
+def peak_memory(func) -> int:
+    """Пик выделенной памяти за одну страницу."""
+    func()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(
+        engine,
+        tables=[User.__table__, UserAgent.__table__, LoginHistory.__table__]
+    )
+    with Session(engine) as session:
+        user_id = seed(session)
+        cases = {
+            'ORM + pydantic': lambda: orm_page(session, user_id),
+            'колонки + orjson': lambda: projection_page(session, user_id),
+        }
+        for name, func in cases.items():
+            elapsed = min(timeit.repeat(func, number=NUMBER, repeat=3))
+            peak = peak_memory(func)
+            print(
+                f'{name:<18} {elapsed / NUMBER * 1e3:7.3f} мс/страница, '
+                f'пик памяти {peak / 1024:7.1f} КБ'
+            )
+
+
+if __name__ == '__main__':
+    main()
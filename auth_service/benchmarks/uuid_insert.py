@@ -0,0 +1,81 @@
+"""
+Вставка строк с первичным ключом uuid4 и uuid7 (как в login_history).
+Для каждого генератора выводятся скорость вставки, размер индекса
+первичного ключа и объём WAL. Нужна доступная PostgreSQL из настроек
+сервиса; таблицы бенчмарка удаляются после запуска.
+
+Запуск из каталога auth_service:
+    python -m benchmarks.uuid_insert [число строк]
+"""
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+os.environ.setdefault('REDIS_HOST', 'localhost')
+os.environ.setdefault('REDIS_PORT', '6379')
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from core.config import settings  # noqa: E402
+from utils.uuid7 import uuid7  # noqa: E402
+
+ROWS = 500000
+BATCH = 1000
+FACTORIES = {'uuid4': uuid.uuid4, 'uuid7': uuid7}
+
+
+async def run(engine, name: str, factory, rows: int) -> None:
+    table = f'bench_{name}'
+    async with engine.begin() as conn:
+        await conn.execute(text(f'DROP TABLE IF EXISTS {table}'))
+        await conn.execute(text(
+            f'CREATE TABLE {table} (id uuid PRIMARY KEY, '
+            'user_agent varchar(255), login_at timestamp NOT NULL)'
+        ))
+    insert = text(
+        f'INSERT INTO {table} (id, user_agent, login_at) '
+        'VALUES (:id, :user_agent, :login_at)'
+    )
+    try:
+        async with engine.connect() as conn:
+            wal_start = await conn.scalar(text('SELECT pg_current_wal_lsn()'))
+            started = time.perf_counter()
+            for _ in range(rows // BATCH):
+                now = datetime.utcnow()
+                await conn.execute(insert, [
+                    {'id': factory(), 'user_agent': 'bench', 'login_at': now}
+                    for _ in range(BATCH)
+                ])
+                await conn.commit()
+            elapsed = time.perf_counter() - started
+            wal = await conn.scalar(text(
+                'SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), :start)'
+            ), {'start': wal_start})
+            index_size = await conn.scalar(text(
+                f"SELECT pg_relation_size('{table}_pkey')"
+            ))
+        print(
+            f'{name}: {rows / elapsed:9.0f} строк/с, '
+            f'индекс PK {index_size / 2 ** 20:7.1f} МБ, '
+            f'WAL {wal / 2 ** 20:7.1f} МБ'
+        )
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f'DROP TABLE IF EXISTS {table}'))
+
+
+async def main(rows: int) -> None:
+    engine = create_async_engine(settings.pg_url)
+    try:
+        for name, factory in FACTORIES.items():
+            await run(engine, name, factory, rows)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS))
@@ -16,12 +16,112 @@ class Settings(BaseSettings):
     redis_host: str
     redis_port: int
     redis_db: int = 0
+    redis_max_connections: int = 100
+    redis_pool_timeout: float = 1.0
+    redis_socket_timeout: float = 0.5
+    redis_connect_timeout: float = 0.5
+    redis_retries: int = 2
+    redis_backoff_base: float = 0.01
+    redis_backoff_cap: float = 0.1
+    redis_health_check_interval: int = 5
+    # Режим подключения: standalone, sentinel или cluster
+    redis_mode: str = 'standalone'
+    # Адреса через запятую: host1:26379,host2:26379
+    redis_sentinels: str = ''
+    redis_sentinel_master: str = 'mymaster'
+    # Стартовые узлы Cluster через запятую; по умолчанию redis_host:redis_port
+    redis_cluster_nodes: str = ''
+
+    # Локальный (L1) кеш воркера перед Redis
+    cache_local_max_size: int = 10000
+    cache_local_ttl: float = 1.0
+    # Сколько истёкшие записи L1 служат запасным ответом при недоступном Redis
+    cache_stale_ttl: float = 60.0
+
+    # Кеш ролей в памяти воркера
+    role_cache_max_users: int = 10000
+    role_cache_ttl: float = 300.0
 
     # JWT
-    jwt_secret: str
+    # Общий секрет HS256: подпись, пока не задан JWT_ACTIVE_KID,
+    # и проверка токенов без kid, выпущенных до перехода на ключевые пары
+    jwt_secret: str = ''
     jwt_algorithm: str = 'HS256'
+    # Ключевые пары ES256/EdDSA: kid -> путь к PEM. Токены подписываются
+    # ключом JWT_ACTIVE_KID, остальные ключи продолжают проверять подписи
+    # и публикуются в JWKS. Для выведенных ключей достаточно открытой части.
+    jwt_private_keys: dict[str, str] = {}
+    jwt_public_keys: dict[str, str] = {}
+    jwt_active_kid: str = ''
+    # Время кеширования /.well-known/jwks.json клиентами, сек
+    jwks_max_age: int = 300
+    # Сколько прокси может кешировать ответ /auth/verify, сек.
+    # Столько же отозванный токен может приниматься на уровне прокси.
+    verify_cache_max_age: int = 5
+    # Ключи внутренних сервисов для /auth/introspect (заголовок
+    # X-Service-Token, JSON-список). Пустой список - эндпоинт недоступен.
+    introspect_service_tokens: list[str] = []
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
+    # Сколько недавно проверенных токенов помнит воркер (0 - не запоминать)
+    jwt_verified_cache_size: int = 10000
+    # Проверять отзыв по старым ключам без хеш-тега пользователя
+    # (invalid_access_token:{jti} и invalid_access_token:{user_id}:{token}).
+    # Можно отключить, когда истекут все токены, выпущенные до перехода.
+    revocation_legacy_keys: bool = True
+    # Принимать при обновлении refresh-токены, сохранённые до перехода
+    # по ключу без хеш-тега (refresh:{user_id}:{user_agent}). Можно
+    # отключить после migrate-redis-keys или когда такие токены истекут.
+    refresh_legacy_keys: bool = True
+    # Фильтр Блума отозванных токенов в памяти воркера
+    revocation_filter_enabled: bool = True
+    revocation_filter_fp_rate: float = 0.001
+    revocation_filter_memory_bytes: int = 1024 * 1024
+    revocation_filter_buckets: int = 4
+    revocation_stream_maxlen: int = 1000000
+
+    # История входов: buffered - пачками из буфера воркера (при падении
+    # теряется не больше LOGIN_HISTORY_MAX_PENDING событий), sync - в запросе
+    login_history_mode: str = 'buffered'
+    login_history_batch_size: int = 500
+    login_history_flush_interval: float = 1.0
+    login_history_max_pending: int = 50000
+    # Сколько раз подряд повторять пачку, упавшую не из-за потери связи
+    # с БД; отвергнутые БД пачки (IntegrityError, DataError) не повторяются
+    login_history_max_attempts: int = 5
+    # Помесячные секции истории входов: сколько месяцев создавать
+    # заранее и сколько хранить; старые секции отключаются (detach)
+    # или удаляются (drop) командой maintain-partitions
+    login_history_partitions_ahead: int = 3
+    login_history_retention_months: int = 12
+    login_history_retention_action: str = 'detach'
+    # Сколько строк User-Agent -> id справочника держать в памяти воркера
+    user_agent_cache_size: int = 10000
+
+    # Поток событий для внешних систем и ретранслятор outbox в него
+    events_stream: str = 'auth_events'
+    events_stream_maxlen: int = 1000000
+    # Группы потребителей, создаваемые при старте (JSON-список)
+    events_consumer_groups: list[str] = []
+    outbox_relay_enabled: bool = True
+    outbox_batch_size: int = 500
+    outbox_poll_interval: float = 0.5
+
+    # gRPC-сервер проверки токенов
+    grpc_enabled: bool = True
+    grpc_host: str = '0.0.0.0'
+    grpc_port: int = 50051
+    grpc_shutdown_grace: float = 5.0
+
+    # Хеширование паролей
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 64
+    password_hash_scheme: str = 'pbkdf2_sha256'
+    password_pbkdf2_rounds: int = 600000
+    password_bcrypt_rounds: int = 12
+    password_argon2_time_cost: int = 3
+    password_argon2_memory_cost: int = 65536
+    password_argon2_parallelism: int = 2
 
     class Config:
         env_file = '.env'
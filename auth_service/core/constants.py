@@ -9,3 +9,7 @@ LOGIN_MAX_LENGTH = 255
 USER_AGENT_MAX_LENGTH = 255
 
 ROLE_NAME_MAX_LENGTH = 255
+
+INTROSPECT_MAX_TOKENS = 100
+
+EVENT_TYPE_MAX_LENGTH = 64
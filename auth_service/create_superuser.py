@@ -1,15 +1,23 @@
+import os
 from getpass import getpass
 
 import typer
 import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.config import settings
+from db import partitions
+from db.keys import REFRESH_PREFIX, refresh_key
 from db.postgres import async_session
+from db.redis_client import create_redis_client
 from models.role import Role, UserRole
 from models.user import User
 from schemas.user import SuperUserCreate
 from schemas.role import RoleCreateDto
 from services.base import BaseService
+from utils.password import close_password_hasher, hash_password
+from utils.password_policy import SUPPORTED_SCHEMES, calibrate, measure
+from utils.token_engine import generate_private_key
 
 
 app = typer.Typer()
@@ -17,7 +25,116 @@ app = typer.Typer()
 
 @app.command()
 def create_superuser():
-    asyncio.run(_create())
+    try:
+        asyncio.run(_create())
+    finally:
+        close_password_hasher()
+
+
+@app.command()
+def calibrate_hashing(
+    target_ms: float = typer.Option(
+        250, help='Желаемое время хеширования одного пароля, мс'
+    ),
+):
+    """Подбирает параметры стоимости схем хеширования для текущего хоста."""
+    for scheme in SUPPORTED_SCHEMES:
+        params = calibrate(scheme, target_ms)
+        elapsed = measure(scheme, **params)
+        env = ' '.join(
+            f'PASSWORD_{scheme.split("_")[0].upper()}_{name.upper()}={value}'
+            for name, value in params.items()
+        )
+        typer.echo(f'{scheme}: {elapsed:.0f} мс -> {env}')
+
+
+@app.command()
+def generate_signing_key(
+    kid: str = typer.Argument(..., help='Идентификатор ключа (kid)'),
+    algorithm: str = typer.Option('ES256', help='ES256 или EdDSA'),
+    output: str = typer.Option(None, help='Файл для ключа, по умолчанию <kid>.pem'),
+):
+    """Создаёт закрытый ключ для подписи токенов."""
+    path = output or f'{kid}.pem'
+    # Ключ доступен только владельцу, существующий файл не перезаписывается
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as file:
+        file.write(generate_private_key(algorithm))
+    typer.echo(
+        f'Ключ записан в {path}. Добавьте его в JWT_PRIVATE_KEYS '
+        f'как "{kid}": "{path}"'
+    )
+
+
+@app.command()
+def migrate_redis_keys():
+    """
+    Переносит refresh-токены на ключи с хеш-тегом пользователя.
+    Отметки об отзыве не переносятся: они проверяются и по старым ключам,
+    пока включён REVOCATION_LEGACY_KEYS, и истекают вместе с токенами.
+    """
+    moved = asyncio.run(_migrate_refresh_keys())
+    typer.echo(f'Перенесено ключей: {moved}')
+
+
+async def _migrate_refresh_keys() -> int:
+    redis = create_redis_client()
+    moved = 0
+    try:
+        async for key in redis.scan_iter(match=f'{REFRESH_PREFIX}:*'):
+            key = key.decode()
+            _, user_id, user_agent = key.split(':', 2)
+            if user_id.startswith('{'):
+                continue
+            # Ключи лежат в разных слотах Cluster, поэтому без RENAME
+            value, ttl = await redis.get(key), await redis.pttl(key)
+            if value is None or ttl == -2:
+                continue
+            await redis.set(
+                refresh_key(user_id, user_agent),
+                value,
+                px=ttl if ttl > 0 else None,
+                nx=True
+            )
+            await redis.delete(key)
+            moved += 1
+    finally:
+        await redis.aclose()
+    return moved
+
+
+@app.command()
+def maintain_partitions(
+    ahead: int = typer.Option(
+        settings.login_history_partitions_ahead,
+        help='На сколько месяцев вперёд создать секции'
+    ),
+    retention: int = typer.Option(
+        settings.login_history_retention_months,
+        help='Сколько месяцев хранить историю входов'
+    ),
+    action: str = typer.Option(
+        settings.login_history_retention_action,
+        help='detach - отключить старые секции, drop - удалить'
+    ),
+):
+    """Создаёт будущие секции login_history и убирает устаревшие."""
+    if action not in ('detach', 'drop'):
+        raise typer.BadParameter('Допустимые значения: detach, drop')
+    created, expired = asyncio.run(
+        _maintain_partitions(ahead, retention, action == 'drop')
+    )
+    typer.echo(f'Создано секций: {len(created)} {" ".join(created)}')
+    typer.echo(f'Убрано секций ({action}): {len(expired)} {" ".join(expired)}')
+
+
+async def _maintain_partitions(
+    ahead: int, retention: int, drop: bool
+) -> tuple[list[str], list[str]]:
+    async with async_session() as session:
+        return await partitions.maintain_partitions(
+            session, ahead=ahead, retention_months=retention, drop=drop
+        )
 
 
 async def _check_user(db: AsyncSession, login):
@@ -29,7 +146,7 @@ async def _create_user(db: AsyncSession, login, password):
     service = BaseService(db, User)
     user_obj = SuperUserCreate(
         login=login,
-        password=password,
+        password=await hash_password(password),
         first_name='admin',
         last_name='admin'
     )
@@ -45,7 +162,7 @@ async def _get_or_create_role(db: AsyncSession):
 
 
 async def _create_user_role(db: AsyncSession, user, role):
-    obj = UserRole(user=user, role=role)
+    obj = UserRole(user_id=user.id, role_id=role.id)
     db.add(obj)
     await db.commit()
     await db.refresh(obj)
@@ -0,0 +1,41 @@
+"""
+Ключи Redis.
+Ключи одного пользователя содержат хеш-тег {user_id}, поэтому в Redis
+Cluster попадают в один слот и могут изменяться одним скриптом.
+"""
+from uuid import UUID
+
+REFRESH_PREFIX = 'refresh'
+REVOKED_PREFIX = 'invalid_access_token'
+
+
+def user_tag(user_id: UUID | str) -> str:
+    return f'{{{user_id}}}'
+
+
+def refresh_key(user_id: UUID | str, user_agent: str) -> str:
+    """Refresh-токен устройства пользователя."""
+    return f'{REFRESH_PREFIX}:{user_tag(user_id)}:{user_agent}'
+
+
+def revoked_key(user_id: UUID | str, jti: str) -> str:
+    """Отметка об отзыве access-токена."""
+    return f'{REVOKED_PREFIX}:{user_tag(user_id)}:{jti}'
+
+
+def legacy_refresh_key(user_id: UUID | str, user_agent: str) -> str:
+    """Формат refresh-ключа без хеш-тега, использовался до поддержки Cluster."""
+    return f'{REFRESH_PREFIX}:{user_id}:{user_agent}'
+
+
+def legacy_revoked_keys(
+    user_id: UUID | str, jti: str, token: str | None = None
+) -> list[str]:
+    """
+    Прежние форматы ключей отзыва: по jti без хеш-тега и, для токенов
+    без jti, по полному тексту токена.
+    """
+    keys = [f'{REVOKED_PREFIX}:{jti}']
+    if token is not None:
+        keys.append(f'{REVOKED_PREFIX}:{user_id}:{token}')
+    return keys
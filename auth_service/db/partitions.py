@@ -0,0 +1,127 @@
+"""
+Помесячные секции login_history (PARTITION BY RANGE (login_at)).
+Секция месяца называется login_history_pYYYYMM и содержит входы
+с первого числа месяца включительно до первого числа следующего.
+Строки, для которых секция ещё не создана, попадают в login_history_default.
+"""
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PARENT = 'login_history'
+DEFAULT_PARTITION = f'{PARENT}_default'
+SUMMARY = 'user_login_summary'
+PARTITION_NAME = re.compile(rf'^{PARENT}_p(\d{{4}})(\d{{2}})$')
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f'{PARENT}_p{month:%Y%m}'
+
+
+def retention_start(retention_months: int, now: datetime | None = None) -> datetime:
+    """
+    Самый ранний вход, который ещё хранится. Условие login_at >= retention_start
+    в запросах позволяет планировщику не читать секции за пределами хранения.
+    """
+    month = add_months(month_start(now or datetime.utcnow()), -retention_months)
+    return datetime(month.year, month.month, 1)
+
+
+async def list_partitions(db: AsyncSession) -> dict[date, str]:
+    """Помесячные секции таблицы: начало месяца -> имя секции."""
+    result = await db.execute(text(
+        'SELECT c.relname FROM pg_inherits i '
+        'JOIN pg_class c ON c.oid = i.inhrelid '
+        'WHERE i.inhparent = CAST(:parent AS regclass)'
+    ), {'parent': PARENT})
+    partitions = {}
+    for (name,) in result:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+async def create_partition(db: AsyncSession, month: date) -> str:
+    """
+    Создаёт секцию месяца. Строки этого месяца, уже попавшие в секцию
+    по умолчанию, переносятся в новую секцию до её подключения:
+    иначе PostgreSQL не даст подключить секцию.
+    """
+    name = partition_name(month)
+    bounds = {
+        'start': datetime(month.year, month.month, 1),
+        'end': datetime.combine(add_months(month, 1), datetime.min.time()),
+    }
+    in_range = 'login_at >= :start AND login_at < :end'
+    await db.execute(text(
+        f'CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)'
+    ))
+    await db.execute(text(
+        f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} '
+        f'RETURNING *) INSERT INTO {name} SELECT * FROM moved'
+    ), bounds)
+    # Ограничение избавляет ATTACH от проверки всех строк секции
+    await db.execute(text(
+        f'ALTER TABLE {name} ADD CONSTRAINT {name}_bounds '
+        f"CHECK (login_at >= '{bounds['start']}' AND login_at < '{bounds['end']}')"
+    ))
+    await db.execute(text(
+        f'ALTER TABLE {PARENT} ATTACH PARTITION {name} '
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    ))
+    await db.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT {name}_bounds'))
+    return name
+
+
+async def maintain_partitions(
+    db: AsyncSession,
+    ahead: int,
+    retention_months: int,
+    drop: bool = False,
+    now: datetime | None = None
+) -> tuple[list[str], list[str]]:
+    """
+    Создаёт секции на ahead месяцев вперёд и отключает (drop=True -
+    удаляет) секции, которые целиком старше retention_months месяцев.
+    Возвращает имена созданных и отключённых секций.
+    """
+    current = month_start(now or datetime.utcnow())
+    partitions = await list_partitions(db)
+    created = []
+    for offset in range(ahead + 1):
+        month = add_months(current, offset)
+        if month not in partitions:
+            created.append(await create_partition(db, month))
+    expired = []
+    oldest = month_start(retention_start(retention_months, now))
+    for month, name in sorted(partitions.items()):
+        if month >= oldest:
+            break
+        # Сводка входов считает только историю в пределах срока хранения
+        await db.execute(text(
+            f'UPDATE {SUMMARY} s SET login_count = s.login_count - d.count '
+            f'FROM (SELECT user_id, count(*) AS count FROM {name} '
+            'GROUP BY user_id) d WHERE s.user_id = d.user_id'
+        ))
+        if drop:
+            await db.execute(text(f'DROP TABLE {name}'))
+        else:
+            # Отключённая секция остаётся отдельной таблицей для архивации
+            await db.execute(text(
+                f'ALTER TABLE {PARENT} DETACH PARTITION {name}'
+            ))
+        expired.append(name)
+    await db.commit()
+    return created, expired
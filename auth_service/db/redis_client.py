@@ -0,0 +1,172 @@
+import asyncio
+import logging
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.cluster import ClusterNode, RedisCluster
+from redis.asyncio.retry import Retry
+from redis.asyncio.sentinel import Sentinel
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def parse_nodes(value: str) -> list[tuple[str, int]]:
+    """Разбирает список адресов вида host1:port1,host2:port2."""
+    nodes = []
+    for item in value.split(','):
+        item = item.strip()
+        if item:
+            host, _, port = item.rpartition(':')
+            nodes.append((host, int(port)))
+    return nodes
+
+
+def _retry() -> Retry:
+    return Retry(
+        ExponentialBackoff(
+            cap=settings.redis_backoff_cap, base=settings.redis_backoff_base
+        ),
+        settings.redis_retries
+    )
+
+
+def _connection_kwargs(listener: bool) -> dict:
+    return {
+        'socket_timeout': None if listener else settings.redis_socket_timeout,
+        'socket_connect_timeout': settings.redis_connect_timeout,
+        'socket_keepalive': True,
+        'health_check_interval': settings.redis_health_check_interval,
+        'retry': _retry(),
+        'retry_on_error': [ConnectionError, TimeoutError],
+    }
+
+
+def _cluster_nodes() -> list[tuple[str, int]]:
+    return (
+        parse_nodes(settings.redis_cluster_nodes)
+        or [(settings.redis_host, settings.redis_port)]
+    )
+
+
+def create_redis_client(listener: bool = False) -> Redis | RedisCluster:
+    """
+    Создаёт клиент Redis с ограниченным пулом соединений, таймаутами
+    и повторами с экспоненциальной задержкой.
+    Режим подключения задаётся REDIS_MODE: отдельный сервер, мастер,
+    найденный через Sentinel, или Redis Cluster.
+    listener=True - клиент для долгих блокирующих чтений (pub/sub,
+    XREAD BLOCK): без таймаута чтения, с одним соединением на подписку.
+    """
+    max_connections = 2 if listener else settings.redis_max_connections
+    kwargs = _connection_kwargs(listener)
+    if settings.redis_mode == 'cluster':
+        # Пул ограничивается на каждый узел кластера
+        return RedisCluster(
+            startup_nodes=[
+                ClusterNode(host, port) for host, port in _cluster_nodes()
+            ],
+            max_connections=max_connections,
+            **kwargs
+        )
+    if settings.redis_mode == 'sentinel':
+        sentinel = Sentinel(
+            parse_nodes(settings.redis_sentinels),
+            socket_timeout=settings.redis_connect_timeout
+        )
+        # Пул Sentinel сам переключается на нового мастера после failover
+        return sentinel.master_for(
+            settings.redis_sentinel_master,
+            db=settings.redis_db,
+            max_connections=max_connections,
+            **kwargs
+        )
+    pool = BlockingConnectionPool(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        max_connections=max_connections,
+        timeout=settings.redis_pool_timeout,
+        **kwargs
+    )
+    return Redis(connection_pool=pool)
+
+
+def create_pubsub_client() -> Redis:
+    """
+    Клиент для pub/sub. Асинхронный RedisCluster не поддерживает pub/sub,
+    но сообщения PUBLISH в кластере доходят до подписчиков на любом узле,
+    поэтому в режиме cluster подписка идёт через первый стартовый узел.
+    """
+    if settings.redis_mode != 'cluster':
+        return create_redis_client(listener=True)
+    host, port = _cluster_nodes()[0]
+    pool = BlockingConnectionPool(
+        host=host,
+        port=port,
+        max_connections=2,
+        timeout=settings.redis_pool_timeout,
+        **_connection_kwargs(listener=True)
+    )
+    return Redis(connection_pool=pool)
+
+
+class RedisHealth:
+    """
+    Периодическая проверка доступности Redis.
+    Пока Redis недоступен, сервис работает в деградированном режиме:
+    проверки отзыва токенов отвечают по локальным данным воркера,
+    не дожидаясь таймаутов на каждом запросе.
+    """
+
+    def __init__(self, redis: Redis | RedisCluster, interval: float) -> None:
+        self.redis = redis
+        self.interval = interval
+        self.healthy = True
+        self._monitor: asyncio.Task | None = None
+
+    def mark_failed(self) -> None:
+        if self.healthy:
+            logger.warning('Redis недоступен, включён деградированный режим')
+        self.healthy = False
+
+    async def check(self) -> None:
+        try:
+            await self.redis.ping()
+        except Exception:
+            self.mark_failed()
+        else:
+            if not self.healthy:
+                logger.warning('Redis снова доступен')
+            self.healthy = True
+
+    async def start(self) -> None:
+        self._monitor = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+        self._monitor = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+
+redis_health: RedisHealth | None = None
+
+
+def is_redis_healthy() -> bool:
+    return redis_health is None or redis_health.healthy
+
+
+def mark_redis_failed() -> None:
+    if redis_health is not None:
+        redis_health.mark_failed()
@@ -0,0 +1,90 @@
+from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
+
+# Ротация refresh-токена: новый токен записывается, только если
+# в Redis всё ещё лежит предъявленный. Конкурентные обновления
+# одним токеном не могут пройти дважды.
+ROTATE_REFRESH = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+# Refresh-токен по ключу прежнего формата: ключ удаляется, только если
+# в нём лежит предъявленный токен. Новый токен пишется уже по ключу
+# с хеш-тегом, который в Cluster лежит в другом слоте.
+CLAIM_REFRESH = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+# Выход: удаление refresh-токена устройства и отзыв access-токена.
+# Оба ключа содержат хеш-тег пользователя и лежат в одном слоте Cluster.
+# KEYS: refresh-ключ, ключ отзыва; ARGV: TTL отзыва
+LOGOUT = """
+redis.call('DEL', KEYS[1])
+redis.call('SET', KEYS[2], '', 'EX', ARGV[1])
+return 1
+"""
+
+
+class RedisScripts:
+    """Lua-скрипты Redis: каждая операция выполняется за один запрос."""
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.rotate_refresh = redis.register_script(ROTATE_REFRESH)
+        self.claim_refresh = redis.register_script(CLAIM_REFRESH)
+        self.logout_script = redis.register_script(LOGOUT)
+
+    async def logout(
+        self,
+        refresh_key: str,
+        revoked_key: str,
+        ttl: int,
+        stream: str,
+        jti: str,
+        maxlen: int,
+        events: tuple[tuple[str, dict, int], ...] = (),
+        legacy_refresh_key: str | None = None
+    ) -> None:
+        """
+        Выход с устройства и событие отзыва в потоке одним конвейером.
+        Поток общий для всех пользователей и в Cluster лежит в другом
+        слоте, поэтому XADD выполняется рядом со скриптом, а не внутри него.
+        events - дополнительные записи (поток, поля, maxlen) в том же конвейере.
+        legacy_refresh_key - refresh-ключ прежнего формата, удаляется там же.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.evalsha(self.logout_script.sha, 2, refresh_key, revoked_key, ttl)
+        pipe.xadd(stream, {'jti': jti}, maxlen=maxlen, approximate=True)
+        for event_stream, fields, event_maxlen in events:
+            pipe.xadd(event_stream, fields, maxlen=event_maxlen, approximate=True)
+        if legacy_refresh_key is not None:
+            pipe.delete(legacy_refresh_key)
+        try:
+            await pipe.execute()
+        except NoScriptError:
+            # Кеш скриптов сброшен (например, после перезапуска Redis).
+            # Конвейер не транзакционный: XADD уже выполнены, поэтому
+            # повторяется только скрипт - объект Script сам загрузит его
+            await self.logout_script(keys=[refresh_key, revoked_key], args=[ttl])
+
+    async def load(self) -> None:
+        """Загружает скрипты на сервер, чтобы вызовы шли сразу через EVALSHA."""
+        for script in (
+            self.rotate_refresh, self.claim_refresh, self.logout_script
+        ):
+            script.sha = await self.redis.script_load(script.script)
+
+
+redis_scripts: RedisScripts | None = None
+
+
+async def get_redis_scripts() -> RedisScripts:
+    return redis_scripts
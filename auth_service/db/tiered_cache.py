@@ -0,0 +1,195 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any
+
+from redis.asyncio import Redis
+
+from db.cache import CacheStorage
+
+MISSING = object()
+
+
+def _as_stored(value: Any) -> Any:
+    """Приводит значение к виду, в котором его вернёт Redis."""
+    if value is None or isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class LocalCache:
+    """
+    LRU-кеш в памяти процесса с ограничением размера и TTL записей.
+    Истёкшие записи ещё stale_ttl секунд доступны через get(stale=True) -
+    на случай, когда основное хранилище недоступно.
+    """
+
+    def __init__(self, max_size: int, ttl: float, stale_ttl: float = 0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str, stale: bool = False) -> Any:
+        """Возвращает значение или MISSING, если записи нет или она истекла."""
+        item = self._data.get(key)
+        if item is None:
+            return MISSING
+        expires_at, value = item
+        now = time.monotonic()
+        if expires_at < now:
+            if expires_at + self.stale_ttl < now:
+                del self._data[key]
+                return MISSING
+            if not stale:
+                return MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TieredCache(CacheStorage):
+    """
+    Двухуровневый кеш: L1 в памяти воркера перед L2 в Redis.
+    Одновременные промахи по одному ключу объединяются в один запрос к Redis.
+    Записи L1 (включая отсутствие ключа) живут не дольше local_ttl,
+    это и есть предел рассинхронизации между воркерами.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        max_size: int,
+        local_ttl: float,
+        stale_ttl: float = 0
+    ) -> None:
+        self.redis = redis
+        self.local = LocalCache(max_size, local_ttl, stale_ttl)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats = {
+            'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'coalesced': 0
+        }
+
+    async def get(self, key: str, local: bool = True) -> Any:
+        """
+        Получает значение по ключу.
+        local=False читает напрямую из Redis, минуя L1 (для ключей,
+        где недопустима даже кратковременная рассинхронизация).
+        """
+        if not local:
+            return await self.redis.get(key)
+
+        value = self.local.get(key)
+        if value is not MISSING:
+            self._stats['l1_hits'] += 1
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self._stats['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self.redis.get(key)
+        except Exception as err:
+            future.set_exception(err)
+            # Исключение уже передано ожидающим, не оставляем его без внимания
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            self._stats['l2_hits' if value is not None else 'misses'] += 1
+            # Ключ мог быть изменён, пока шёл запрос - тогда не кешируем
+            if self._inflight.get(key) is future:
+                self.local.set(key, value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def get_many(
+        self, keys: list[str], cache_missing: bool = True
+    ) -> list[Any]:
+        """
+        Получает значения нескольких ключей. Промахи L1 читаются из Redis
+        одним конвейером GET: ключи разных пользователей лежат в разных
+        слотах Cluster, поэтому MGET здесь не подходит.
+        cache_missing=False не кеширует в L1 отсутствие ключа - для ключей,
+        появление которых должно быть видно сразу.
+        """
+        values = [self.local.get(key) for key in keys]
+        missed = [i for i, value in enumerate(values) if value is MISSING]
+        self._stats['l1_hits'] += len(keys) - len(missed)
+        if not missed:
+            return values
+
+        # Промахи регистрируются как запросы в полёте: одиночные get()
+        # присоединяются к ним, а invalidate() отменяет кеширование ответа
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for i in missed:
+            if keys[i] not in futures:
+                futures[keys[i]] = loop.create_future()
+                self._inflight.setdefault(keys[i], futures[keys[i]])
+        pipe = self.redis.pipeline(transaction=False)
+        for i in missed:
+            pipe.get(keys[i])
+        try:
+            results = await pipe.execute()
+        except Exception as err:
+            for future in futures.values():
+                future.set_exception(err)
+                future.exception()
+            raise
+        else:
+            for i, value in zip(missed, results):
+                values[i] = value
+                self._stats['l2_hits' if value is not None else 'misses'] += 1
+                future = futures[keys[i]]
+                if not future.done():
+                    future.set_result(value)
+                if self._inflight.get(keys[i]) is future and (
+                    value is not None or cache_missing
+                ):
+                    self.local.set(keys[i], value)
+            return values
+        finally:
+            for key, future in futures.items():
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> None:
+        self.invalidate(key)
+        await self.redis.set(key, value, ex=ex)
+        self.local.set(key, _as_stored(value), ex)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.invalidate(key)
+        await self.redis.delete(*keys)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    def invalidate(self, key: str) -> None:
+        """Сбрасывает L1 для ключа, изменённого в Redis в обход кеша."""
+        self.local.delete(key)
+        self._inflight.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        """Статистика попаданий по уровням кеша."""
+        return {**self._stats, 'l1_size': len(self.local)}
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: grpc_api/auth.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'grpc_api/auth.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13grpc_api/auth.proto\x12\x07\x61uth.v1\"%\n\x14ValidateTokenRequest\x12\r\n\x05token\x18\x01 \x01(\t\"D\n\tTokenInfo\x12\x0e\n\x06\x61\x63tive\x18\x01 \x01(\x08\x12\x0b\n\x03sub\x18\x02 \x01(\t\x12\r\n\x05roles\x18\x03 \x03(\t\x12\x0b\n\x03\x65xp\x18\x04 \x01(\x03\"\'\n\x15ValidateTokensRequest\x12\x0e\n\x06tokens\x18\x01 \x03(\t\"=\n\x16ValidateTokensResponse\x12#\n\x07results\x18\x01 \x03(\x0b\x32\x12.auth.v1.TokenInfo\"&\n\x13GetUserRolesRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"\x1a\n\tUserRoles\x12\r\n\x05roles\x18\x01 \x03(\t2\xe9\x01\n\x0eTokenValidator\x12\x42\n\rValidateToken\x12\x1d.auth.v1.ValidateTokenRequest\x1a\x12.auth.v1.TokenInfo\x12Q\n\x0eValidateTokens\x12\x1e.auth.v1.ValidateTokensRequest\x1a\x1f.auth.v1.ValidateTokensResponse\x12@\n\x0cGetUserRoles\x12\x1c.auth.v1.GetUserRolesRequest\x1a\x12.auth.v1.UserRolesb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'grpc_api.auth_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_VALIDATETOKENREQUEST']._serialized_start=32
+  _globals['_VALIDATETOKENREQUEST']._serialized_end=69
+  _globals['_TOKENINFO']._serialized_start=71
+  _globals['_TOKENINFO']._serialized_end=139
+  _globals['_VALIDATETOKENSREQUEST']._serialized_start=141
+  _globals['_VALIDATETOKENSREQUEST']._serialized_end=180
+  _globals['_VALIDATETOKENSRESPONSE']._serialized_start=182
+  _globals['_VALIDATETOKENSRESPONSE']._serialized_end=243
+  _globals['_GETUSERROLESREQUEST']._serialized_start=245
+  _globals['_GETUSERROLESREQUEST']._serialized_end=283
+  _globals['_USERROLES']._serialized_start=285
+  _globals['_USERROLES']._serialized_end=311
+  _globals['_TOKENVALIDATOR']._serialized_start=314
+  _globals['_TOKENVALIDATOR']._serialized_end=547
+# @@protoc_insertion_point(module_scope)
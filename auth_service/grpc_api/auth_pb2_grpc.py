@@ -0,0 +1,189 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from grpc_api import auth_pb2 as grpc__api_dot_auth__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in grpc_api/auth_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class TokenValidatorStub:
+    """Проверка токенов и ролей для внутренних сервисов.
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ValidateToken = channel.unary_unary(
+                '/auth.v1.TokenValidator/ValidateToken',
+                request_serializer=grpc__api_dot_auth__pb2.ValidateTokenRequest.SerializeToString,
+                response_deserializer=grpc__api_dot_auth__pb2.TokenInfo.FromString,
+                _registered_method=True)
+        self.ValidateTokens = channel.unary_unary(
+                '/auth.v1.TokenValidator/ValidateTokens',
+                request_serializer=grpc__api_dot_auth__pb2.ValidateTokensRequest.SerializeToString,
+                response_deserializer=grpc__api_dot_auth__pb2.ValidateTokensResponse.FromString,
+                _registered_method=True)
+        self.GetUserRoles = channel.unary_unary(
+                '/auth.v1.TokenValidator/GetUserRoles',
+                request_serializer=grpc__api_dot_auth__pb2.GetUserRolesRequest.SerializeToString,
+                response_deserializer=grpc__api_dot_auth__pb2.UserRoles.FromString,
+                _registered_method=True)
+
+
+class TokenValidatorServicer:
+    """Проверка токенов и ролей для внутренних сервисов.
+    """
+
+    def ValidateToken(self, request, context):
+        """Проверка одного access-токена.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ValidateTokens(self, request, context):
+        """Пакетная проверка: результаты в порядке запроса.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetUserRoles(self, request, context):
+        """Названия ролей пользователя.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_TokenValidatorServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ValidateToken': grpc.unary_unary_rpc_method_handler(
+                    servicer.ValidateToken,
+                    request_deserializer=grpc__api_dot_auth__pb2.ValidateTokenRequest.FromString,
+                    response_serializer=grpc__api_dot_auth__pb2.TokenInfo.SerializeToString,
+            ),
+            'ValidateTokens': grpc.unary_unary_rpc_method_handler(
+                    servicer.ValidateTokens,
+                    request_deserializer=grpc__api_dot_auth__pb2.ValidateTokensRequest.FromString,
+                    response_serializer=grpc__api_dot_auth__pb2.ValidateTokensResponse.SerializeToString,
+            ),
+            'GetUserRoles': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUserRoles,
+                    request_deserializer=grpc__api_dot_auth__pb2.GetUserRolesRequest.FromString,
+                    response_serializer=grpc__api_dot_auth__pb2.UserRoles.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'auth.v1.TokenValidator', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('auth.v1.TokenValidator', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class TokenValidator:
+    """Проверка токенов и ролей для внутренних сервисов.
+    """
+
+    @staticmethod
+    def ValidateToken(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/auth.v1.TokenValidator/ValidateToken',
+            grpc__api_dot_auth__pb2.ValidateTokenRequest.SerializeToString,
+            grpc__api_dot_auth__pb2.TokenInfo.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ValidateTokens(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/auth.v1.TokenValidator/ValidateTokens',
+            grpc__api_dot_auth__pb2.ValidateTokensRequest.SerializeToString,
+            grpc__api_dot_auth__pb2.ValidateTokensResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetUserRoles(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/auth.v1.TokenValidator/GetUserRoles',
+            grpc__api_dot_auth__pb2.GetUserRolesRequest.SerializeToString,
+            grpc__api_dot_auth__pb2.UserRoles.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,111 @@
+import functools
+from uuid import UUID
+
+import grpc
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from core.constants import INTROSPECT_MAX_TOKENS
+from db import cache
+from db.postgres import async_session
+from db.redis_client import mark_redis_failed
+from grpc_api import auth_pb2, auth_pb2_grpc
+from services.roles import get_user_role_names
+from services.token_validation import (
+    introspect_tokens, is_service_token_valid, validate_access_token
+)
+
+# Ключ сервиса в метаданных вызова, как заголовок X-Service-Token в HTTP
+SERVICE_TOKEN_METADATA = 'x-service-token'
+
+
+def _unavailable_on_error(method):
+    """Временная недоступность Redis - статус UNAVAILABLE, как 503 в HTTP API."""
+    @functools.wraps(method)
+    async def wrapper(self, request, context: grpc.aio.ServicerContext):
+        try:
+            return await method(self, request, context)
+        except RedisError:
+            mark_redis_failed()
+            await context.abort(
+                grpc.StatusCode.UNAVAILABLE,
+                'Хранилище сессий временно недоступно'
+            )
+        except HTTPException as exc:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, str(exc.detail))
+    return wrapper
+
+
+async def _unauthenticated(request, context: grpc.aio.ServicerContext):
+    await context.abort(
+        grpc.StatusCode.UNAUTHENTICATED, 'Требуется ключ сервиса'
+    )
+
+
+class ServiceTokenInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Пропускает только вызовы с ключом из INTROSPECT_SERVICE_TOKENS,
+    как /auth/introspect: ответы раскрывают владельца и роли токенов.
+    """
+
+    _reject = grpc.unary_unary_rpc_method_handler(_unauthenticated)
+
+    async def intercept_service(self, continuation, handler_call_details):
+        metadata = dict(handler_call_details.invocation_metadata or ())
+        if is_service_token_valid(metadata.get(SERVICE_TOKEN_METADATA)):
+            return await continuation(handler_call_details)
+        return self._reject
+
+
+class TokenValidator(auth_pb2_grpc.TokenValidatorServicer):
+    """
+    Проверка токенов с теми же ключами, кешами и хранилищем отзыва,
+    что и у HTTP API.
+    """
+
+    @_unavailable_on_error
+    async def ValidateToken(self, request, context):
+        principal = await validate_access_token(
+            cache.cache_storage, request.token
+        )
+        if principal is None:
+            return auth_pb2.TokenInfo(active=False)
+        return auth_pb2.TokenInfo(
+            active=True,
+            sub=str(principal.id),
+            roles=principal.roles,
+            exp=principal.exp or 0
+        )
+
+    @_unavailable_on_error
+    async def ValidateTokens(self, request, context):
+        if len(request.tokens) > INTROSPECT_MAX_TOKENS:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f'Не больше {INTROSPECT_MAX_TOKENS} токенов за запрос'
+            )
+        results = await introspect_tokens(
+            cache.cache_storage, list(request.tokens)
+        )
+        return auth_pb2.ValidateTokensResponse(results=[
+            auth_pb2.TokenInfo(
+                active=result.active,
+                sub=str(result.sub) if result.sub else '',
+                roles=result.roles,
+                exp=result.exp or 0
+            )
+            for result in results
+        ])
+
+    @_unavailable_on_error
+    async def GetUserRoles(self, request, context):
+        try:
+            user_id = UUID(request.user_id)
+        except ValueError:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT, 'Неверный идентификатор'
+            )
+        # Роли обычно берутся из кеша воркера без обращения к БД
+        async with async_session() as db:
+            roles = await get_user_role_names(db, user_id)
+        return auth_pb2.UserRoles(roles=roles)
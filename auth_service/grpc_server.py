@@ -0,0 +1,58 @@
+"""
+gRPC-сервер проверки токенов.
+Запускается отдельным процессом рядом с gunicorn (см. gunicorn.conf.py)
+или вручную: python grpc_server.py
+"""
+import asyncio
+import logging
+import signal
+
+import grpc
+
+from core.config import settings
+from grpc_api import auth_pb2_grpc
+from grpc_api.service import ServiceTokenInterceptor, TokenValidator
+from main import token_services
+
+logger = logging.getLogger(__name__)
+
+SERVER_OPTIONS = [
+    # Постоянные HTTP/2-соединения с внутренними клиентами
+    ('grpc.keepalive_time_ms', 30000),
+    ('grpc.keepalive_timeout_ms', 10000),
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.min_ping_interval_without_data_ms', 10000),
+    ('grpc.http2.max_pings_without_data', 0),
+    ('grpc.max_concurrent_streams', 1000),
+]
+
+
+async def serve() -> None:
+    # Те же кеши и подписки, что и у HTTP-воркеров, но без записи
+    # истории входов, outbox и пула хеширования паролей
+    async with token_services():
+        server = grpc.aio.server(
+            interceptors=[ServiceTokenInterceptor()], options=SERVER_OPTIONS
+        )
+        auth_pb2_grpc.add_TokenValidatorServicer_to_server(
+            TokenValidator(), server
+        )
+        address = f'{settings.grpc_host}:{settings.grpc_port}'
+        server.add_insecure_port(address)
+        await server.start()
+        logger.info('gRPC-сервер слушает %s', address)
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(
+                sig,
+                lambda: asyncio.ensure_future(
+                    server.stop(settings.grpc_shutdown_grace)
+                )
+            )
+        await server.wait_for_termination()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve())
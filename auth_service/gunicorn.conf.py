@@ -0,0 +1,42 @@
+"""
+Настройки gunicorn: рядом с HTTP-воркерами запускается gRPC-сервер
+проверки токенов. Процесс перезапускается, если завершился,
+и останавливается вместе с gunicorn.
+"""
+import subprocess
+import sys
+import threading
+import time
+
+from core.config import settings
+
+_grpc_process: subprocess.Popen | None = None
+_stopping = threading.Event()
+
+
+def _supervise_grpc(server) -> None:
+    global _grpc_process
+    while not _stopping.is_set():
+        _grpc_process = subprocess.Popen([sys.executable, 'grpc_server.py'])
+        code = _grpc_process.wait()
+        if _stopping.is_set():
+            break
+        server.log.error('gRPC-сервер завершился с кодом %s, перезапуск', code)
+        time.sleep(1)
+
+
+def when_ready(server) -> None:
+    if settings.grpc_enabled:
+        threading.Thread(
+            target=_supervise_grpc, args=(server,), daemon=True
+        ).start()
+
+
+def on_exit(server) -> None:
+    _stopping.set()
+    if _grpc_process is not None and _grpc_process.poll() is None:
+        _grpc_process.terminate()
+        try:
+            _grpc_process.wait(settings.grpc_shutdown_grace + 5)
+        except subprocess.TimeoutExpired:
+            _grpc_process.kill()
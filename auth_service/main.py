@@ -1,27 +1,73 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.responses import ORJSONResponse
-from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
+from api import metrics, well_known
 from api.urls import router
 from core.config import settings
-from db import cache
+from db import cache, redis_client, scripts
+from db.tiered_cache import TieredCache
+from services.login_history import login_history_writer
+from services.outbox import outbox_relay
+from services.revocation import revocation_filter
+from services.role_cache import role_cache
+from utils.password import close_password_hasher, get_password_hasher
 
 
 async def init_redis():
-    redis_client = Redis(host=settings.redis_host, port=settings.redis_port)
-    await redis_client.ping()
-    return redis_client
+    client = redis_client.create_redis_client()
+    await client.ping()
+    return client
 
 
 @asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Подключение к БД при старте сервера и отключение при остановке."""
-    cache.cache_storage = await init_redis()
+async def token_services():
+    """
+    Кеш, хранилище отзыва и кеш ролей - всё, что нужно для проверки
+    токенов. Этим и ограничивается gRPC-сервер (grpc_server.py).
+    """
+    cache.cache_storage = TieredCache(
+        await init_redis(),
+        max_size=settings.cache_local_max_size,
+        local_ttl=settings.cache_local_ttl,
+        stale_ttl=settings.cache_stale_ttl
+    )
+    redis_client.redis_health = redis_client.RedisHealth(
+        cache.cache_storage.redis, settings.redis_health_check_interval
+    )
+    await redis_client.redis_health.start()
+    listener = redis_client.create_redis_client(listener=True)
+    pubsub_client = redis_client.create_pubsub_client()
+    await role_cache.start(pubsub_client)
+    if settings.revocation_filter_enabled:
+        await revocation_filter.start(listener)
     yield
+    await revocation_filter.stop()
+    await role_cache.stop()
+    await redis_client.redis_health.stop()
+    await pubsub_client.aclose()
+    await listener.aclose()
     await cache.cache_storage.close()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Подключение к БД при старте сервера и отключение при остановке."""
+    async with token_services():
+        scripts.redis_scripts = scripts.RedisScripts(cache.cache_storage.redis)
+        await scripts.redis_scripts.load()
+        get_password_hasher()
+        await login_history_writer.start()
+        if settings.outbox_relay_enabled:
+            await outbox_relay.start(
+                cache.cache_storage.redis, settings.events_consumer_groups
+            )
+        yield
+        await login_history_writer.stop()
+        await outbox_relay.stop()
+        close_password_hasher()
+
 app = FastAPI(
     title=settings.project_name,
     docs_url='/api/openapi',
@@ -31,3 +77,16 @@ app = FastAPI(
 )
 
 app.include_router(router)
+app.include_router(well_known.router)
+app.include_router(metrics.router)
+
+
+@app.exception_handler(RedisError)
+async def redis_error_handler(request: Request, exc: RedisError):
+    """Недоступность Redis - временная ошибка, а не внутренняя."""
+    redis_client.mark_redis_failed()
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'detail': 'Хранилище сессий временно недоступно'},
+        headers={'Retry-After': '1'}
+    )
@@ -0,0 +1,107 @@
+"""Partition login_history by month
+
+Revision ID: 4b9e2f61c8d7
+Revises: 7c41d2e9a0b5
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b9e2f61c8d7'
+down_revision: Union[str, None] = '7c41d2e9a0b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Сколько месяцев вперёд создаются секции (дальше - create_superuser.py
+# maintain-partitions по расписанию)
+PARTITIONS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('login_history', 'login_history_old')
+    op.execute(
+        'ALTER TABLE login_history_old '
+        'RENAME CONSTRAINT login_history_pkey TO login_history_old_pkey'
+    )
+    op.execute(
+        'ALTER TABLE login_history_old '
+        'RENAME CONSTRAINT login_history_id_key TO login_history_old_id_key'
+    )
+    op.create_table(
+        'login_history',
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('user_agent', sa.String(length=255), nullable=True),
+        sa.Column('login_at', sa.DateTime(), nullable=False),
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['user_id'], ['users.id'], ondelete='CASCADE'
+        ),
+        # Ключ секционированной таблицы обязан содержать ключ секционирования
+        sa.PrimaryKeyConstraint('id', 'login_at'),
+        postgresql_partition_by='RANGE (login_at)'
+    )
+    op.execute(
+        'CREATE TABLE login_history_default '
+        'PARTITION OF login_history DEFAULT'
+    )
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date := date_trunc(
+                'month', coalesce(
+                    (SELECT min(login_at) FROM login_history_old),
+                    now() AT TIME ZONE 'UTC'
+                )
+            );
+            last_month date := date_trunc('month', now() AT TIME ZONE 'UTC')
+                + interval '{PARTITIONS_AHEAD} months';
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF login_history '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'login_history_p' || to_char(month, 'YYYYMM'),
+                    month::timestamp,
+                    (month + interval '1 month')::timestamp
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$;
+    """)
+    op.execute(
+        'INSERT INTO login_history (id, user_id, user_agent, login_at) '
+        'SELECT id, user_id, user_agent, login_at FROM login_history_old'
+    )
+    op.drop_table('login_history_old')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('login_history', 'login_history_partitioned')
+    op.execute(
+        'ALTER TABLE login_history_partitioned '
+        'RENAME CONSTRAINT login_history_pkey '
+        'TO login_history_partitioned_pkey'
+    )
+    op.create_table(
+        'login_history',
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('user_agent', sa.String(length=255), nullable=True),
+        sa.Column('login_at', sa.DateTime(), nullable=False),
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('id')
+    )
+    op.execute(
+        'INSERT INTO login_history (id, user_id, user_agent, login_at) '
+        'SELECT id, user_id, user_agent, login_at '
+        'FROM login_history_partitioned'
+    )
+    op.drop_table('login_history_partitioned')
@@ -0,0 +1,63 @@
+"""Indexes for hot queries
+
+Revision ID: d3a8c5f1e246
+Revises: 4b9e2f61c8d7
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8c5f1e246'
+down_revision: Union[str, None] = '4b9e2f61c8d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Уникальные индексы на id, дублирующие первичные ключи
+REDUNDANT_ID_KEYS = (
+    ('users', 'users_id_key'),
+    ('roles', 'roles_id_key'),
+    ('user_roles', 'user_roles_id_key'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, name in REDUNDANT_ID_KEYS:
+        op.drop_constraint(name, table, type_='unique')
+
+    # История входов пользователя: фильтр по user_id и сортировка
+    # по login_at читаются из одного индекса (создаётся на каждой секции)
+    op.create_index(
+        'ix_login_history_user_id_login_at',
+        'login_history',
+        ['user_id', sa.text('login_at DESC')]
+    )
+
+    # Повторные назначения одной роли, если они успели появиться
+    op.execute(
+        'DELETE FROM user_roles a USING user_roles b '
+        'WHERE a.user_id = b.user_id AND a.role_id = b.role_id AND a.id > b.id'
+    )
+    # Индекс ограничения покрывает и поиск ролей пользователя по user_id
+    op.create_unique_constraint(
+        'uq_user_roles_user_id_role_id', 'user_roles', ['user_id', 'role_id']
+    )
+    op.create_index('ix_user_roles_role_id', 'user_roles', ['role_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_roles_role_id', table_name='user_roles')
+    op.drop_constraint(
+        'uq_user_roles_user_id_role_id', 'user_roles', type_='unique'
+    )
+    op.drop_index(
+        'ix_login_history_user_id_login_at', table_name='login_history'
+    )
+    for table, name in REDUNDANT_ID_KEYS:
+        op.create_unique_constraint(name, table, ['id'])
@@ -0,0 +1,43 @@
+"""Keyset pagination index for login_history
+
+Revision ID: a5f0c2d9b713
+Revises: d3a8c5f1e246
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5f0c2d9b713'
+down_revision: Union[str, None] = 'd3a8c5f1e246'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Страница по курсору (login_at, id) читается из индекса без сортировки
+    op.create_index(
+        'ix_login_history_user_id_login_at_id',
+        'login_history',
+        ['user_id', sa.text('login_at DESC'), sa.text('id DESC')]
+    )
+    op.drop_index(
+        'ix_login_history_user_id_login_at', table_name='login_history'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_login_history_user_id_login_at',
+        'login_history',
+        ['user_id', sa.text('login_at DESC')]
+    )
+    op.drop_index(
+        'ix_login_history_user_id_login_at_id', table_name='login_history'
+    )
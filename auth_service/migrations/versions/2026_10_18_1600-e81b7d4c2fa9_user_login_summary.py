@@ -0,0 +1,46 @@
+"""User login summary
+
+Revision ID: e81b7d4c2fa9
+Revises: a5f0c2d9b713
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81b7d4c2fa9'
+down_revision: Union[str, None] = 'a5f0c2d9b713'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_login_summary',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('login_count', sa.BigInteger(), nullable=False),
+        sa.Column('first_login_at', sa.DateTime(), nullable=False),
+        sa.Column('last_login_at', sa.DateTime(), nullable=False),
+        sa.Column('last_user_agent', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(
+            ['user_id'], ['users.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute(
+        'INSERT INTO user_login_summary (user_id, login_count, '
+        'first_login_at, last_login_at, last_user_agent) '
+        'SELECT user_id, count(*), min(login_at), max(login_at), '
+        '(array_agg(user_agent ORDER BY login_at DESC))[1] '
+        'FROM login_history WHERE user_id IS NOT NULL GROUP BY user_id'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_login_summary')
@@ -0,0 +1,59 @@
+"""Dictionary of user agents for login history
+
+Revision ID: 9c27e5b3d410
+Revises: e81b7d4c2fa9
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c27e5b3d410'
+down_revision: Union[str, None] = 'e81b7d4c2fa9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Upgrade schema.
+    Только схема и справочник, в одной транзакции. Ссылки в истории
+    входов заполняются следующей ревизией (f4d19a7c3e62) пачками.
+    """
+    op.create_table(
+        'user_agents',
+        sa.Column(
+            'id', sa.Integer(), sa.Identity(always=True), nullable=False
+        ),
+        sa.Column('digest', sa.LargeBinary(length=32), nullable=False),
+        sa.Column('value', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('digest', name='user_agents_digest_key')
+    )
+    op.add_column(
+        'login_history', sa.Column('user_agent_id', sa.Integer(), nullable=True)
+    )
+    op.create_foreign_key(
+        'login_history_user_agent_id_fkey',
+        'login_history', 'user_agents', ['user_agent_id'], ['id']
+    )
+    # Ключ справочника, как в services.user_agents.agent_digest
+    op.execute(
+        'INSERT INTO user_agents (digest, value) '
+        "SELECT sha256(convert_to(user_agent, 'UTF8')), user_agent "
+        'FROM (SELECT DISTINCT user_agent FROM login_history '
+        'WHERE user_agent IS NOT NULL) a'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        'login_history_user_agent_id_fkey', 'login_history', type_='foreignkey'
+    )
+    op.drop_column('login_history', 'user_agent_id')
+    op.drop_table('user_agents')
@@ -0,0 +1,97 @@
+"""Backfill user agent references and drop the raw column
+
+Revision ID: f4d19a7c3e62
+Revises: 9c27e5b3d410
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+import uuid
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4d19a7c3e62'
+down_revision: Union[str, None] = '9c27e5b3d410'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Строк истории входов, обновляемых одной транзакцией при заполнении
+BACKFILL_BATCH_SIZE = 10000
+
+# Ключ справочника, как в services.user_agents.agent_digest
+DIGEST = "sha256(convert_to({}, 'UTF8'))"
+
+# Пачка строк по первичному ключу после (:id, :login_at): ключ читается
+# из индексов первичного ключа секций, поэтому каждая пачка обходится
+# одинаково дёшево. Уже заполненные строки не перезаписываются, и после
+# сбоя заполнение можно просто запустить снова. Возвращается ключ
+# последней строки пачки.
+BACKFILL_BATCH = sa.text(
+    'WITH batch AS ('
+    'SELECT id, login_at FROM login_history '
+    'WHERE (id, login_at) > (:id, :login_at) '
+    'ORDER BY id, login_at LIMIT :limit'
+    '), updated AS ('
+    'UPDATE login_history h SET user_agent_id = a.id '
+    'FROM batch b, user_agents a '
+    'WHERE h.id = b.id AND h.login_at = b.login_at '
+    'AND h.user_agent_id IS NULL '
+    f"AND a.digest = {DIGEST.format('h.user_agent')}"
+    ') '
+    'SELECT id, login_at FROM batch ORDER BY id DESC, login_at DESC LIMIT 1'
+)
+
+
+def upgrade() -> None:
+    """
+    Upgrade schema.
+    Каждая пачка фиксируется отдельно: строки не блокируются на всё
+    время заполнения, а старые версии строк может убирать VACUUM.
+    Перед пачками фиксируется и транзакция миграции: предыдущая ревизия
+    уже записана в alembic_version, поэтому при сбое повторный запуск
+    продолжит с этой ревизии.
+    """
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        last = (uuid.UUID(int=0), datetime.min)
+        while True:
+            row = bind.execute(BACKFILL_BATCH, {
+                'id': last[0], 'login_at': last[1],
+                'limit': BACKFILL_BATCH_SIZE,
+            }).first()
+            if row is None:
+                break
+            last = tuple(row)
+
+    # Входы, записанные прежней версией сервиса во время заполнения.
+    # Запись в таблицу блокируется до конца миграции, чтение - нет.
+    op.execute('LOCK TABLE login_history IN EXCLUSIVE MODE')
+    op.execute(
+        'INSERT INTO user_agents (digest, value) '
+        f"SELECT {DIGEST.format('user_agent')}, user_agent "
+        'FROM (SELECT DISTINCT user_agent FROM login_history '
+        'WHERE user_agent_id IS NULL AND user_agent IS NOT NULL) a '
+        'ON CONFLICT (digest) DO NOTHING'
+    )
+    op.execute(
+        'UPDATE login_history h SET user_agent_id = a.id FROM user_agents a '
+        'WHERE h.user_agent_id IS NULL AND h.user_agent IS NOT NULL '
+        f"AND a.digest = {DIGEST.format('h.user_agent')}"
+    )
+    op.drop_column('login_history', 'user_agent')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        'login_history',
+        sa.Column('user_agent', sa.String(length=255), nullable=True)
+    )
+    op.execute(
+        'UPDATE login_history h SET user_agent = a.value FROM user_agents a '
+        'WHERE a.id = h.user_agent_id'
+    )
@@ -1,5 +1,9 @@
 from models.base import Base
-from models.user import User, LoginHistory
+from models.user import User, LoginHistory, UserAgent, UserLoginSummary
 from models.role import Role, UserRole
+from models.outbox import OutboxEvent
 
-__all__ = ('Base', 'User', 'UserRole', 'LoginHistory', 'Role')
+__all__ = (
+    'Base', 'User', 'UserRole', 'LoginHistory', 'UserAgent',
+    'UserLoginSummary', 'Role', 'OutboxEvent'
+)
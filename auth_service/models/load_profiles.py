@@ -0,0 +1,33 @@
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from models.base import Base
+from models.role import Role, UserRole
+from models.user import User
+
+# Связи моделей по умолчанию не загружаются (lazy='raise_on_sql').
+# Сервисы явно выбирают профиль загрузки под конкретный запрос.
+LOAD_PROFILES: dict[type[Base], dict[str, tuple[LoaderOption, ...]]] = {
+    User: {
+        # Названия ролей для выпуска токенов. История входов не грузится.
+        'auth': (selectinload(User.roles).joinedload(UserRole.role),),
+    },
+    Role: {
+        # Назначения роли, нужны при удалении роли.
+        'admin': (selectinload(Role.user_roles),),
+    },
+}
+
+
+def load_options(
+    model: type[Base], profile: str | None
+) -> tuple[LoaderOption, ...]:
+    """Опции загрузки связей для модели по названию профиля."""
+    if profile is None:
+        return ()
+    try:
+        return LOAD_PROFILES[model][profile]
+    except KeyError:
+        raise ValueError(
+            f'Профиль загрузки {profile} не задан для {model.__name__}'
+        )
@@ -3,18 +3,34 @@ from datetime import datetime
 
 from sqlalchemy import Column, DateTime
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import declared_attr
+
+from utils.uuid7 import uuid7
 
 
 class UUIDMixin:
-    """Миксин UUID."""
-
-    id = Column(
-        UUID(as_uuid=True),
-        primary_key=True,
-        default=uuid.uuid4,
-        unique=True,
-        nullable=False
-    )
+    """
+    Миксин UUID.
+    Генератор задаётся атрибутом uuid_factory модели: uuid4 по умолчанию,
+    uuid7 - для таблиц, куда строки только добавляются (история, события).
+    """
+
+    uuid_factory = staticmethod(uuid.uuid4)
+
+    @declared_attr
+    def id(cls):
+        return Column(
+            UUID(as_uuid=True),
+            primary_key=True,
+            default=cls.uuid_factory,
+            nullable=False
+        )
+
+
+class UUIDv7Mixin(UUIDMixin):
+    """Миксин UUID с упорядоченными по времени значениями (UUIDv7)."""
+
+    uuid_factory = staticmethod(uuid7)
 
 
 class CreatedAtMixin:
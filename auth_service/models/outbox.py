@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Identity, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from models.base import Base
+from core.constants import EVENT_TYPE_MAX_LENGTH
+
+
+class OutboxEvent(Base):
+    """
+    Событие для внешних систем. Записывается в одной транзакции
+    с изменением данных и удаляется после публикации в поток Redis.
+    """
+
+    __tablename__ = 'outbox'
+
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
+    event_type = Column(String(EVENT_TYPE_MAX_LENGTH), nullable=False)
+    aggregate_id = Column(UUID(as_uuid=True), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, default=datetime.now
+    )
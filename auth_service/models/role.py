@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -16,7 +16,7 @@ class Role(UUIDMixin, CreatedAtMixin, Base):
     user_roles = relationship(
         'UserRole',
         back_populates='role',
-        lazy='selectin'
+        lazy='raise_on_sql'
     )
 
 
@@ -24,6 +24,12 @@ class UserRole(UUIDMixin, Base):
     """Модель роли пользователя."""
 
     __tablename__ = 'user_roles'
+    __table_args__ = (
+        UniqueConstraint(
+            'user_id', 'role_id', name='uq_user_roles_user_id_role_id'
+        ),
+        Index('ix_user_roles_role_id', 'role_id'),
+    )
 
     user_id = Column(
         UUID, ForeignKey('users.id', ondelete='CASCADE'), nullable=False
@@ -31,11 +37,11 @@ class UserRole(UUIDMixin, Base):
     user = relationship(
         'User',
         back_populates='roles',
-        lazy='selectin'
+        lazy='raise_on_sql'
     )
     role_id = Column(UUID, ForeignKey('roles.id'))
     role = relationship(
         'Role',
         back_populates='user_roles',
-        lazy='selectin'
+        lazy='raise_on_sql'
     )
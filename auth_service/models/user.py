@@ -1,10 +1,12 @@
-from sqlalchemy import Column, DateTime, String, ForeignKey
+from sqlalchemy import (
+    BigInteger, Column, DateTime, ForeignKey, Identity, Index, Integer,
+    LargeBinary, PrimaryKeyConstraint, String, text
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from models.base import Base
-from models.mixins import UUIDMixin, CreatedAtMixin
+from models.mixins import CreatedAtMixin, UUIDMixin, UUIDv7Mixin
 from core.constants import (
     LOGIN_MAX_LENGTH, NAME_MAX_LENGTH,
     PASSWORD_MAX_LENGTH, USER_AGENT_MAX_LENGTH
@@ -23,13 +25,13 @@ class User(UUIDMixin, CreatedAtMixin, Base):
     login_history = relationship(
         'LoginHistory',
         back_populates='user',
-        lazy='selectin',
+        lazy='raise_on_sql',
         passive_deletes=True
     )
     roles = relationship(
         'UserRole',
         back_populates='user',
-        lazy='selectin',
+        lazy='raise_on_sql',
         passive_deletes=True
     )
 
@@ -40,22 +42,32 @@ class User(UUIDMixin, CreatedAtMixin, Base):
         first_name: str,
         last_name: str
     ) -> None:
+        """Пароль передаётся уже захешированным (см. utils.password)."""
         self.login = login
-        self.password = generate_password_hash(password)
+        self.password = password
         self.first_name = first_name
         self.last_name = last_name
 
-    def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password, password)
-
     def __repr__(self) -> str:
         return f'<User {self.login}>'
 
 
-class LoginHistory(UUIDMixin, Base):
-    """Модель истории входов пользователя."""
+class LoginHistory(UUIDv7Mixin, Base):
+    """
+    Модель истории входов пользователя.
+    Таблица секционирована по месяцам login_at (см. db.partitions),
+    поэтому login_at входит в первичный ключ.
+    """
 
     __tablename__ = 'login_history'
+    __table_args__ = (
+        PrimaryKeyConstraint('id', 'login_at'),
+        Index(
+            'ix_login_history_user_id_login_at_id',
+            'user_id', text('login_at DESC'), text('id DESC')
+        ),
+        {'postgresql_partition_by': 'RANGE (login_at)'},
+    )
 
     user_id = Column(
         UUID, ForeignKey('users.id', ondelete='CASCADE'), nullable=False
@@ -63,7 +75,42 @@ class LoginHistory(UUIDMixin, Base):
     user = relationship(
         'User',
         back_populates='login_history',
-        lazy='selectin'
+        lazy='raise_on_sql'
+    )
+    user_agent_id = Column(Integer, ForeignKey('user_agents.id'))
+    login_at = Column(DateTime, primary_key=True, nullable=False)
+
+
+class UserAgent(Base):
+    """
+    Справочник строк User-Agent. История входов хранит id строки
+    справочника вместо самой строки. Уникальный ключ - SHA-256 строки
+    (см. services.user_agents.agent_digest): индекс по 32 байтам вместо
+    строки до 255 символов.
+    """
+
+    __tablename__ = 'user_agents'
+
+    id = Column(Integer, Identity(always=True), primary_key=True)
+    digest = Column(LargeBinary(32), unique=True, nullable=False)
+    value = Column(String(USER_AGENT_MAX_LENGTH), nullable=False)
+
+
+class UserLoginSummary(Base):
+    """
+    Сводка входов пользователя: обновляется вместе с записью истории
+    входов, чтобы итоги и время последнего входа читались одной строкой.
+    login_count учитывает входы в пределах срока хранения истории.
+    """
+
+    __tablename__ = 'user_login_summary'
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey('users.id', ondelete='CASCADE'),
+        primary_key=True
     )
-    user_agent = Column(String(USER_AGENT_MAX_LENGTH))
-    login_at = Column(DateTime, nullable=False)
+    login_count = Column(BigInteger, nullable=False, default=0)
+    first_login_at = Column(DateTime, nullable=False)
+    last_login_at = Column(DateTime, nullable=False)
+    last_user_agent = Column(String(USER_AGENT_MAX_LENGTH))
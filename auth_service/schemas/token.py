@@ -0,0 +1,26 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from core.constants import INTROSPECT_MAX_TOKENS
+
+
+class IntrospectRequest(BaseModel):
+    """Схема запроса пакетной проверки токенов."""
+
+    tokens: list[str] = Field(min_length=1, max_length=INTROSPECT_MAX_TOKENS)
+
+
+class TokenIntrospection(BaseModel):
+    """Результат проверки одного токена (поля по RFC 7662)."""
+
+    active: bool
+    sub: UUID | None = None
+    roles: list[str] = []
+    exp: int | None = None
+
+
+class IntrospectResponse(BaseModel):
+    """Схема ответа пакетной проверки: результаты в порядке запроса."""
+
+    results: list[TokenIntrospection]
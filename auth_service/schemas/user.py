@@ -46,6 +46,20 @@ class UserInDB(BaseUUID):
         from_attributes = True
 
 
+class UserPrincipal(BaseUUID):
+    """
+    Аутентифицированный пользователь, восстановленный из access-токена
+    без обращения к БД.
+    """
+
+    roles: list[str] = []
+    device_id: str | None = None
+    jti: str
+    exp: int | None = None
+    # Токен выпущен до появления jti, jti вычислен из самого токена
+    legacy: bool = False
+
+
 class UserLoginRequest(BaseUser):
     """Схема запроса для входа пользователя."""
 
@@ -95,9 +109,34 @@ class LoginHistoryDto(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class LoginSummaryDto(BaseModel):
+    """Сводка входов пользователя."""
+    login_count: int
+    first_login_at: datetime
+    last_login_at: datetime
+    last_user_agent: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserProfile(BaseUUID):
+    """Профиль текущего пользователя."""
+    login: str
+    first_name: str | None
+    last_name: str | None
+    roles: list[str]
+    login_summary: LoginSummaryDto | None
+
+
 class PaginatedLoginHistory(BaseModel):
-    """Схема пагинированного ответа истории входов."""
+    """
+    Схема пагинированного ответа истории входов.
+    page не заполняется при запросе по курсору; next_cursor пуст
+    на последней странице.
+    """
     total: int
-    page: int
+    page: int | None
     size: int
     items: list[LoginHistoryDto]
+    next_cursor: str | None = None
+    summary: LoginSummaryDto | None = None
@@ -1,18 +1,22 @@
 from uuid import uuid4
-from datetime import datetime
 
-from redis.asyncio import Redis
 from fastapi import HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from models.user import LoginHistory, User
+from models.load_profiles import load_options
+from models.user import User
 from schemas.user import UserLoginRequest, TokenResponse
-from db.cache import get_cache_storage
+from db.cache import CacheStorage, get_cache_storage
+from db.keys import legacy_refresh_key, refresh_key
+from db.scripts import get_redis_scripts
 from core.config import settings
 from utils.jwt import (
     create_access_token, create_refresh_token, decode_jwt
 )
+from utils.password import verify_password
+from services.login_history import record_login
+from services.roles import get_user_role_names
 
 
 async def authenticate_user(
@@ -24,14 +28,26 @@ async def authenticate_user(
     Аутентифицирует пользователя по логину и паролю.
     Создаёт пару токенов для нового устройства.
     """
-    result = await db.execute(select(User).where(User.login == data.login))
+    result = await db.execute(
+        select(User)
+        .where(User.login == data.login)
+        .options(*load_options(User, 'auth'))
+    )
     user = result.scalars().first()
 
-    if not user or not user.check_password(data.password):
+    is_valid, new_hash = (
+        await verify_password(user.password, data.password)
+        if user else (False, None)
+    )
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Неверный логин или пароль'
         )
+    if new_hash:
+        # Хеш устарел по политике - сохраняем новый
+        user.password = new_hash
+        await db.commit()
 
     user_agent = str(request.headers.get('User-Agent', ''))
 
@@ -39,11 +55,14 @@ async def authenticate_user(
     # Генерация уникального device_id для сессии
     device_id = str(uuid4())
 
-    access_token = create_access_token(sub=user_id, device_id=device_id)
+    roles = [user_role.role.name for user_role in user.roles]
+    access_token = create_access_token(
+        sub=user_id, device_id=device_id, roles=roles
+    )
     refresh_token = create_refresh_token(sub=user_id, device_id=device_id)
 
-    redis: Redis = await get_cache_storage()
-    key = f'refresh:{user_id}:{user_agent}'
+    redis: CacheStorage = await get_cache_storage()
+    key = refresh_key(user_id, user_agent)
     await redis.set(
         key,
         refresh_token,
@@ -51,13 +70,7 @@ async def authenticate_user(
     )
 
     # Сохраняем историю входа
-    login_rec = LoginHistory(
-        user_id=user.id,
-        user_agent=user_agent,
-        login_at=datetime.utcnow()
-    )
-    db.add(login_rec)
-    await db.commit()
+    await record_login(db, user.id, user_agent)
 
     return TokenResponse(
         access_token=access_token,
@@ -66,9 +79,13 @@ async def authenticate_user(
 
 
 async def handle_refresh_token(
-    token: str, redis: Redis, request: Request
+    token: str, redis: CacheStorage, request: Request, db: AsyncSession
 ) -> TokenResponse:
-    """Выполняет валидацию refresh-токена, обновляет пару токенов."""
+    """
+    Выполняет валидацию refresh-токена, обновляет пару токенов.
+    Роли для нового access-токена берутся из кеша ролей.
+    Проверка и замена refresh-токена в Redis атомарны.
+    """
     # Проверяем токен
     payload = decode_jwt(token, verify_exp=True, token_type='refresh')
     user_id = payload.get('sub')
@@ -81,32 +98,40 @@ async def handle_refresh_token(
         )
 
     user_agent = str(request.headers.get('User-Agent', ''))
-
-    # Проверяем наличие в Redis
-    key = f'refresh:{user_id}:{user_agent}'
-    stored_token = await redis.get(key)
-
-    if stored_token.decode('utf-8') != token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail='Refresh-токен недействителен или уже отозван'
-        )
-
-    # Удаляем старый refresh-токен
-    await redis.delete(key)
+    key = refresh_key(user_id, user_agent)
 
     # Генерируем новую пару токенов с новым device_id
     new_device_id = str(uuid4())
     new_refresh_token = create_refresh_token(sub=user_id, device_id=new_device_id)
-    new_access_token = create_access_token(sub=user_id, device_id=new_device_id)
+    roles = await get_user_role_names(db, user_id)
+    new_access_token = create_access_token(
+        sub=user_id, device_id=new_device_id, roles=roles
+    )
 
-    # Сохраняем новый refresh-токен
-    new_key = f'refresh:{user_id}:{user_agent}'
-    await redis.set(
-        new_key,
-        new_refresh_token,
-        ex=settings.refresh_token_expire_seconds
+    # Заменяем refresh-токен, только если предъявленный ещё действителен
+    scripts = await get_redis_scripts()
+    rotated = await scripts.rotate_refresh(
+        keys=[key],
+        args=[token, new_refresh_token, settings.refresh_token_expire_seconds]
     )
+    redis.invalidate(key)
+    if not rotated and settings.refresh_legacy_keys:
+        # Токен выдан до перехода на ключи с хеш-тегом: старый ключ
+        # забирается атомарно, и конкурентное обновление пройдёт один раз
+        rotated = await scripts.claim_refresh(
+            keys=[legacy_refresh_key(user_id, user_agent)], args=[token]
+        )
+        if rotated:
+            await redis.set(
+                key,
+                new_refresh_token,
+                ex=settings.refresh_token_expire_seconds
+            )
+    if not rotated:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Refresh-токен недействителен или уже отозван'
+        )
 
     return TokenResponse(
         access_token=new_access_token,
@@ -14,9 +14,11 @@ class BaseService:
         self.db_session = db_session
         self.db = DbService(db_session, model)
 
-    async def get_obj_or_404(self, id: UUID) -> Base:
+    async def get_obj_or_404(
+        self, id: UUID, profile: str | None = None
+    ) -> Base:
         """Метод получения объекта модели по id."""
-        obj = await self.db.get_by_id(id)
+        obj = await self.db.get_by_id(id, profile)
         if not obj:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -6,6 +7,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import Base
+from models.load_profiles import load_options
+from services.outbox import add_event
 
 
 class AbstractDb(ABC):
@@ -43,43 +46,103 @@ class DbService(AbstractDb):
         self.db = db
         self.model = model
 
-    async def get_by_id(self, id: UUID) -> Base | None:
+    def _select(self, profile: str | None = None):
+        """Запрос к модели с опциями загрузки связей из профиля."""
+        return select(self.model).options(
+            *load_options(self.model, profile)
+        )
+
+    async def get_by_id(
+        self, id: UUID, profile: str | None = None
+    ) -> Base | None:
         """Метод получения объекта модели по id."""
         result = await self.db.execute(
-            select(self.model).where(self.model.id == id)
+            self._select(profile).where(self.model.id == id)
         )
         return result.scalar_one_or_none()
 
-    async def get_by_kwargs(self, **kwargs) -> list[Base]:
+    async def get_by_kwargs(
+        self, profile: str | None = None, **kwargs
+    ) -> list[Base]:
         """Метод получения объектов по переданным параметрам."""
-        result = await self.db.execute(select(self.model).filter_by(**kwargs))
+        result = await self.db.execute(
+            self._select(profile).filter_by(**kwargs)
+        )
         return result.scalars().all()
 
-    async def get_all(self) -> list[Base]:
+    async def get_all(self, profile: str | None = None) -> list[Base]:
         """Метод получения всех объектов модели из БД."""
-        result = await self.db.execute(select(self.model))
+        result = await self.db.execute(self._select(profile))
         return result.scalars().all()
 
-    async def create(self, obj: BaseModel) -> Base:
-        """Метод создания объекта модели в БД."""
+    async def get_rows(
+        self,
+        columns: Sequence,
+        *filters,
+        joins: Sequence[tuple] = (),
+        order_by: Sequence = (),
+        limit: int | None = None,
+        offset: int | None = None
+    ) -> list[dict]:
+        """
+        Чтение только перечисленных колонок модели без создания объектов
+        ORM: строки не попадают в identity map и возвращаются словарями,
+        готовыми к сериализации. Для списков, которые только выводятся.
+        Колонка задаётся именем атрибута модели или выражением;
+        joins - пары (таблица, условие) для LEFT JOIN справочников.
+        """
+        stmt = select(*(
+            getattr(self.model, column) if isinstance(column, str) else column
+            for column in columns
+        ))
+        for target, onclause in joins:
+            stmt = stmt.outerjoin(target, onclause)
+        stmt = (
+            stmt.where(*filters)
+            .order_by(*order_by)
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.db.execute(stmt)
+        return [row._asdict() for row in result]
+
+    async def create(
+        self, obj: BaseModel, event: str | None = None, **payload
+    ) -> Base:
+        """
+        Метод создания объекта модели в БД.
+        Если передан event, в той же транзакции записывается событие outbox.
+        """
         db_obj = self.model(**obj.model_dump())
         self.db.add(db_obj)
+        if event:
+            # id объекта нужен событию до коммита
+            await self.db.flush()
+            add_event(self.db, event, db_obj.id, **payload)
         await self.db.commit()
         await self.db.refresh(db_obj)
         return db_obj
 
-    async def update(self, db_obj: Base, obj: BaseModel) -> Base:
+    async def update(
+        self, db_obj: Base, obj: BaseModel, event: str | None = None, **payload
+    ) -> Base:
         """Метод обновления объекта модели в БД."""
         update_data = obj.model_dump()
         for field in db_obj.__mapper__.attrs.keys():
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         self.db.add(db_obj)
+        if event:
+            add_event(self.db, event, db_obj.id, **payload)
         await self.db.commit()
         await self.db.refresh(db_obj)
         return db_obj
 
-    async def delete(self, db_obj: Base) -> None:
+    async def delete(
+        self, db_obj: Base, event: str | None = None, **payload
+    ) -> None:
         """Метод удаления объекта модели из БД."""
         await self.db.delete(db_obj)
+        if event:
+            add_event(self.db, event, db_obj.id, **payload)
         await self.db.commit()
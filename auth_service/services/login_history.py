@@ -0,0 +1,274 @@
+import asyncio
+import logging
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import (
+    DataError, IntegrityError, InterfaceError, OperationalError
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.postgres import async_session
+from models.user import LoginHistory, UserLoginSummary
+from services.outbox import USER_LOGGED_IN, add_event, insert_events
+from services.user_agents import normalize_agent, user_agent_cache
+from utils.uuid7 import uuid7
+
+logger = logging.getLogger(__name__)
+
+BUFFERED = 'buffered'
+SYNC = 'sync'
+
+# Ошибки, после которых пачку можно записать позже без изменений
+TRANSIENT_ERRORS = (
+    OSError, asyncio.TimeoutError, OperationalError, InterfaceError
+)
+# Ошибки в самих данных пачки: повтор закончится тем же
+REJECTED_ERRORS = (IntegrityError, DataError)
+
+
+async def update_login_summary(db: AsyncSession, rows: list[dict]) -> None:
+    """
+    Добавляет входы из rows в сводку пользователей одним INSERT ... ON
+    CONFLICT в текущей транзакции. Строки упорядочены по user_id, чтобы
+    конкурентные пачки разных воркеров блокировали их в одном порядке.
+    """
+    summary = {}
+    for row in rows:
+        item = summary.get(row['user_id'])
+        if item is None:
+            summary[row['user_id']] = {
+                'user_id': row['user_id'],
+                'login_count': 1,
+                'first_login_at': row['login_at'],
+                'last_login_at': row['login_at'],
+                'last_user_agent': row['user_agent'],
+            }
+            continue
+        item['login_count'] += 1
+        item['first_login_at'] = min(item['first_login_at'], row['login_at'])
+        if row['login_at'] >= item['last_login_at']:
+            item['last_login_at'] = row['login_at']
+            item['last_user_agent'] = row['user_agent']
+
+    stmt = pg_insert(UserLoginSummary).values(
+        sorted(summary.values(), key=lambda item: item['user_id'])
+    )
+    current, new = UserLoginSummary, stmt.excluded
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[UserLoginSummary.user_id],
+        set_={
+            'login_count': current.login_count + new.login_count,
+            'first_login_at': func.least(
+                current.first_login_at, new.first_login_at
+            ),
+            'last_login_at': func.greatest(
+                current.last_login_at, new.last_login_at
+            ),
+            'last_user_agent': case(
+                (
+                    new.last_login_at >= current.last_login_at,
+                    new.last_user_agent
+                ),
+                else_=current.last_user_agent
+            ),
+        }
+    ))
+
+
+class LoginHistoryWriter:
+    """
+    Буфер событий входа в памяти воркера.
+    События записываются пачками одним многострочным INSERT вместе
+    с событиями outbox в той же транзакции, когда
+    набирается batch_size записей или проходит flush_interval секунд.
+    Строки User-Agent заменяются на id справочника (services.user_agents).
+    При падении процесса теряются только незаписанные события - не больше
+    max_pending; при остановке сервера буфер сбрасывается в БД.
+    Пачка, которую БД отвергла (IntegrityError, DataError) или не смогла
+    записать max_attempts раз подряд по другой причине, отбрасывается,
+    чтобы не задерживать следующие события. При потере связи с БД
+    пачка ждёт сколько угодно, ограничен только размер буфера.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_pending: int,
+        max_attempts: int
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._attempts = 0
+        self._buffer: list[dict] = []
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._running = False
+        self._stats = {
+            'written': 0, 'batches': 0, 'dropped': 0, 'rejected': 0
+        }
+
+    def record(
+        self, user_id: UUID, user_agent: str, login_at: datetime
+    ) -> None:
+        self._buffer.append({
+            'id': uuid7(),
+            'user_id': user_id,
+            'user_agent': user_agent,
+            'login_at': login_at,
+        })
+        overflow = len(self._buffer) - self.max_pending
+        if overflow > 0:
+            # БД долго недоступна - теряем самые старые события, а не память
+            del self._buffer[:overflow]
+            self._stats['dropped'] += overflow
+            logger.warning(
+                'Буфер истории входов переполнен, событий потеряно: %s',
+                overflow
+            )
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Записывает все накопленные события."""
+        async with self._lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:len(batch)]
+                try:
+                    await self._write(batch)
+                except REJECTED_ERRORS:
+                    self._reject(batch)
+                    continue
+                except TRANSIENT_ERRORS:
+                    # Пачка вернётся в начало буфера и будет записана позже
+                    self._buffer[:0] = batch
+                    raise
+                except Exception:
+                    self._attempts += 1
+                    if self._attempts >= self.max_attempts:
+                        self._reject(batch)
+                        continue
+                    self._buffer[:0] = batch
+                    raise
+                except BaseException:
+                    self._buffer[:0] = batch
+                    raise
+                self._attempts = 0
+                self._stats['written'] += len(batch)
+                self._stats['batches'] += 1
+
+    def _reject(self, batch: list[dict]) -> None:
+        self._attempts = 0
+        self._stats['rejected'] += len(batch)
+        logger.exception(
+            'Пачка истории входов отброшена, событий потеряно: %s', len(batch)
+        )
+
+    async def _write(self, batch: list[dict]) -> None:
+        agent_ids = await user_agent_cache.resolve(
+            row['user_agent'] for row in batch
+        )
+        async with async_session() as db:
+            await db.execute(insert(LoginHistory).values([
+                {
+                    'id': row['id'],
+                    'user_id': row['user_id'],
+                    'user_agent_id': agent_ids[row['user_agent']],
+                    'login_at': row['login_at'],
+                }
+                for row in batch
+            ]))
+            await update_login_summary(db, batch)
+            await insert_events(db, USER_LOGGED_IN, [
+                (row['user_id'], {
+                    'user_agent': row['user_agent'],
+                    'login_at': row['login_at'].isoformat(),
+                })
+                for row in batch
+            ])
+            await db.commit()
+
+    def stats(self) -> dict[str, int]:
+        return {**self._stats, 'pending': len(self._buffer)}
+
+    async def start(self) -> None:
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Задача не отменяется, а завершается после текущей записи:
+        # отмена во время wait_for может быть потеряна
+        self._running = False
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+        self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception(
+                'Не удалось записать историю входов, событий потеряно: %s',
+                len(self._buffer)
+            )
+
+    async def _run(self) -> None:
+        while self._running:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self._running:
+                break
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception('Ошибка записи истории входов')
+                await asyncio.sleep(self.flush_interval)
+
+
+login_history_writer = LoginHistoryWriter(
+    batch_size=settings.login_history_batch_size,
+    flush_interval=settings.login_history_flush_interval,
+    max_pending=settings.login_history_max_pending,
+    max_attempts=settings.login_history_max_attempts
+)
+
+
+async def record_login(
+    db: AsyncSession, user_id: UUID, user_agent: str
+) -> None:
+    """
+    Сохраняет событие входа по режиму LOGIN_HISTORY_MODE:
+    buffered - в буфер воркера без записи в БД на время запроса,
+    sync - в текущей транзакции запроса, без риска потери.
+    """
+    login_at = datetime.utcnow()
+    user_agent = normalize_agent(user_agent)
+    if settings.login_history_mode == SYNC:
+        agent_ids = await user_agent_cache.resolve([user_agent])
+        db.add(LoginHistory(
+            user_id=user_id,
+            user_agent_id=agent_ids[user_agent],
+            login_at=login_at
+        ))
+        await update_login_summary(db, [{
+            'user_id': user_id, 'user_agent': user_agent, 'login_at': login_at
+        }])
+        add_event(
+            db, USER_LOGGED_IN, user_id,
+            user_agent=user_agent, login_at=login_at.isoformat()
+        )
+        await db.commit()
+        return
+    login_history_writer.record(user_id, user_agent, login_at)
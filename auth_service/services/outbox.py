@@ -0,0 +1,199 @@
+"""
+Исходящие события для внешних систем (transactional outbox).
+Событие записывается в таблицу outbox в той же транзакции, что и изменение
+данных, а фоновый ретранслятор пачками публикует его в поток Redis.
+Доставка не реже одного раза: при сбое между публикацией и удалением
+строки событие будет опубликовано повторно, поэтому потребители
+отбрасывают дубликаты по event_id.
+Порядок событий не гарантируется, в том числе для одного aggregate_id:
+id строки назначается при вставке, а не при коммите, и транзакция
+с меньшим id может зафиксироваться после уже опубликованной большей.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from uuid import UUID
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.postgres import async_session
+from models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+USER_REGISTERED = 'user.registered'
+USER_LOGGED_IN = 'user.logged_in'
+USER_LOGGED_OUT = 'user.logged_out'
+USER_CREDENTIALS_CHANGED = 'user.credentials_changed'
+USER_ROLE_GRANTED = 'user.role_granted'
+USER_ROLE_REVOKED = 'user.role_revoked'
+ROLE_CREATED = 'role.created'
+ROLE_UPDATED = 'role.updated'
+ROLE_DELETED = 'role.deleted'
+
+# Ключ advisory-блокировки: в каждый момент таблицу вычитывает один
+# ретранслятор, и одна строка не публикуется двумя воркерами сразу
+RELAY_LOCK_ID = 0x6f7574626f78
+
+
+def add_event(
+    db: AsyncSession, event_type: str, aggregate_id: UUID, **payload
+) -> None:
+    """Добавляет событие в текущую транзакцию сессии."""
+    db.add(OutboxEvent(
+        event_type=event_type, aggregate_id=aggregate_id, payload=payload
+    ))
+
+
+async def insert_events(
+    db: AsyncSession, event_type: str, items: list[tuple[UUID, dict]]
+) -> None:
+    """Добавляет в транзакцию пачку событий одного типа одним INSERT."""
+    now = datetime.now()
+    await db.execute(insert(OutboxEvent).values([
+        {
+            'event_type': event_type,
+            'aggregate_id': aggregate_id,
+            'payload': payload,
+            'created_at': now,
+        }
+        for aggregate_id, payload in items
+    ]))
+
+
+def stream_entry(
+    event_id: str,
+    event_type: str,
+    aggregate_id: UUID,
+    payload: dict,
+    created_at: datetime
+) -> dict[str, str]:
+    """Поля записи в потоке событий."""
+    return {
+        'event_id': event_id,
+        'type': event_type,
+        'aggregate_id': str(aggregate_id),
+        'payload': orjson.dumps(payload).decode(),
+        'created_at': created_at.isoformat(),
+    }
+
+
+class OutboxRelay:
+    """
+    Ретранслятор outbox в поток Redis.
+    За один цикл блокирует таблицу advisory-блокировкой транзакции,
+    читает до batch_size зафиксированных событий, публикует их одним
+    конвейером XADD и удаляет в той же транзакции. Пачка упорядочена
+    по id, но между пачками событие может прийти раньше более старого
+    (см. описание модуля). Пока пачки полные, следующая читается
+    сразу, иначе - через poll_interval секунд.
+    """
+
+    def __init__(
+        self, stream: str, batch_size: int, poll_interval: float, maxlen: int
+    ) -> None:
+        self.stream = stream
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.maxlen = maxlen
+        self.redis: Redis | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._running = False
+        self._stats = {'published': 0, 'batches': 0}
+
+    def stats(self) -> dict[str, int]:
+        return dict(self._stats)
+
+    async def ensure_groups(self, groups: list[str]) -> None:
+        """Создаёт группы потребителей, которые будут читать поток с начала."""
+        for group in groups:
+            try:
+                await self.redis.xgroup_create(
+                    self.stream, group, id='0', mkstream=True
+                )
+            except ResponseError as exc:
+                if 'BUSYGROUP' not in str(exc):
+                    raise
+
+    async def relay_batch(self) -> int:
+        """Публикует одну пачку событий, возвращает их количество."""
+        async with async_session() as db:
+            async with db.begin():
+                locked = await db.scalar(
+                    select(func.pg_try_advisory_xact_lock(RELAY_LOCK_ID))
+                )
+                if not locked:
+                    return 0
+                result = await db.execute(
+                    select(OutboxEvent)
+                    .order_by(OutboxEvent.id)
+                    .limit(self.batch_size)
+                )
+                events = result.scalars().all()
+                if not events:
+                    return 0
+                pipe = self.redis.pipeline(transaction=False)
+                for event in events:
+                    pipe.xadd(
+                        self.stream,
+                        stream_entry(
+                            str(event.id), event.event_type,
+                            event.aggregate_id, event.payload, event.created_at
+                        ),
+                        maxlen=self.maxlen,
+                        approximate=True
+                    )
+                await pipe.execute()
+                await db.execute(
+                    delete(OutboxEvent).where(
+                        OutboxEvent.id.in_([event.id for event in events])
+                    )
+                )
+        self._stats['published'] += len(events)
+        self._stats['batches'] += 1
+        return len(events)
+
+    async def start(self, redis: Redis, groups: list[str] = ()) -> None:
+        self.redis = redis
+        await self.ensure_groups(groups)
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Как и у буфера истории входов: без отмены задачи во время wait_for
+        self._running = False
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while self._running:
+            try:
+                while self._running:
+                    if await self.relay_batch() < self.batch_size:
+                        break
+            except Exception:
+                logger.exception('Ошибка публикации событий outbox')
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.poll_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+outbox_relay = OutboxRelay(
+    stream=settings.events_stream,
+    batch_size=settings.outbox_batch_size,
+    poll_interval=settings.outbox_poll_interval,
+    maxlen=settings.events_stream_maxlen
+)
+
@@ -8,6 +8,8 @@ from db.postgres import get_session
 from models.user import User
 from schemas.user import UserCreate
 from services.base import BaseService
+from services.outbox import USER_REGISTERED
+from utils.password import hash_password
 
 
 class AuthService(BaseService):
@@ -16,7 +18,7 @@ class AuthService(BaseService):
     async def register_user(self, user_create: UserCreate) -> User:
         """
         Регистрирует нового пользователя.
-        Хеширование происходит в модели User.__init__.
+        Пароль хешируется в пуле процессов до сохранения в БД.
         """
         if await self.db.get_by_kwargs(login=user_create.login):
             raise HTTPException(
@@ -29,7 +31,12 @@ class AuthService(BaseService):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail='Пароль слишком простой (менее 6 символов).'
             )
-        return await self.db.create(user_create)
+        user_create = user_create.model_copy(
+            update={'password': await hash_password(user_create.password)}
+        )
+        return await self.db.create(
+            user_create, event=USER_REGISTERED, login=user_create.login
+        )
 
 
 @lru_cache()
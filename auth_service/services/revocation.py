@@ -0,0 +1,302 @@
+import asyncio
+import base64
+import hashlib
+import logging
+import time
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.config import settings
+from db.cache import CacheStorage
+from db.keys import legacy_revoked_keys, revoked_key
+from db.redis_client import is_redis_healthy, mark_redis_failed
+from db.scripts import get_redis_scripts
+from db.tiered_cache import MISSING
+from schemas.user import UserPrincipal
+from services.outbox import USER_LOGGED_OUT, stream_entry
+from utils.bloom import RotatingBloomFilter
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_STREAM = 'revocations'
+
+
+def token_digest(token: str) -> str:
+    """Короткий идентификатор для токенов, выпущенных без jti."""
+    digest = hashlib.blake2b(token.encode(), digest_size=12).digest()
+    return base64.urlsafe_b64encode(digest).decode()
+
+
+def remaining_ttl(principal: UserPrincipal) -> int:
+    """Оставшееся время жизни токена в секундах."""
+    if principal.exp is None:
+        return settings.access_token_expire_seconds
+    return max(1, principal.exp - int(time.time()))
+
+
+class RevocationFilter:
+    """
+    Вероятностный негативный кеш отозванных jti в памяти воркера.
+    Наполняется из потока Redis с событиями отзыва: если jti нет
+    в фильтре, токен точно не отзывался и запрос в Redis не нужен.
+    Пока поток не вычитан до конца или соединение потеряно,
+    фильтр не используется.
+    """
+
+    def __init__(self, bloom: RotatingBloomFilter) -> None:
+        self.bloom = bloom
+        self.ready = False
+        self.redis: Redis | None = None
+        self._last_id = '0-0'
+        self._listener: asyncio.Task | None = None
+        self._stats = {'avoided': 0, 'checked': 0, 'false_positives': 0}
+
+    def might_be_revoked(self, jti: str, degraded: bool = False) -> bool:
+        """
+        False - jti точно не отзывался.
+        В деградированном режиме используется содержимое фильтра на момент
+        потери связи с Redis, даже если поток уже не читается.
+        """
+        if not self.ready and not degraded:
+            return True
+        if jti in self.bloom:
+            self._stats['checked'] += 1
+            return True
+        self._stats['avoided'] += 1
+        return False
+
+    def record_false_positive(self) -> None:
+        self._stats['false_positives'] += 1
+
+    def stats(self) -> dict:
+        return {**self._stats, 'ready': self.ready, **self.bloom.stats()}
+
+    async def start(self, redis: Redis) -> None:
+        self.redis = redis
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        self._listener = None
+        self.ready = False
+
+    def _apply(self, entries) -> None:
+        for entry_id, fields in entries:
+            entry_id = entry_id.decode()
+            timestamp = int(entry_id.split('-')[0]) / 1000
+            self.bloom.add(fields[b'jti'].decode(), timestamp)
+            self._last_id = entry_id
+
+    async def _load(self) -> None:
+        """
+        Вычитывает события отзыва за время жизни access-токена.
+        Более старые события не нужны: отозванные ими токены истекли.
+        Поток обрезается только по MAXLEN (MINID появился в Redis 6.2),
+        поэтому чтение и после пустого окна продолжается с его начала,
+        а не с начала потока.
+        """
+        self.bloom.clear()
+        window = settings.access_token_expire_seconds
+        start = f'{int((time.time() - window) * 1000)}-0'
+        self._last_id = start
+        while True:
+            entries = await self.redis.xrange(
+                REVOCATION_STREAM, min=start, count=1000
+            )
+            if not entries:
+                break
+            self._apply(entries)
+            # Redis 5 не поддерживает исключающую границу в XRANGE
+            ms, seq = self._last_id.split('-')
+            start = f'{ms}-{int(seq) + 1}'
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                await self._load()
+                self.ready = True
+                while True:
+                    response = await self.redis.xread(
+                        {REVOCATION_STREAM: self._last_id},
+                        count=1000,
+                        block=5000
+                    )
+                    for _, entries in response:
+                        self._apply(entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.ready = False
+                logger.exception('Ошибка чтения потока отзыва токенов')
+                await asyncio.sleep(1)
+
+
+revocation_filter = RevocationFilter(
+    RotatingBloomFilter(
+        window=settings.access_token_expire_seconds,
+        buckets=settings.revocation_filter_buckets,
+        memory_bytes=settings.revocation_filter_memory_bytes,
+        fp_rate=settings.revocation_filter_fp_rate
+    )
+)
+
+
+async def revoke_session(
+    cache: CacheStorage,
+    principal: UserPrincipal,
+    refresh_key: str,
+    legacy_refresh_key: str | None = None
+) -> None:
+    """
+    Удаляет refresh-токен устройства, помечает access-токен отозванным
+    до конца его срока жизни и публикует событие отзыва для фильтров
+    воркеров. Всё выполняется за один запрос к Redis.
+    Выход не меняет данные в БД, поэтому событие для внешних систем
+    пишется сразу в поток событий, минуя outbox.
+    """
+    scripts = await get_redis_scripts()
+    revoked = revoked_key(principal.id, principal.jti)
+    event = stream_entry(
+        principal.jti, USER_LOGGED_OUT, principal.id,
+        {'device_id': principal.device_id}, datetime.now()
+    )
+    await scripts.logout(
+        refresh_key=refresh_key,
+        revoked_key=revoked,
+        ttl=remaining_ttl(principal),
+        stream=REVOCATION_STREAM,
+        jti=principal.jti,
+        maxlen=settings.revocation_stream_maxlen,
+        events=(
+            (settings.events_stream, event, settings.events_stream_maxlen),
+        ),
+        legacy_refresh_key=legacy_refresh_key
+    )
+    cache.invalidate(refresh_key)
+    cache.invalidate(revoked)
+    # Текущий воркер узнаёт об отзыве сразу, не дожидаясь события из потока
+    revocation_filter.bloom.add(principal.jti)
+
+
+async def is_access_token_revoked(
+    cache: CacheStorage, principal: UserPrincipal, token: str
+) -> bool:
+    """
+    Проверяет, отозван ли access-токен.
+    Если Redis недоступен, отвечает по локальным данным воркера.
+    """
+    if not is_redis_healthy():
+        return _is_revoked_locally(cache, principal)
+    try:
+        return await _is_revoked(cache, principal, token)
+    except RedisError:
+        mark_redis_failed()
+        return _is_revoked_locally(cache, principal)
+
+
+def _is_revoked_locally(cache: CacheStorage, principal: UserPrincipal) -> bool:
+    """
+    Деградированный режим: недавний ответ Redis об отзыве из L1-кеша
+    (в том числе истёкший) или фильтр отзыва. Если ни то, ни другое не даёт
+    уверенного ответа, запрос отклоняется.
+    """
+    cached = cache.local.get(
+        revoked_key(principal.id, principal.jti), stale=True
+    )
+    if cached is not MISSING:
+        return cached is not None
+    if not principal.legacy and settings.revocation_filter_enabled:
+        if not revocation_filter.might_be_revoked(principal.jti, degraded=True):
+            return False
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail='Не удалось проверить токен, повторите попытку позже'
+    )
+
+
+def _revocation_keys(principal: UserPrincipal, token: str) -> list[str] | None:
+    """
+    Ключи Redis, по которым может быть записан отзыв токена.
+    None - фильтр отзыва гарантирует, что токен не отзывался.
+    """
+    # Отзывы токенов без jti по полному тексту токена не попадали в поток
+    skip_filter = principal.legacy and settings.revocation_legacy_keys
+    if (
+        not skip_filter
+        and settings.revocation_filter_enabled
+        and not revocation_filter.might_be_revoked(principal.jti)
+    ):
+        return None
+    keys = [revoked_key(principal.id, principal.jti)]
+    if settings.revocation_legacy_keys:
+        # Отзывы, записанные до смены формата ключей
+        keys += legacy_revoked_keys(
+            principal.id, principal.jti, token if principal.legacy else None
+        )
+    return keys
+
+
+def _record_miss(principal: UserPrincipal) -> None:
+    if revocation_filter.ready and not principal.legacy:
+        revocation_filter.record_false_positive()
+
+
+async def _is_revoked(
+    cache: CacheStorage, principal: UserPrincipal, token: str
+) -> bool:
+    keys = _revocation_keys(principal, token)
+    if keys is None:
+        return False
+    # Ключи прежних форматов читаются тем же конвейером, что и основной.
+    # Отсутствие отзыва не кешируется в L1: отзыв в другом воркере должен
+    # быть виден сразу, а не через CACHE_LOCAL_TTL. С фильтром отзыва
+    # сюда доходят только jti, которые в фильтре есть.
+    values = await cache.get_many(keys, cache_missing=False)
+    if any(value is not None for value in values):
+        return True
+    _record_miss(principal)
+    return False
+
+
+async def are_access_tokens_revoked(
+    cache: CacheStorage, items: list[tuple[UserPrincipal, str]]
+) -> list[bool]:
+    """
+    Пакетная проверка отзыва: все ключи, которые не отсеял фильтр
+    и не нашлись в L1, читаются из Redis за один запрос.
+    """
+    if not is_redis_healthy():
+        return [_is_revoked_locally(cache, principal) for principal, _ in items]
+    try:
+        return await _are_revoked(cache, items)
+    except RedisError:
+        mark_redis_failed()
+        return [_is_revoked_locally(cache, principal) for principal, _ in items]
+
+
+async def _are_revoked(
+    cache: CacheStorage, items: list[tuple[UserPrincipal, str]]
+) -> list[bool]:
+    key_sets = [_revocation_keys(principal, token) for principal, token in items]
+    keys = [key for key_set in key_sets if key_set for key in key_set]
+    values = iter(
+        await cache.get_many(keys, cache_missing=False) if keys else []
+    )
+    result = []
+    for (principal, _), key_set in zip(items, key_sets):
+        if key_set is None:
+            result.append(False)
+            continue
+        found = [next(values) is not None for _ in key_set]
+        if not any(found):
+            _record_miss(principal)
+        result.append(any(found))
+    return result
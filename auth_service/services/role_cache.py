@@ -0,0 +1,183 @@
+import bisect
+import asyncio
+import logging
+import time
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.tiered_cache import MISSING, LocalCache
+from models.role import Role, UserRole
+from schemas.role import RoleDto
+
+logger = logging.getLogger(__name__)
+
+ROLES_CHANNEL = 'roles:invalidate'
+ALL_ROLES = 'roles'
+USER_PREFIX = 'user:'
+
+
+class RoleCache:
+    """
+    Кеш ролей и назначений ролей пользователям в памяти воркера.
+    Изменения публикуются в канал Redis, и каждый воркер сбрасывает
+    устаревшие записи. TTL записей ограничивает рассинхронизацию
+    на случай потери соединения с каналом.
+    """
+
+    def __init__(self, max_users: int, ttl: float) -> None:
+        self.ttl = ttl
+        self.redis: Redis | None = None
+        self._roles: dict[UUID, RoleDto] | None = None
+        self._roles_loaded_at = 0.0
+        # Роли списком и их названия для постраничного вывода
+        self._ordered: tuple[dict, list[str], list[RoleDto]] | None = None
+        self._user_roles = LocalCache(max_users, ttl)
+        # Версия растёт при каждой инвалидации: загрузка, начатая до неё,
+        # не должна попасть в кеш
+        self._version = 0
+        self._listener: asyncio.Task | None = None
+
+    async def get_roles(self, db: AsyncSession) -> dict[UUID, RoleDto]:
+        """Все роли, упорядоченные по названию (по кодам символов)."""
+        if (
+            self._roles is None
+            or time.monotonic() - self._roles_loaded_at > self.ttl
+        ):
+            version = self._version
+            result = await db.execute(select(Role.id, Role.name))
+            # Порядок задаётся в Python, а не сортировкой БД: постраничный
+            # вывод ищет начало страницы bisect по тем же названиям, а
+            # правило сравнения БД (например, en_US.UTF-8) с ним не совпадает
+            roles = {
+                role_id: RoleDto(id=role_id, name=name)
+                for role_id, name in sorted(
+                    result.all(), key=lambda row: row.name
+                )
+            }
+            if version != self._version:
+                return roles
+            self._roles = roles
+            self._roles_loaded_at = time.monotonic()
+        return self._roles
+
+    async def get_roles_page(
+        self, db: AsyncSession, after: str | None, limit: int | None
+    ) -> list[RoleDto]:
+        """
+        Роли с названием больше after, не больше limit (None - все).
+        Начало страницы ищется двоичным поиском по названиям.
+        """
+        roles = await self.get_roles(db)
+        if self._ordered is None or self._ordered[0] is not roles:
+            values = list(roles.values())
+            self._ordered = (roles, [role.name for role in values], values)
+        _, names, values = self._ordered
+        start = bisect.bisect_right(names, after) if after is not None else 0
+        end = start + limit if limit is not None else None
+        return values[start:end]
+
+    async def get_role(self, db: AsyncSession, role_id: UUID) -> RoleDto | None:
+        roles = await self.get_roles(db)
+        return roles.get(role_id)
+
+    async def get_user_role_ids(
+        self, db: AsyncSession, user_id: UUID
+    ) -> frozenset[UUID]:
+        key = str(user_id)
+        role_ids = self._user_roles.get(key)
+        if role_ids is MISSING:
+            version = self._version
+            result = await db.execute(
+                select(UserRole.role_id).where(UserRole.user_id == user_id)
+            )
+            role_ids = frozenset(result.scalars().all())
+            if version == self._version:
+                self._user_roles.set(key, role_ids)
+        return role_ids
+
+    async def get_user_role_names(
+        self, db: AsyncSession, user_id: UUID
+    ) -> list[str]:
+        roles = await self.get_roles(db)
+        return [
+            roles[role_id].name
+            for role_id in await self.get_user_role_ids(db, user_id)
+            if role_id in roles
+        ]
+
+    async def has_role(
+        self, db: AsyncSession, user_id: UUID, name: str
+    ) -> bool:
+        """
+        Назначена ли пользователю роль сейчас. Назначения и роли берутся
+        из кеша, поэтому отзыв роли действует сразу, а не после истечения
+        access-токена с прежним списком ролей.
+        """
+        return name in await self.get_user_role_names(db, user_id)
+
+    async def invalidate_roles(self) -> None:
+        """Сбрасывает роли во всех воркерах."""
+        await self._publish(ALL_ROLES)
+
+    async def invalidate_user(self, user_id: UUID) -> None:
+        """Сбрасывает назначения ролей пользователя во всех воркерах."""
+        await self._publish(f'{USER_PREFIX}{user_id}')
+
+    async def _publish(self, message: str) -> None:
+        self._handle(message)
+        if self.redis is not None:
+            await self.redis.publish(ROLES_CHANNEL, message)
+
+    def _handle(self, message: str) -> None:
+        self._version += 1
+        if message.startswith(USER_PREFIX):
+            self._user_roles.delete(message.removeprefix(USER_PREFIX))
+        else:
+            self._roles = None
+
+    def clear(self) -> None:
+        self._version += 1
+        self._roles = None
+        self._user_roles = LocalCache(self._user_roles.max_size, self.ttl)
+
+    async def start(self, redis: Redis) -> None:
+        self.redis = redis
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        self._listener = None
+        self.redis = None
+
+    async def _listen(self) -> None:
+        """Слушает канал инвалидаций, переподключаясь при ошибках."""
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(ROLES_CHANNEL)
+                    # Пока не были подписаны, сообщения могли потеряться
+                    self.clear()
+                    async for message in pubsub.listen():
+                        if message['type'] == 'message':
+                            self._handle(message['data'].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Ошибка подписки на инвалидацию ролей')
+                self.clear()
+                await asyncio.sleep(1)
+
+
+role_cache = RoleCache(
+    max_users=settings.role_cache_max_users,
+    ttl=settings.role_cache_ttl
+)
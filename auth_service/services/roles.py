@@ -4,11 +4,19 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
+from api.v1.pagination import CursorParams, decode_cursor, encode_cursor
 from db.postgres import get_session
 from models.role import Role, UserRole
 from services.base import BaseService
+from services.outbox import (
+    ROLE_CREATED, ROLE_DELETED, ROLE_UPDATED,
+    USER_ROLE_GRANTED, USER_ROLE_REVOKED, add_event
+)
+from services.role_cache import role_cache
 from schemas.role import RoleOperation, RoleDto
+from schemas.user import UserPrincipal
 from models.user import User
 from utils.role import permission_required
 
@@ -34,31 +42,60 @@ class RoleService(BaseService):
 
     @permission_required('superuser')
     async def create_role(
-        self, request_obj: RoleDto, current_user: User
+        self, request_obj: RoleDto, current_user: UserPrincipal
     ) -> Role:
         """Создание объекта роли."""
         await self._check_role_name(name=request_obj.name)
-        return await self.db.create(request_obj)
+        role = await self.db.create(
+            request_obj, event=ROLE_CREATED, name=request_obj.name
+        )
+        await role_cache.invalidate_roles()
+        return role
 
     @permission_required('superuser')
     async def update_role(
-        self, request_obj: RoleDto, role_id: UUID, current_user: User
+        self, request_obj: RoleDto, role_id: UUID, current_user: UserPrincipal
     ) -> Role:
         """Обновление объекта роли."""
         role_obj = await self.get_obj_or_404(role_id)
-        return await self.db.update(role_obj, request_obj)
+        role = await self.db.update(
+            role_obj, request_obj, event=ROLE_UPDATED, name=request_obj.name
+        )
+        await role_cache.invalidate_roles()
+        return role
 
     @permission_required('superuser')
-    async def delete_role(self, role_id: UUID, current_user: User) -> None:
+    async def delete_role(self, role_id: UUID, current_user: UserPrincipal) -> None:
         """Удаление объекта роли."""
-        role_obj = await self.get_obj_or_404(role_id)
+        role_obj = await self.get_obj_or_404(role_id, profile='admin')
         await self._check_protected_role(role_obj)
-        return await self.db.delete(role_obj)
+        await self.db.delete(role_obj, event=ROLE_DELETED, name=role_obj.name)
+        await role_cache.invalidate_roles()
 
     @permission_required('superuser')
-    async def get_roles_list(self, current_user: User) -> list[Role]:
-        """Получение списка существующих ролей."""
-        return await self.db.get_all()
+    async def get_roles_list(
+        self, current_user: UserPrincipal, pagination: CursorParams
+    ) -> tuple[list[RoleDto], str | None]:
+        """
+        Получение списка существующих ролей из кеша воркера
+        в порядке названий и курсора следующей страницы.
+        """
+        after = None
+        if pagination.cursor:
+            after, _ = decode_cursor(pagination.cursor, str, UUID)
+        limit = pagination.page_size
+        roles = await role_cache.get_roles_page(
+            self.db_session, after, limit + 1 if limit else None
+        )
+        if not limit or len(roles) <= limit:
+            return roles, None
+        roles = roles[:limit]
+        return roles, encode_cursor(roles[-1].name, str(roles[-1].id))
+
+
+async def get_user_role_names(db: AsyncSession, user_id: UUID) -> list[str]:
+    """Названия ролей пользователя для включения в access-токен."""
+    return await role_cache.get_user_role_names(db, user_id)
 
 
 @lru_cache()
@@ -72,25 +109,22 @@ class UserRoleService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def _get_user(self, user_id: UUID) -> User:
-        """Получает пользователя по id."""
+    async def _get_user(self, user_id: UUID) -> UUID:
+        """Проверяет существование пользователя и возвращает его id."""
         result = await self.db.execute(
-            select(User).where(User.id == user_id)
+            select(User.id).where(User.id == user_id)
         )
-        user = result.scalar_one_or_none()
-        if not user:
+        user_id = result.scalar_one_or_none()
+        if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail='Пользователь не найден'
             )
-        return user
+        return user_id
 
-    async def _get_role(self, role_id: UUID) -> Role:
-        """Получает роль по id."""
-        result = await self.db.execute(
-            select(Role).where(Role.id == role_id)
-        )
-        role = result.scalar_one_or_none()
+    async def _get_role(self, role_id: UUID) -> RoleDto:
+        """Получает роль по id из кеша воркера."""
+        role = await role_cache.get_role(self.db, role_id)
         if not role:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -99,9 +133,9 @@ class UserRoleService:
         return role
 
     @permission_required('superuser')
-    async def assign_role(self, role_operation: RoleOperation, current_user: User) -> UserRole:
+    async def assign_role(self, role_operation: RoleOperation, current_user: UserPrincipal) -> UserRole:
         """Назначение роли"""
-        user = await self._get_user(role_operation.user_id)
+        user_id = await self._get_user(role_operation.user_id)
         role = await self._get_role(role_operation.role_id)
         existing_role = await self.db.execute(
             select(UserRole).where(
@@ -114,15 +148,28 @@ class UserRoleService:
                 status_code=status.HTTP_409_CONFLICT,
                 detail='Роль уже назначена пользователю'
             )
-        user_role = UserRole(user_id=user.id, role_id=role.id)
+        user_role = UserRole(user_id=user_id, role_id=role.id)
         self.db.add(user_role)
-        await self.db.commit()
+        add_event(
+            self.db, USER_ROLE_GRANTED, user_id,
+            role_id=str(role.id), role=role.name
+        )
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            # Конкурентное назначение той же роли (uq_user_roles_user_id_role_id)
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail='Роль уже назначена пользователю'
+            )
         await self.db.refresh(user_role)
+        await role_cache.invalidate_user(user_id)
         return user_role
 
     @permission_required('superuser')
     async def remove_role(
-        self, role_operation: RoleOperation, current_user: User
+        self, role_operation: RoleOperation, current_user: UserPrincipal
     ) -> None:
         """Удаление роли"""
         user_role = await self.db.execute(
@@ -138,4 +185,9 @@ class UserRoleService:
                 detail='Роль не назначена пользователю'
             )
         await self.db.delete(user_role)
+        add_event(
+            self.db, USER_ROLE_REVOKED, role_operation.user_id,
+            role_id=str(role_operation.role_id)
+        )
         await self.db.commit()
+        await role_cache.invalidate_user(role_operation.user_id)
@@ -0,0 +1,116 @@
+import hmac
+
+from fastapi import Header, HTTPException, status
+
+from core.config import settings
+from db.cache import CacheStorage
+from schemas.token import TokenIntrospection
+from schemas.user import UserPrincipal
+from services.revocation import (
+    are_access_tokens_revoked, is_access_token_revoked, token_digest
+)
+from utils.jwt import decode_access_token
+
+BEARER_PREFIX = 'bearer '
+SERVICE_TOKEN_HEADER = 'X-Service-Token'
+
+
+def principal_from_payload(payload: dict, token: str) -> UserPrincipal:
+    """Пользователь из claims access-токена, без обращения к БД."""
+    return UserPrincipal(
+        id=payload['sub'],
+        roles=payload.get('roles', []),
+        device_id=payload.get('device_id'),
+        jti=payload.get('jti') or token_digest(token),
+        exp=payload.get('exp'),
+        legacy='jti' not in payload
+    )
+
+
+def is_service_token_valid(service_token: str | None) -> bool:
+    """Ключ входит в INTROSPECT_SERVICE_TOKENS."""
+    return bool(service_token) and any(
+        hmac.compare_digest(service_token.encode(), allowed.encode())
+        for allowed in settings.introspect_service_tokens
+    )
+
+
+def require_service_token(
+    service_token: str | None = Header(None, alias=SERVICE_TOKEN_HEADER)
+) -> None:
+    """
+    Доступ только для внутренних сервисов с ключом из
+    INTROSPECT_SERVICE_TOKENS. Ответ раскрывает владельца и роли
+    токенов, поэтому без ключа эндпоинт служил бы проверкой
+    украденных токенов.
+    """
+    if is_service_token_valid(service_token):
+        return
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail='Требуется ключ сервиса'
+    )
+
+
+async def verify_authorization(
+    cache: CacheStorage, authorization: str | None
+) -> UserPrincipal | None:
+    """
+    Пользователь по заголовку Authorization: Bearer <access-токен>
+    или None, если токен отсутствует, невалиден или отозван.
+    """
+    if not authorization or authorization[:7].lower() != BEARER_PREFIX:
+        return None
+    return await validate_access_token(cache, authorization[7:].strip())
+
+
+async def validate_access_token(
+    cache: CacheStorage, token: str
+) -> UserPrincipal | None:
+    """Пользователь по действительному и не отозванному access-токену."""
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+    principal = principal_from_payload(payload, token)
+    if await is_access_token_revoked(cache, principal, token):
+        return None
+    return principal
+
+
+async def introspect_tokens(
+    cache: CacheStorage, tokens: list[str]
+) -> list[TokenIntrospection]:
+    """
+    Проверяет пакет access-токенов: подписи проверяются по одному разу
+    на уникальный токен (повторные берутся из кеша проверенных токенов),
+    отзыв всех действительных токенов проверяется одним запросом к Redis.
+    """
+    principals: dict[str, UserPrincipal] = {}
+    for token in dict.fromkeys(tokens):
+        payload = decode_access_token(token)
+        if payload is not None:
+            principals[token] = principal_from_payload(payload, token)
+
+    items = list(principals.items())
+    revoked = await are_access_tokens_revoked(
+        cache, [(principal, token) for token, principal in items]
+    )
+    active = {
+        token: principal
+        for (token, principal), is_revoked in zip(items, revoked)
+        if not is_revoked
+    }
+
+    results = []
+    for token in tokens:
+        principal = active.get(token)
+        if principal is None:
+            results.append(TokenIntrospection(active=False))
+        else:
+            results.append(TokenIntrospection(
+                active=True,
+                sub=principal.id,
+                roles=principal.roles,
+                exp=principal.exp
+            ))
+    return results
@@ -1,62 +1,149 @@
 from functools import lru_cache
+from uuid import UUID
 
 from fastapi import Depends, HTTPException, status, Response, Request
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, tuple_
 
-from api.v1.pagination import PaginationParams
+from api.v1.pagination import (
+    PaginationParams, decode_cursor, encode_cursor, naive_datetime
+)
 from core.config import settings
 from db.cache import CacheStorage, get_cache_storage
+from db.keys import legacy_refresh_key, refresh_key
+from db.partitions import retention_start
 from db.postgres import get_session
-from models.user import User, LoginHistory
+from services.revocation import is_access_token_revoked, revoke_session
+from services.token_validation import principal_from_payload
+from models.user import User, LoginHistory, UserAgent, UserLoginSummary
 from services.base import BaseService
-from schemas.user import PaginatedLoginHistory, LoginHistoryDto
+from services.db import DbService
+from schemas.user import UserPrincipal, UserProfile
 from utils.jwt import decode_jwt, scheme
 
 
+# Поля LoginHistoryDto и LoginSummaryDto
+LOGIN_HISTORY_COLUMNS = (
+    'id', UserAgent.value.label('user_agent'), 'login_at'
+)
+# Строка User-Agent берётся из справочника по первичному ключу
+LOGIN_HISTORY_JOINS = (
+    (UserAgent, UserAgent.id == LoginHistory.user_agent_id),
+)
+LOGIN_SUMMARY_COLUMNS = (
+    UserLoginSummary.login_count,
+    UserLoginSummary.first_login_at,
+    UserLoginSummary.last_login_at,
+    UserLoginSummary.last_user_agent,
+)
+
+
 class UserService(BaseService):
     """Сервис пользователя."""
 
     def __init__(self, cache: CacheStorage, *args, **kwargs) -> None:
         self.cache = cache
         super().__init__(*args, **kwargs)
+        self.history = DbService(self.db_session, LoginHistory)
 
     async def get_user_login_history(
         self,
-        request_user: User,
+        request_user: UserPrincipal,
         pagination: PaginationParams,
-    ) -> PaginatedLoginHistory:
-        """Получение истории входов пользователя."""
+    ) -> dict:
+        """
+        Получение истории входов пользователя.
+        Буфер воркера здесь не записывается: в режиме buffered вход
+        появляется в истории и сводке после записи пачки воркером,
+        принявшим вход, - при доступной БД не позже чем через
+        LOGIN_HISTORY_FLUSH_INTERVAL секунд. Записи читаются кортежами
+        колонок и возвращаются словарём в формате PaginatedLoginHistory
+        без создания объектов ORM и схем.
+        """
         offset = (pagination.page_number - 1) * pagination.page_size
+        # Секции старше срока хранения не читаются
+        filters = [
+            LoginHistory.user_id == request_user.id,
+            LoginHistory.login_at >= retention_start(
+                settings.login_history_retention_months
+            ),
+        ]
 
-        total_stmt = select(func.count(LoginHistory.id)).where(
-            LoginHistory.user_id == request_user.id
+        # Итог берётся из сводки входов, а не из COUNT по истории
+        result = await self.db_session.execute(
+            select(*LOGIN_SUMMARY_COLUMNS)
+            .where(UserLoginSummary.user_id == request_user.id)
         )
-        total_result = await self.db_session.execute(total_stmt)
-        total = total_result.scalar_one()
-
-        stmt = (
-            select(LoginHistory)
-            .where(LoginHistory.user_id == request_user.id)
-            .order_by(LoginHistory.login_at.desc())
-            .offset(offset)
-            .limit(pagination.page_size)
+        summary = result.first()
+        summary = summary._asdict() if summary else None
+
+        if pagination.cursor:
+            login_at, last_id = decode_cursor(
+                pagination.cursor, naive_datetime, UUID
+            )
+            filters.append(
+                tuple_(LoginHistory.login_at, LoginHistory.id)
+                < tuple_(login_at, last_id)
+            )
+            offset = None
+        # Лишняя запись показывает, есть ли следующая страница
+        items = await self.history.get_rows(
+            LOGIN_HISTORY_COLUMNS,
+            *filters,
+            joins=LOGIN_HISTORY_JOINS,
+            order_by=(LoginHistory.login_at.desc(), LoginHistory.id.desc()),
+            limit=pagination.page_size + 1,
+            offset=offset
         )
-        result = await self.db_session.execute(stmt)
-        items = result.scalars().all()
-
-        return PaginatedLoginHistory(
-            total=total,
-            page=pagination.page_number,
-            size=pagination.page_size,
-            items=[LoginHistoryDto.from_orm(item) for item in items]
+        next_cursor = None
+        if len(items) > pagination.page_size:
+            del items[pagination.page_size:]
+            last = items[-1]
+            next_cursor = encode_cursor(
+                last['login_at'].isoformat(), str(last['id'])
+            )
+
+        return {
+            'total': summary['login_count'] if summary else 0,
+            'page': None if pagination.cursor else pagination.page_number,
+            'size': pagination.page_size,
+            'items': items,
+            'next_cursor': next_cursor,
+            'summary': summary,
+        }
+
+    async def get_profile(self, request_user: UserPrincipal) -> UserProfile:
+        """
+        Профиль пользователя со сводкой входов одним запросом.
+        Роли берутся из access-токена.
+        """
+        result = await self.db_session.execute(
+            select(User, UserLoginSummary)
+            .outerjoin(
+                UserLoginSummary, UserLoginSummary.user_id == User.id
+            )
+            .where(User.id == request_user.id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='Пользователь не найден'
+            )
+        user, summary = row
+        return UserProfile(
+            id=user.id,
+            login=user.login,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            roles=request_user.roles,
+            login_summary=summary
         )
 
     async def logout_user(
         self,
-        request_user: User,
-        token: str,
+        request_user: UserPrincipal,
         request: Request,
         response: Response
     ) -> None:
@@ -64,11 +151,12 @@ class UserService(BaseService):
         response.delete_cookie(key='Authorization')
         response.delete_cookie(key='refresh_token')
         user_agent = str(request.headers.get('User-Agent', ''))
-        key = f'refresh:{request_user.id}:{user_agent}'
-        if await self.cache.get(key):
-            await self.cache.delete(key)
-        key = f'invalid_access_token:{request_user.id}:{token}'
-        await self.cache.set(key, token, settings.access_token_expire_seconds)
+        key = refresh_key(request_user.id, user_agent)
+        legacy_key = (
+            legacy_refresh_key(request_user.id, user_agent)
+            if settings.refresh_legacy_keys else None
+        )
+        await revoke_session(self.cache, request_user, key, legacy_key)
 
 
 @lru_cache()
@@ -82,17 +170,19 @@ def get_user_service(
 async def get_current_user(
     token_credentials: HTTPAuthorizationCredentials = Depends(scheme),
     cache: CacheStorage = Depends(get_cache_storage),
-    user_service: UserService = Depends(get_user_service),
-) -> User:
-    """Метод получения текущего пользователя из токена."""
+) -> UserPrincipal:
+    """
+    Метод получения текущего пользователя из токена.
+    Пользователь восстанавливается из claims без запроса к БД,
+    проверяется только отзыв токена в Redis.
+    """
     token = token_credentials.credentials
     payload = decode_jwt(token, token_type='access')
-    user_id = payload['sub']
 
-    user = await user_service.get_obj_or_404(user_id)
-    if await cache.get(f'invalid_access_token:{user_id}:{token}'):
+    principal = principal_from_payload(payload, token)
+    if await is_access_token_revoked(cache, principal, token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Токен недействителен'
         )
-    return user
+    return principal
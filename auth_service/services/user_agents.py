@@ -0,0 +1,111 @@
+"""
+Справочник строк User-Agent для истории входов.
+Различных строк немного, поэтому соответствие строка -> id держится
+в памяти воркера, и запись истории обращается к справочнику
+только при первой встрече новой строки.
+"""
+import hashlib
+import math
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.constants import USER_AGENT_MAX_LENGTH
+from db.postgres import async_session
+from db.tiered_cache import MISSING, LocalCache
+from models.user import UserAgent
+
+
+def normalize_agent(user_agent: str) -> str:
+    """Строка в том виде, в котором она хранится в справочнике."""
+    return user_agent[:USER_AGENT_MAX_LENGTH]
+
+
+def agent_digest(user_agent: str) -> bytes:
+    """
+    Ключ справочника. В миграции тот же ключ считается в SQL:
+    sha256(convert_to(value, 'UTF8')).
+    """
+    return hashlib.sha256(user_agent.encode()).digest()
+
+
+class UserAgentCache:
+    """
+    Кеш строка User-Agent -> id справочника в памяти воркера.
+    Строки справочника не меняются и не удаляются, поэтому записи
+    кеша не устаревают и вытесняются только по размеру.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.local = LocalCache(max_size, ttl=math.inf)
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def stats(self) -> dict[str, int]:
+        return {**self._stats, 'size': len(self.local)}
+
+    async def resolve(self, user_agents: Iterable[str]) -> dict[str, int]:
+        """
+        Возвращает id справочника для каждой строки, добавляя новые.
+        Промахи разрешаются в отдельной транзакции: id попадает в кеш
+        только после коммита строки справочника, и откат записи истории
+        не оставит в кеше id несуществующей строки.
+        """
+        ids = {}
+        missing = {}
+        for user_agent in set(user_agents):
+            agent_id = self.local.get(user_agent)
+            if agent_id is MISSING:
+                missing[agent_digest(user_agent)] = user_agent
+            else:
+                ids[user_agent] = agent_id
+        self._stats['hits'] += len(ids)
+        if not missing:
+            return ids
+        self._stats['misses'] += len(missing)
+
+        async with async_session() as db:
+            found = await self._select(db, missing)
+            new = sorted(digest for digest in missing if digest not in found)
+            if new:
+                # Строки упорядочены по ключу, чтобы воркеры, добавляющие
+                # одни и те же строки, блокировали их в одном порядке
+                result = await db.execute(
+                    pg_insert(UserAgent)
+                    .values([
+                        {'digest': digest, 'value': missing[digest]}
+                        for digest in new
+                    ])
+                    .on_conflict_do_nothing(index_elements=[UserAgent.digest])
+                    .returning(UserAgent.digest, UserAgent.id)
+                )
+                found.update(result.tuples())
+                # Остальные строки успел добавить другой воркер
+                rest = {
+                    digest: missing[digest]
+                    for digest in new if digest not in found
+                }
+                if rest:
+                    found.update(await self._select(db, rest))
+            await db.commit()
+
+        for digest, agent_id in found.items():
+            user_agent = missing[digest]
+            self.local.set(user_agent, agent_id)
+            ids[user_agent] = agent_id
+        return ids
+
+    @staticmethod
+    async def _select(
+        db: AsyncSession, missing: dict[bytes, str]
+    ) -> dict[bytes, int]:
+        result = await db.execute(
+            select(UserAgent.digest, UserAgent.id)
+            .where(UserAgent.digest.in_(list(missing)))
+        )
+        return dict(result.tuples())
+
+
+user_agent_cache = UserAgentCache(max_size=settings.user_agent_cache_size)
@@ -4,13 +4,14 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from models.user import User
 from schemas.user import ChangeCredentialsRequest
 from core.constants import (
     LOGIN_MAX_LENGTH, LOGIN_MIN_LENGTH, PASSWORD_MAX_LENGTH, PASSWORD_MIN_LENGTH
 )
+from services.outbox import USER_CREDENTIALS_CHANGED, add_event
+from utils.password import hash_password, verify_password
 
 
 async def change_user_credentials(
@@ -24,16 +25,20 @@ async def change_user_credentials(
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalars().first()
 
-    if not user or not check_password_hash(
-        user.password,
-        data.current_password
-    ):
+    is_valid, new_hash = (
+        await verify_password(user.password, data.current_password)
+        if user else (False, None)
+    )
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Неверный текущий пароль'
         )
+    if new_hash:
+        user.password = new_hash
 
     # Обновляем логин и/или пароль
+    login_changed = password_changed = False
     if data.new_login:
         if not (LOGIN_MIN_LENGTH <= len(data.new_login) <= LOGIN_MAX_LENGTH):
             raise HTTPException(
@@ -54,6 +59,7 @@ async def change_user_credentials(
                 )
 
             user.login = data.new_login
+            login_changed = True
 
     # Проверка и обновление пароля
     if data.new_password:
@@ -64,8 +70,17 @@ async def change_user_credentials(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail=f'Пароль должен быть от {PASSWORD_MIN_LENGTH} до {PASSWORD_MAX_LENGTH} символов'
             )
-        user.password = generate_password_hash(data.new_password)
+        if data.new_password != data.current_password:
+            user.password = await hash_password(data.new_password)
+            password_changed = True
 
+    # Событие только о фактических изменениях
+    if login_changed or password_changed:
+        add_event(
+            db, USER_CREDENTIALS_CHANGED, user.id,
+            login_changed=login_changed,
+            password_changed=password_changed
+        )
     try:
         db.add(user)
         await db.commit()
@@ -0,0 +1,102 @@
+import hashlib
+import math
+import time
+
+
+class BloomFilter:
+    """Фильтр Блума фиксированного размера."""
+
+    def __init__(self, size_bits: int, hash_count: int) -> None:
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.count = 0
+        self._bits = bytearray((size_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(item)
+        )
+
+
+class RotatingBloomFilter:
+    """
+    Фильтр Блума со скользящим окном: элементы раскладываются по
+    временным корзинам, корзины старше окна удаляются целиком.
+    Бюджет памяти и вероятность ложного срабатывания делятся между корзинами.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        buckets: int,
+        memory_bytes: int,
+        fp_rate: float,
+    ) -> None:
+        self.interval = window / buckets
+        # Ещё одна корзина покрывает текущий, не до конца прошедший интервал
+        self.max_buckets = buckets + 1
+        bucket_fp_rate = fp_rate / self.max_buckets
+        self.bucket_bits = memory_bytes * 8 // self.max_buckets
+        self.hash_count = max(1, math.ceil(-math.log2(bucket_fp_rate)))
+        self.bucket_capacity = int(
+            self.bucket_bits * math.log(2) ** 2 / -math.log(bucket_fp_rate)
+        )
+        self._buckets: dict[int, BloomFilter] = {}
+
+    def _slot(self, timestamp: float) -> int:
+        return int(timestamp // self.interval)
+
+    def _expire(self, now: float) -> None:
+        oldest = self._slot(now) - self.max_buckets + 1
+        for slot in [slot for slot in self._buckets if slot < oldest]:
+            del self._buckets[slot]
+
+    def add(self, item: str, timestamp: float | None = None) -> None:
+        now = time.time()
+        self._expire(now)
+        slot = self._slot(now if timestamp is None else timestamp)
+        if slot < self._slot(now) - self.max_buckets + 1:
+            return
+        bucket = self._buckets.get(slot)
+        if bucket is None:
+            bucket = self._buckets[slot] = BloomFilter(
+                self.bucket_bits, self.hash_count
+            )
+        bucket.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        self._expire(time.time())
+        return any(item in bucket for bucket in self._buckets.values())
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    @property
+    def saturated(self) -> bool:
+        """Хотя бы одна корзина переполнена и даёт больше ложных срабатываний."""
+        return any(
+            bucket.count > self.bucket_capacity
+            for bucket in self._buckets.values()
+        )
+
+    def stats(self) -> dict:
+        return {
+            'buckets': len(self._buckets),
+            'items': sum(bucket.count for bucket in self._buckets.values()),
+            'bucket_capacity': self.bucket_capacity,
+            'memory_bytes': len(self._buckets) * self.bucket_bits // 8,
+            'saturated': self.saturated,
+        }
@@ -1,37 +1,85 @@
-from datetime import datetime, timedelta
+import secrets
+import time
 
-from jose import jwt, JWTError
 from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer
 
 from core.config import settings
+from utils.token_engine import (
+    AsymmetricBackend, TokenEngine, TokenError, create_backend
+)
 
 scheme = HTTPBearer()
 
 
+def _load_key(path: str) -> AsymmetricBackend:
+    with open(path, 'rb') as file:
+        return AsymmetricBackend.from_pem(file.read())
+
+
+def create_token_engine() -> TokenEngine:
+    """
+    Собирает TokenEngine из настроек.
+    С JWT_ACTIVE_KID токены подписываются закрытым ключом с этим kid,
+    иначе - общим секретом JWT_SECRET, как раньше.
+    """
+    keys = {
+        kid: _load_key(path)
+        for kid, path in {
+            **settings.jwt_public_keys, **settings.jwt_private_keys
+        }.items()
+    }
+    shared = (
+        create_backend(settings.jwt_algorithm, settings.jwt_secret)
+        if settings.jwt_secret else None
+    )
+    if settings.jwt_active_kid:
+        signer = keys.get(settings.jwt_active_kid)
+        if signer is None or not signer.can_sign:
+            raise ValueError(
+                f'Нет закрытого ключа для kid {settings.jwt_active_kid}'
+            )
+        if shared is not None:
+            keys[None] = shared
+        kid = settings.jwt_active_kid
+    elif shared is not None:
+        signer, kid = shared, None
+    else:
+        raise ValueError('Не задан JWT_SECRET или JWT_ACTIVE_KID')
+    return TokenEngine(
+        signer,
+        kid=kid,
+        verifiers=keys,
+        cache_size=settings.jwt_verified_cache_size,
+        cache_ttl=settings.access_token_expire_seconds
+    )
+
+
+token_engine = create_token_engine()
+
+
 def encode_jwt(to_encode: dict) -> str:
     """Кодирует JWT."""
-    return jwt.encode(
-        to_encode,
-        settings.jwt_secret,
-        algorithm=settings.jwt_algorithm
-    )
+    return token_engine.encode(to_encode)
 
 
 def create_access_token(
     sub: str,
     device_id: str,
+    roles: list[str],
 ) -> str:
     """
     Генерирует JWT access token с коротким сроком действия.
+    Названия ролей пользователя включаются в токен для авторизации без БД,
+    короткий jti используется как ключ при отзыве токена.
     """
-    expire = datetime.utcnow() + timedelta(
-        minutes=settings.access_token_expire_minutes
-    )
+    expire = int(time.time()) + settings.access_token_expire_seconds
     to_encode = {
         'sub': sub,
         'type': 'access',
         'device_id': device_id,
+        'roles': roles,
+        'jti': secrets.token_urlsafe(8),
         'exp': expire
     }
     return encode_jwt(to_encode)
@@ -39,9 +87,7 @@ def create_access_token(
 
 def create_refresh_token(sub: str, device_id: str) -> str:
     """Генерирует JWT refresh token с долгим сроком действия."""
-    expire = datetime.utcnow() + timedelta(
-        days=settings.refresh_token_expire_days
-    )
+    expire = int(time.time()) + settings.refresh_token_expire_seconds
     to_encode = {
         'sub': sub,
         'type': 'refresh',
@@ -56,22 +102,32 @@ def decode_jwt(
     verify_exp: bool = True,
     token_type: str | None = None
 ) -> dict:
-    """Декодирует JWT и проверяет тип токена (access/refresh)."""
+    """
+    Декодирует JWT и проверяет тип токена (access/refresh).
+    Ключ проверки выбирается по kid из заголовка токена.
+    """
     try:
-        payload = jwt.decode(
-            token,
-            settings.jwt_secret,
-            algorithms=[settings.jwt_algorithm],
-            options={'verify_exp': verify_exp}
-        )
-        if token_type and payload.get('type') != token_type:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail='Неверный тип токена'
-            )
-        return payload
-    except JWTError:
+        payload = token_engine.decode(token, verify_exp=verify_exp)
+    except TokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Невалидный токен'
         )
+    if token_type and payload.get('type') != token_type:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Неверный тип токена'
+        )
+    return payload
+
+
+def decode_access_token(token: str) -> dict | None:
+    """
+    Claims действительного access-токена или None.
+    Для мест, где невалидный токен - ожидаемый результат, а не ошибка запроса.
+    """
+    try:
+        payload = token_engine.decode(token)
+    except TokenError:
+        return None
+    return payload if payload.get('type') == 'access' else None
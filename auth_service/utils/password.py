@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+
+from core.config import settings
+from utils import password_policy
+
+
+class PasswordHasher:
+    """
+    Пул процессов для хеширования и проверки паролей.
+    Держит CPU-нагрузку хеширования вне event loop и ограничивает очередь задач.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int) -> None:
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._max_pending = max_workers + max_queue_size
+        self._pending = 0
+
+    async def _run(self, func, *args):
+        """Запускает функцию в пуле, если очередь не переполнена."""
+        if self._pending >= self._max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Сервис перегружен, повторите попытку позже',
+                headers={'Retry-After': '1'}
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Хеширует пароль."""
+        return await self._run(password_policy.hash_password, password)
+
+    async def verify_and_update(
+        self, password_hash: str, password: str
+    ) -> tuple[bool, str | None]:
+        """Проверяет пароль и возвращает новый хеш, если старый устарел."""
+        return await self._run(
+            password_policy.verify_and_update, password_hash, password
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher: PasswordHasher | None = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Возвращает пул хеширования, создавая его при первом обращении."""
+    global password_hasher
+    if password_hasher is None:
+        password_hasher = PasswordHasher(
+            max_workers=settings.password_hash_workers,
+            max_queue_size=settings.password_hash_queue_size
+        )
+    return password_hasher
+
+
+def close_password_hasher() -> None:
+    global password_hasher
+    if password_hasher is not None:
+        password_hasher.close()
+        password_hasher = None
+
+
+async def hash_password(password: str) -> str:
+    """Асинхронно хеширует пароль в пуле процессов."""
+    return await get_password_hasher().hash(password)
+
+
+async def verify_password(
+    password_hash: str, password: str
+) -> tuple[bool, str | None]:
+    """
+    Асинхронно проверяет пароль в пуле процессов.
+    Вторым элементом возвращает обновлённый по политике хеш или None.
+    """
+    return await get_password_hasher().verify_and_update(
+        password_hash, password
+    )
@@ -0,0 +1,108 @@
+import time
+from functools import lru_cache
+
+from passlib.context import CryptContext
+from werkzeug.security import check_password_hash
+
+from core.config import settings
+
+SUPPORTED_SCHEMES = ('argon2', 'bcrypt', 'pbkdf2_sha256')
+
+# Префиксы хешей werkzeug.security, которыми пароли хешировались раньше
+LEGACY_PREFIXES = ('scrypt:', 'pbkdf2:')
+
+
+def scheme_options(scheme: str, **overrides) -> dict:
+    """Параметры стоимости схемы из настроек с возможностью переопределения."""
+    options = {
+        'argon2': {
+            'time_cost': settings.password_argon2_time_cost,
+            'memory_cost': settings.password_argon2_memory_cost,
+            'parallelism': settings.password_argon2_parallelism,
+        },
+        'bcrypt': {'rounds': settings.password_bcrypt_rounds},
+        'pbkdf2_sha256': {'rounds': settings.password_pbkdf2_rounds},
+    }[scheme]
+    options.update(overrides)
+    return options
+
+
+def build_context(scheme: str, **overrides) -> CryptContext:
+    """
+    Собирает CryptContext с указанной схемой по умолчанию.
+    Остальные схемы помечаются устаревшими, хеши с заниженной
+    стоимостью считаются требующими обновления.
+    """
+    config = {}
+    for name, value in scheme_options(scheme, **overrides).items():
+        config[f'{scheme}__{name}'] = value
+        if name == 'rounds':
+            config[f'{scheme}__min_rounds'] = value
+    return CryptContext(
+        schemes=list(SUPPORTED_SCHEMES),
+        default=scheme,
+        deprecated='auto',
+        **config
+    )
+
+
+@lru_cache()
+def get_context() -> CryptContext:
+    return build_context(settings.password_hash_scheme)
+
+
+def hash_password(password: str) -> str:
+    """Хеширует пароль текущей схемой политики."""
+    return get_context().hash(password)
+
+
+def verify_and_update(
+    password_hash: str, password: str
+) -> tuple[bool, str | None]:
+    """
+    Проверяет пароль и возвращает новый хеш, если сохранённый
+    получен устаревшей схемой или с устаревшей стоимостью.
+    """
+    if password_hash.startswith(LEGACY_PREFIXES):
+        if not check_password_hash(password_hash, password):
+            return False, None
+        return True, hash_password(password)
+    return get_context().verify_and_update(password, password_hash)
+
+
+def measure(scheme: str, samples: int = 3, **overrides) -> float:
+    """Среднее время хеширования в миллисекундах для параметров схемы."""
+    context = build_context(scheme, **overrides)
+    started = time.perf_counter()
+    for _ in range(samples):
+        context.hash('calibration-password')
+    return (time.perf_counter() - started) / samples * 1000
+
+
+def calibrate(scheme: str, target_ms: float) -> dict:
+    """
+    Подбирает параметр стоимости схемы, при котором хеширование
+    на текущем хосте занимает не больше target_ms.
+    """
+    if scheme == 'bcrypt':
+        rounds = 4
+        while rounds < 31 and measure(scheme, rounds=rounds + 1) <= target_ms:
+            rounds += 1
+        return {'rounds': rounds}
+    if scheme == 'argon2':
+        base = scheme_options(scheme)
+        time_cost = 1
+        while (
+            time_cost < 32
+            and measure(scheme, time_cost=time_cost + 1) <= target_ms
+        ):
+            time_cost += 1
+        return {
+            'time_cost': time_cost,
+            'memory_cost': base['memory_cost'],
+            'parallelism': base['parallelism'],
+        }
+    # PBKDF2 линейно зависит от числа итераций
+    probe = 100_000
+    elapsed = measure(scheme, rounds=probe)
+    return {'rounds': max(1000, int(probe * target_ms / elapsed))}
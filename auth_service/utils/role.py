@@ -2,11 +2,15 @@ from functools import wraps
 from fastapi import HTTPException
 from http import HTTPStatus
 
+from services.role_cache import role_cache
+
 
 def permission_required(permission_name: str):
     """
     Декоратор для проверки наличия у пользователя указанного разрешения.
-    Ожидается, что в обернутый метод передается параметр current_user.
+    Ожидается, что в обернутый метод передается параметр current_user
+    (UserPrincipal). Роли проверяются по кешу назначений воркера,
+    а не по списку ролей в access-токене.
     """
     def decorator(func):
         @wraps(func)
@@ -17,9 +21,9 @@ def permission_required(permission_name: str):
                     status_code=HTTPStatus.UNAUTHORIZED,
                     detail='Требуется аутентификация'
                 )
-            for obj in current_user.roles:
-                if obj.role.name == permission_name:
-                    return await func(self, *args, **kwargs)
+            db = getattr(self, 'db_session', self.db)
+            if await role_cache.has_role(db, current_user.id, permission_name):
+                return await func(self, *args, **kwargs)
             raise HTTPException(
                 status_code=HTTPStatus.FORBIDDEN,
                 detail=f"У вас нет прав '{permission_name}' для выполнения этого действия"
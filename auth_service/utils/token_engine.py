@@ -0,0 +1,295 @@
+"""
+Выпуск и проверка JWT.
+Ключи и заголовок готовятся один раз при старте, подпись HMAC считается
+стандартной библиотекой, а недавно проверенные токены запоминаются
+в памяти воркера, чтобы повторные запросы не проверяли подпись заново.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import time
+from uuid import UUID
+
+import orjson
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import (
+    decode_dss_signature, encode_dss_signature
+)
+from jose import jwk
+from jose.exceptions import JOSEError
+
+from db.tiered_cache import MISSING, LocalCache
+
+HMAC_DIGESTS = {
+    'HS256': hashlib.sha256,
+    'HS384': hashlib.sha384,
+    'HS512': hashlib.sha512,
+}
+
+# Короткие имена claims в токене
+COMPACT_CLAIMS = {
+    'type': 't',
+    'device_id': 'did',
+    'roles': 'rl',
+}
+COMPACT_TYPES = {'access': 'a', 'refresh': 'r'}
+# Идентификаторы, которые передаются как 16 байт в base64url
+UUID_CLAIMS = ('sub', 'device_id')
+
+
+class TokenError(Exception):
+    """Токен повреждён, подделан или истёк."""
+
+
+def b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+
+class HmacBackend:
+    """HS256/HS384/HS512 на hashlib без промежуточных объектов ключа."""
+
+    def __init__(self, algorithm: str, secret: str) -> None:
+        self.algorithm = algorithm
+        self._digest = HMAC_DIGESTS[algorithm]
+        self._key = secret.encode()
+
+    def sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self._key, signing_input, self._digest).digest()
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        return hmac.compare_digest(self.sign(signing_input), signature)
+
+
+class JoseBackend:
+    """Остальные алгоритмы: заранее построенный ключ python-jose."""
+
+    def __init__(self, algorithm: str, secret: str) -> None:
+        self.algorithm = algorithm
+        self._key = jwk.construct(secret, algorithm)
+
+    def sign(self, signing_input: bytes) -> bytes:
+        return self._key.sign(signing_input)
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        try:
+            return self._key.verify(signing_input, signature)
+        except JOSEError:
+            return False
+
+
+class AsymmetricBackend:
+    """
+    ES256 (ECDSA P-256) и EdDSA (Ed25519) на cryptography.
+    Алгоритм определяется типом ключа. Без закрытого ключа бэкенд
+    только проверяет подписи - так остаются выведенные из ротации ключи.
+    """
+
+    def __init__(self, private_key=None, public_key=None) -> None:
+        self._private = private_key
+        self._public = public_key or private_key.public_key()
+        if isinstance(self._public, ed25519.Ed25519PublicKey):
+            self.algorithm = 'EdDSA'
+        elif (
+            isinstance(self._public, ec.EllipticCurvePublicKey)
+            and isinstance(self._public.curve, ec.SECP256R1)
+        ):
+            self.algorithm = 'ES256'
+        else:
+            raise ValueError('Поддерживаются ключи EC P-256 и Ed25519')
+
+    @classmethod
+    def from_pem(cls, pem: bytes) -> 'AsymmetricBackend':
+        """Загружает закрытый или открытый ключ в формате PEM."""
+        if b'PRIVATE KEY' in pem:
+            return cls(private_key=serialization.load_pem_private_key(pem, None))
+        return cls(public_key=serialization.load_pem_public_key(pem))
+
+    @property
+    def can_sign(self) -> bool:
+        return self._private is not None
+
+    def sign(self, signing_input: bytes) -> bytes:
+        if self.algorithm == 'EdDSA':
+            return self._private.sign(signing_input)
+        # JWS хранит подпись ECDSA как r || s фиксированной длины, а не DER
+        der = self._private.sign(signing_input, ec.ECDSA(hashes.SHA256()))
+        r, s = decode_dss_signature(der)
+        return r.to_bytes(32, 'big') + s.to_bytes(32, 'big')
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        try:
+            if self.algorithm == 'EdDSA':
+                self._public.verify(signature, signing_input)
+            else:
+                if len(signature) != 64:
+                    return False
+                der = encode_dss_signature(
+                    int.from_bytes(signature[:32], 'big'),
+                    int.from_bytes(signature[32:], 'big')
+                )
+                self._public.verify(der, signing_input, ec.ECDSA(hashes.SHA256()))
+        except InvalidSignature:
+            return False
+        return True
+
+    def jwk(self) -> dict:
+        """Открытый ключ в формате JWK (RFC 7517, RFC 8037)."""
+        if self.algorithm == 'EdDSA':
+            raw = self._public.public_bytes(
+                serialization.Encoding.Raw, serialization.PublicFormat.Raw
+            )
+            return {'kty': 'OKP', 'crv': 'Ed25519', 'x': b64encode(raw).decode()}
+        numbers = self._public.public_numbers()
+        return {
+            'kty': 'EC',
+            'crv': 'P-256',
+            'x': b64encode(numbers.x.to_bytes(32, 'big')).decode(),
+            'y': b64encode(numbers.y.to_bytes(32, 'big')).decode(),
+        }
+
+
+def create_backend(algorithm: str, secret: str) -> HmacBackend | JoseBackend:
+    if algorithm in HMAC_DIGESTS:
+        return HmacBackend(algorithm, secret)
+    return JoseBackend(algorithm, secret)
+
+
+def generate_private_key(algorithm: str) -> bytes:
+    """Новый закрытый ключ ES256 или EdDSA в формате PEM."""
+    if algorithm == 'EdDSA':
+        key = ed25519.Ed25519PrivateKey.generate()
+    elif algorithm == 'ES256':
+        key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        raise ValueError(f'Неподдерживаемый алгоритм: {algorithm}')
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+
+
+def pack_claims(claims: dict) -> dict:
+    """Переводит claims в компактный вид для записи в токен."""
+    packed = {}
+    for name, value in claims.items():
+        if name in UUID_CLAIMS:
+            value = b64encode(UUID(str(value)).bytes).decode()
+        elif name == 'type':
+            value = COMPACT_TYPES[value]
+        packed[COMPACT_CLAIMS.get(name, name)] = value
+    return packed
+
+
+def unpack_claims(payload: dict) -> dict:
+    """
+    Восстанавливает claims из компактного вида.
+    Токены, выпущенные до перехода на компактный формат, возвращаются как есть.
+    """
+    if COMPACT_CLAIMS['type'] not in payload:
+        return payload
+    full_names = {short: name for name, short in COMPACT_CLAIMS.items()}
+    full_types = {short: name for name, short in COMPACT_TYPES.items()}
+    claims = {}
+    for short, value in payload.items():
+        name = full_names.get(short, short)
+        if name in UUID_CLAIMS:
+            value = str(UUID(bytes=b64decode(value.encode())))
+        elif name == 'type':
+            value = full_types.get(value, value)
+        claims[name] = value
+    return claims
+
+
+class TokenEngine:
+    """
+    Кодирование и проверка JWT.
+    Токены подписываются ключом signer с идентификатором kid, а проверяются
+    ключом из verifiers, выбранным по kid из заголовка: во время ротации
+    принимаются подписи и текущего, и предыдущих ключей.
+    Проверенные токены хранятся в LRU по дайджесту токена не дольше
+    их срока действия и не дольше cache_ttl.
+    """
+
+    def __init__(
+        self,
+        signer,
+        kid: str | None = None,
+        verifiers: dict | None = None,
+        cache_size: int = 0,
+        cache_ttl: float = 0
+    ) -> None:
+        self.signer = signer
+        self.kid = kid
+        self.verifiers = {**(verifiers or {}), kid: signer}
+        header = {'alg': signer.algorithm, 'typ': 'JWT'}
+        if kid is not None:
+            header['kid'] = kid
+        self._header = b64encode(orjson.dumps(header))
+        self._cache = LocalCache(cache_size, cache_ttl) if cache_size else None
+
+    def jwks(self) -> dict:
+        """Открытые ключи для проверки токенов другими сервисами."""
+        keys = []
+        for kid, backend in self.verifiers.items():
+            if kid is not None and isinstance(backend, AsymmetricBackend):
+                keys.append({
+                    **backend.jwk(), 'kid': kid, 'alg': backend.algorithm,
+                    'use': 'sig'
+                })
+        return {'keys': keys}
+
+    def encode(self, claims: dict) -> str:
+        payload = b64encode(orjson.dumps(pack_claims(claims)))
+        signing_input = self._header + b'.' + payload
+        signature = b64encode(self.signer.sign(signing_input))
+        return (signing_input + b'.' + signature).decode()
+
+    def decode(self, token: str, verify_exp: bool = True) -> dict:
+        """Проверяет подпись и срок действия, возвращает claims."""
+        digest = None
+        if self._cache is not None:
+            digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+            claims = self._cache.get(digest)
+            if claims is not MISSING:
+                return claims
+
+        claims = self._verify(token)
+        exp = claims.get('exp')
+        now = time.time()
+        if verify_exp and exp is not None and exp <= now:
+            raise TokenError('Срок действия токена истёк')
+        if digest is not None and exp is not None and exp > now:
+            self._cache.set(digest, claims, ttl=exp - now)
+        return claims
+
+    def _verify(self, token: str) -> dict:
+        try:
+            signing_input, _, signature = token.encode().rpartition(b'.')
+            header, _, payload = signing_input.partition(b'.')
+            if not header or not payload:
+                raise TokenError('Неверный формат токена')
+            backend = self.signer
+            if header != self._header:
+                # Ключ выбирается по kid, алгоритм обязан совпадать с ключом
+                fields = orjson.loads(b64decode(header))
+                backend = self.verifiers.get(fields.get('kid'))
+                if backend is None:
+                    raise TokenError('Неизвестный ключ подписи')
+                if fields.get('alg') != backend.algorithm:
+                    raise TokenError('Неподдерживаемый алгоритм')
+            if not backend.verify(signing_input, b64decode(signature)):
+                raise TokenError('Неверная подпись')
+            claims = orjson.loads(b64decode(payload))
+            if not isinstance(claims, dict):
+                raise TokenError('Неверный формат токена')
+            return unpack_claims(claims)
+        except (ValueError, TypeError, AttributeError, binascii.Error) as exc:
+            raise TokenError('Неверный формат токена') from exc
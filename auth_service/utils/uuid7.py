@@ -0,0 +1,46 @@
+"""
+UUID версии 7 (RFC 9562): 48 бит времени в миллисекундах, затем
+12-битный счётчик и 62 случайных бита. Значения, созданные процессом,
+возрастают: новые строки попадают в правую страницу B-дерева
+первичного ключа, а не на случайную.
+"""
+import os
+import threading
+import time
+import uuid
+
+_COUNTER_MAX = 0xFFF
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Старший бит счётчика свободен, чтобы он не переполнялся сразу
+            _counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+        else:
+            # Та же миллисекунда (или часы ушли назад): время не уменьшается
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                _last_ms += 1
+                _counter = 0
+        timestamp, counter = _last_ms, _counter
+    rand_b = int.from_bytes(os.urandom(8), 'big') & 0x3FFFFFFFFFFFFFFF
+    value = (
+        (timestamp & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_time(value: uuid.UUID) -> float:
+    """Время создания UUIDv7 в секундах Unix."""
+    return (value.int >> 80) / 1000
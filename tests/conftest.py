@@ -1,5 +1,7 @@
+import sys
 import uuid
 from http import HTTPStatus
+from pathlib import Path
 
 import asyncio
 import aiohttp
@@ -14,6 +16,9 @@ from tests.functional.src.constants import (
 from tests.functional.testdata.test_model import UserData
 from tests.settings import test_settings
 
+# Модули сервиса (core, db, services, ...) импортируются тестами напрямую
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'auth_service'))
+
 _assigned = set()
 
 
@@ -0,0 +1,15 @@
+import pytest_asyncio
+
+
+@pytest_asyncio.fixture(scope='module')
+async def app_client():
+    """HTTP-клиент, работающий с приложением внутри процесса теста."""
+    import httpx
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url='http://test'
+        ) as client:
+            yield client
@@ -5,9 +5,14 @@ REGISTER_URL = f'{API_PREFIX}/auth/register'
 LOGIN_URL = f'{API_PREFIX}/auth/login'
 REFRESH_URL = f'{API_PREFIX}/auth/refresh'
 CHANGE_CREDENTIALS_URL = f'{API_PREFIX}/auth/me/change'
+INTROSPECT_URL = f'{API_PREFIX}/auth/introspect'
+VERIFY_URL = f'{API_PREFIX}/auth/verify'
 
 ASSIGN_URL = f'{ROLE_URL}/assign'
 REMOVE_URL = f'{ROLE_URL}/remove'
 
 USER_LOGIN_HISTORY_URL = f'{API_PREFIX}/user/login-history'
 USER_LOGOUT_URL = f'{API_PREFIX}/user/logout'
+USER_PROFILE_URL = f'{API_PREFIX}/user/me'
+
+METRICS_URL = '/internal/metrics'
@@ -1,10 +1,13 @@
+import asyncio
 import pytest
 from http import HTTPStatus
 
 from tests.functional.src.constants import (
     REGISTER_URL, LOGIN_URL,
-    REFRESH_URL, CHANGE_CREDENTIALS_URL
+    REFRESH_URL, CHANGE_CREDENTIALS_URL,
+    INTROSPECT_URL, USER_LOGOUT_URL, VERIFY_URL
 )
+from tests.settings import test_settings
 
 
 @pytest.mark.asyncio
@@ -92,6 +95,70 @@ class TestTokenRefresh:
         )
         assert response.status == HTTPStatus.OK
 
+    async def test_concurrent_refresh_with_same_token(
+            self, http_client, make_post_request, new_user_data
+        ):
+        """Ротация атомарна: одним refresh-токеном обновиться можно один раз."""
+        await make_post_request(REGISTER_URL, new_user_data)
+        login_data = {
+            'login': new_user_data['login'],
+            'password': new_user_data['password'],
+        }
+        login_response = await make_post_request(LOGIN_URL, login_data)
+        tokens = await login_response.json()
+
+        headers = {'Authorization': f"Bearer {tokens['refresh_token']}"}
+        responses = await asyncio.gather(*(
+            http_client.post(
+                test_settings.service_url + REFRESH_URL, headers=headers
+            )
+            for _ in range(2)
+        ))
+        statuses = sorted(response.status for response in responses)
+        assert statuses == [HTTPStatus.OK, HTTPStatus.UNAUTHORIZED]
+
+    async def test_refresh_with_legacy_key(
+            self, http_client, make_post_request, new_user_data
+        ):
+        """Refresh-токен, сохранённый по ключу без хеш-тега, обновляется."""
+        from redis.asyncio import Redis
+
+        agent = {'User-Agent': 'legacy-key-test'}
+        register_response = await make_post_request(REGISTER_URL, new_user_data)
+        user_id = (await register_response.json())['id']
+        login_data = {
+            'login': new_user_data['login'],
+            'password': new_user_data['password'],
+        }
+        login_response = await make_post_request(
+            LOGIN_URL, login_data, headers=agent
+        )
+        tokens = await login_response.json()
+
+        redis = Redis(
+            host=test_settings.redis.host, port=test_settings.redis.port
+        )
+        try:
+            # Ключ в формате до перехода на хеш-теги
+            await redis.rename(
+                f'refresh:{{{user_id}}}:legacy-key-test',
+                f'refresh:{user_id}:legacy-key-test'
+            )
+        finally:
+            await redis.aclose()
+
+        url = test_settings.service_url + REFRESH_URL
+        headers = {**agent, 'Authorization': f"Bearer {tokens['refresh_token']}"}
+        response = await http_client.post(url, headers=headers)
+        assert response.status == HTTPStatus.OK
+        new_tokens = await response.json()
+
+        response = await http_client.post(url, headers=headers)
+        assert response.status == HTTPStatus.UNAUTHORIZED
+        headers['Authorization'] = f"Bearer {new_tokens['refresh_token']}"
+        response = await http_client.post(url, headers=headers)
+        assert response.status == HTTPStatus.OK
+
     async def test_refresh_with_invalid_token(self, make_post_request):
         response = await make_post_request(
             REFRESH_URL,
@@ -181,3 +248,131 @@ class TestChangeCredentials:
             headers=headers
         )
         assert response.status == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+class TestIntrospect:
+    """Тесты пакетной проверки токенов."""
+
+    @pytest.fixture
+    def service_headers(self):
+        return {
+            'X-Service-Token': test_settings.introspect_service_tokens[0]
+        }
+
+    async def test_introspect_batch(
+            self, make_post_request, new_user_data, service_headers
+        ):
+        register_response = await make_post_request(REGISTER_URL, new_user_data)
+        user = await register_response.json()
+        login_data = {
+            'login': new_user_data['login'],
+            'password': new_user_data['password'],
+        }
+        login_response = await make_post_request(LOGIN_URL, login_data)
+        tokens = await login_response.json()
+        access_token = tokens['access_token']
+
+        response = await make_post_request(INTROSPECT_URL, {'tokens': [
+            access_token, 'invalidtoken', tokens['refresh_token'], access_token
+        ]}, headers=service_headers)
+        assert response.status == HTTPStatus.OK
+        results = (await response.json())['results']
+        assert [item['active'] for item in results] == [
+            True, False, False, True
+        ]
+        assert results[0]['sub'] == user['id']
+        assert results[0]['exp']
+
+        # После выхода токен отозван
+        await make_post_request(
+            USER_LOGOUT_URL, {},
+            headers={'Authorization': f'Bearer {access_token}'}
+        )
+        response = await make_post_request(
+            INTROSPECT_URL, {'tokens': [access_token]}, headers=service_headers
+        )
+        results = (await response.json())['results']
+        assert results[0]['active'] is False
+
+    async def test_introspect_empty_batch(
+            self, make_post_request, service_headers
+        ):
+        response = await make_post_request(
+            INTROSPECT_URL, {'tokens': []}, headers=service_headers
+        )
+        assert response.status == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    async def test_introspect_requires_service_token(
+            self, make_post_request, new_user_data
+        ):
+        await make_post_request(REGISTER_URL, new_user_data)
+        login_data = {
+            'login': new_user_data['login'],
+            'password': new_user_data['password'],
+        }
+        login_response = await make_post_request(LOGIN_URL, login_data)
+        tokens = await login_response.json()
+        data = {'tokens': [tokens['access_token']]}
+
+        response = await make_post_request(INTROSPECT_URL, data)
+        assert response.status == HTTPStatus.UNAUTHORIZED
+        response = await make_post_request(
+            INTROSPECT_URL, data, headers={'X-Service-Token': 'wrong'}
+        )
+        assert response.status == HTTPStatus.UNAUTHORIZED
+        # Ключ пользователя не заменяет ключ сервиса
+        response = await make_post_request(
+            INTROSPECT_URL, data,
+            headers={'Authorization': f"Bearer {tokens['access_token']}"}
+        )
+        assert response.status == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+class TestVerify:
+    """Тесты проверки токена для nginx auth_request."""
+
+    async def test_verify_valid_token(
+            self, http_client, make_post_request, new_user_data
+        ):
+        register_response = await make_post_request(REGISTER_URL, new_user_data)
+        user = await register_response.json()
+        login_data = {
+            'login': new_user_data['login'],
+            'password': new_user_data['password'],
+        }
+        login_response = await make_post_request(LOGIN_URL, login_data)
+        tokens = await login_response.json()
+
+        response = await http_client.get(
+            test_settings.service_url + VERIFY_URL,
+            headers={'Authorization': f"Bearer {tokens['access_token']}"}
+        )
+        assert response.status == HTTPStatus.OK
+        assert response.headers['X-User-Id'] == user['id']
+        assert 'X-User-Roles' in response.headers
+        assert response.headers['Cache-Control'].startswith('max-age=')
+        assert await response.read() == b''
+
+    async def test_verify_without_token(self, http_client):
+        response = await http_client.get(test_settings.service_url + VERIFY_URL)
+        assert response.status == HTTPStatus.UNAUTHORIZED
+        assert response.headers['Cache-Control'] == 'no-store'
+
+    async def test_verify_refresh_token_rejected(
+            self, http_client, make_post_request, new_user_data
+        ):
+        await make_post_request(REGISTER_URL, new_user_data)
+        login_data = {
+            'login': new_user_data['login'],
+            'password': new_user_data['password'],
+        }
+        login_response = await make_post_request(LOGIN_URL, login_data)
+        tokens = await login_response.json()
+
+        response = await http_client.get(
+            test_settings.service_url + VERIFY_URL,
+            headers={'Authorization': f"Bearer {tokens['refresh_token']}"}
+        )
+        assert response.status == HTTPStatus.UNAUTHORIZED
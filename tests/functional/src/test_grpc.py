@@ -0,0 +1,119 @@
+import uuid
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from tests.functional.src.constants import LOGIN_URL, REGISTER_URL
+from tests.settings import test_settings
+
+from grpc_api import auth_pb2, auth_pb2_grpc
+from grpc_api.service import (
+    SERVICE_TOKEN_METADATA, ServiceTokenInterceptor, TokenValidator
+)
+
+
+def _metadata() -> tuple:
+    token = test_settings.introspect_service_tokens[0]
+    return ((SERVICE_TOKEN_METADATA, token),)
+
+
+@pytest_asyncio.fixture
+async def grpc_stub():
+    async with grpc.aio.insecure_channel(test_settings.grpc_address) as channel:
+        yield auth_pb2_grpc.TokenValidatorStub(channel)
+
+
+@pytest_asyncio.fixture
+async def user_tokens(make_post_request, new_user_data):
+    register_response = await make_post_request(REGISTER_URL, new_user_data)
+    user = await register_response.json()
+    login_response = await make_post_request(LOGIN_URL, {
+        'login': new_user_data['login'],
+        'password': new_user_data['password'],
+    })
+    return user, await login_response.json()
+
+
+@pytest.mark.asyncio
+async def test_interceptor_requires_service_token(monkeypatch):
+    """Без ключа вызов отклоняется до обработчика."""
+    from core.config import settings
+
+    monkeypatch.setattr(settings, 'introspect_service_tokens', ['test-key'])
+    server = grpc.aio.server(interceptors=[ServiceTokenInterceptor()])
+    auth_pb2_grpc.add_TokenValidatorServicer_to_server(TokenValidator(), server)
+    port = server.add_insecure_port('127.0.0.1:0')
+    await server.start()
+    try:
+        async with grpc.aio.insecure_channel(f'127.0.0.1:{port}') as channel:
+            stub = auth_pb2_grpc.TokenValidatorStub(channel)
+            request = auth_pb2.GetUserRolesRequest(user_id='invalid')
+            for metadata in (None, ((SERVICE_TOKEN_METADATA, 'wrong-key'),)):
+                with pytest.raises(grpc.aio.AioRpcError) as error:
+                    await stub.GetUserRoles(request, metadata=metadata)
+                assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+            # С ключом вызов доходит до обработчика
+            with pytest.raises(grpc.aio.AioRpcError) as error:
+                await stub.GetUserRoles(
+                    request, metadata=((SERVICE_TOKEN_METADATA, 'test-key'),)
+                )
+            assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+    finally:
+        await server.stop(None)
+
+
+@pytest.mark.asyncio
+class TestGrpcTokenValidator:
+    """Тесты gRPC-сервиса проверки токенов."""
+
+    async def test_validate_token(self, grpc_stub, user_tokens):
+        user, tokens = user_tokens
+        info = await grpc_stub.ValidateToken(
+            auth_pb2.ValidateTokenRequest(token=tokens['access_token']),
+            metadata=_metadata()
+        )
+        assert info.active
+        assert info.sub == user['id']
+        assert info.exp > 0
+
+    async def test_validate_invalid_token(self, grpc_stub):
+        info = await grpc_stub.ValidateToken(
+            auth_pb2.ValidateTokenRequest(token='invalidtoken'),
+            metadata=_metadata()
+        )
+        assert not info.active
+        assert info.sub == ''
+
+    async def test_validate_tokens_batch(self, grpc_stub, user_tokens):
+        _, tokens = user_tokens
+        response = await grpc_stub.ValidateTokens(
+            auth_pb2.ValidateTokensRequest(tokens=[
+                tokens['access_token'], tokens['refresh_token']
+            ]),
+            metadata=_metadata()
+        )
+        assert [info.active for info in response.results] == [True, False]
+
+    async def test_get_user_roles(self, grpc_stub, user_tokens):
+        user, _ = user_tokens
+        response = await grpc_stub.GetUserRoles(
+            auth_pb2.GetUserRolesRequest(user_id=user['id']),
+            metadata=_metadata()
+        )
+        assert list(response.roles) == []
+
+    async def test_get_roles_invalid_user_id(self, grpc_stub):
+        with pytest.raises(grpc.aio.AioRpcError) as error:
+            await grpc_stub.GetUserRoles(
+                auth_pb2.GetUserRolesRequest(user_id=str(uuid.uuid4())[:8]),
+                metadata=_metadata()
+            )
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+    async def test_call_without_service_token(self, grpc_stub, user_tokens):
+        _, tokens = user_tokens
+        request = auth_pb2.ValidateTokenRequest(token=tokens['access_token'])
+        with pytest.raises(grpc.aio.AioRpcError) as error:
+            await grpc_stub.ValidateToken(request)
+        assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
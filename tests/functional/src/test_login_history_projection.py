@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+
+import orjson
+
+from schemas.user import PaginatedLoginHistory
+
+
+def test_projection_matches_response_schema():
+    """Словарь из колонок сериализуется так же, как схема ответа."""
+    now = datetime(2026, 10, 18, 12, 30, 15, 123456)
+    page = {
+        'total': 2,
+        'page': 1,
+        'size': 10,
+        'items': [
+            {'id': uuid.uuid4(), 'user_agent': 'agent', 'login_at': now},
+            {'id': uuid.uuid4(), 'user_agent': None, 'login_at': now},
+        ],
+        'next_cursor': None,
+        'summary': {
+            'login_count': 2,
+            'first_login_at': now,
+            'last_login_at': now,
+            'last_user_agent': 'agent',
+        },
+    }
+    expected = PaginatedLoginHistory.model_validate(page).model_dump(mode='json')
+    assert orjson.loads(orjson.dumps(page)) == expected
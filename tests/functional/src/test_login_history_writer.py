@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from services.login_history import LoginHistoryWriter
+from tests.functional.src.constants import REGISTER_URL
+
+
+class FailingWriter(LoginHistoryWriter):
+    """Пачка, запись которой всегда падает с одной и той же ошибкой."""
+
+    def __init__(self, error: Exception, **kwargs) -> None:
+        super().__init__(
+            batch_size=2, flush_interval=1, max_pending=100, **kwargs
+        )
+        self.error = error
+        self.calls = 0
+
+    async def _write(self, batch: list[dict]) -> None:
+        self.calls += 1
+        raise self.error
+
+
+def _record(writer: LoginHistoryWriter, count: int) -> None:
+    for _ in range(count):
+        writer.record(uuid.uuid4(), 'test-agent', datetime.utcnow())
+
+
+@pytest.mark.asyncio
+async def test_failing_batch_is_dropped_after_max_attempts():
+    writer = FailingWriter(RuntimeError('сбой'), max_attempts=3)
+    _record(writer, 3)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await writer.flush()
+        assert writer.stats()['pending'] == 3
+
+    # Третья неудача отбрасывает первую пачку, следующая пачка
+    # пробуется заново с нуля
+    with pytest.raises(RuntimeError):
+        await writer.flush()
+    assert writer.stats()['rejected'] == 2
+    assert writer.stats()['pending'] == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_are_retried():
+    writer = FailingWriter(ConnectionRefusedError(), max_attempts=1)
+    _record(writer, 1)
+    for _ in range(3):
+        with pytest.raises(ConnectionRefusedError):
+            await writer.flush()
+    assert writer.stats()['pending'] == 1
+    assert writer.stats()['rejected'] == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_does_not_block_later_logins(
+    make_post_request, new_user_data
+):
+    """Вход несуществующего пользователя нарушает FK и отбрасывается."""
+    from db.postgres import async_session
+    from models.user import LoginHistory
+
+    writer = LoginHistoryWriter(
+        batch_size=10, flush_interval=1, max_pending=100, max_attempts=3
+    )
+    _record(writer, 2)
+    await writer.flush()
+    assert writer.stats()['rejected'] == 2
+    assert writer.stats()['pending'] == 0
+
+    response = await make_post_request(REGISTER_URL, new_user_data)
+    user_id = uuid.UUID((await response.json())['id'])
+    writer.record(user_id, 'test-agent', datetime.utcnow())
+    await writer.flush()
+    assert writer.stats()['written'] == 1
+    async with async_session() as db:
+        count = await db.scalar(
+            select(func.count()).select_from(LoginHistory)
+            .where(LoginHistory.user_id == user_id)
+        )
+    assert count == 1
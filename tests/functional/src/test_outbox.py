@@ -0,0 +1,143 @@
+import asyncio
+import uuid
+from http import HTTPStatus
+
+import orjson
+import pytest
+
+from tests.functional.src.constants import (
+    CHANGE_CREDENTIALS_URL, LOGIN_URL, REGISTER_URL, USER_LOGOUT_URL
+)
+
+
+async def _wait_events(aggregate_id: str, count: int) -> list[dict]:
+    """События пользователя из потока, дождавшись работы ретранслятора."""
+    from core.config import settings
+    from services.outbox import outbox_relay
+
+    for _ in range(50):
+        entries = await outbox_relay.redis.xrevrange(
+            settings.events_stream, count=1000
+        )
+        events = [
+            {key.decode(): value.decode() for key, value in fields.items()}
+            for _, fields in reversed(entries)
+        ]
+        events = [e for e in events if e['aggregate_id'] == aggregate_id]
+        if len(events) >= count:
+            return events
+        await asyncio.sleep(0.1)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_auth_events_are_published(app_client):
+    from services.login_history import login_history_writer
+
+    user = {
+        'login': f'outbox_{uuid.uuid4().hex[:8]}',
+        'password': 'secure_pass_1',
+        'first_name': 'Outbox',
+        'last_name': 'Events'
+    }
+    response = await app_client.post(REGISTER_URL, json=user)
+    assert response.status_code == HTTPStatus.CREATED
+    user_id = response.json()['id']
+
+    response = await app_client.post(
+        LOGIN_URL,
+        data={'username': user['login'], 'password': user['password']}
+    )
+    assert response.status_code == HTTPStatus.OK
+    await login_history_writer.flush()
+    headers = {'Authorization': f"Bearer {response.json()['access_token']}"}
+    response = await app_client.post(USER_LOGOUT_URL, headers=headers)
+    assert response.status_code == HTTPStatus.OK
+
+    events = await _wait_events(user_id, 3)
+    assert {e['type'] for e in events} == {
+        'user.registered', 'user.logged_in', 'user.logged_out'
+    }
+    registered = next(e for e in events if e['type'] == 'user.registered')
+    assert orjson.loads(registered['payload']) == {'login': user['login']}
+    assert len({e['event_id'] for e in events}) == len(events)
+
+
+@pytest.mark.asyncio
+async def test_credentials_event_only_for_actual_change(app_client):
+    from services.login_history import login_history_writer
+
+    user = {
+        'login': f'outbox_{uuid.uuid4().hex[:8]}',
+        'password': 'secure_pass_1',
+        'first_name': 'Outbox',
+        'last_name': 'Credentials'
+    }
+    response = await app_client.post(REGISTER_URL, json=user)
+    user_id = response.json()['id']
+    response = await app_client.post(
+        LOGIN_URL,
+        data={'username': user['login'], 'password': user['password']}
+    )
+    await login_history_writer.flush()
+    headers = {'Authorization': f"Bearer {response.json()['access_token']}"}
+
+    # Те же логин и пароль - изменений нет
+    unchanged = {
+        'new_login': user['login'],
+        'new_password': user['password'],
+        'current_password': user['password']
+    }
+    renamed = {
+        'new_login': f"{user['login']}_new",
+        'current_password': user['password']
+    }
+    for data in (unchanged, renamed):
+        response = await app_client.post(
+            CHANGE_CREDENTIALS_URL, headers=headers, json=data
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    events = await _wait_events(user_id, 3)
+    changed = [e for e in events if e['type'] == 'user.credentials_changed']
+    assert len(changed) == 1
+    assert orjson.loads(changed[0]['payload']) == {
+        'login_changed': True, 'password_changed': False
+    }
+
+
+@pytest.mark.asyncio
+async def test_consumer_group_receives_events(app_client):
+    from core.config import settings
+    from services.outbox import outbox_relay
+
+    group = f'test_{uuid.uuid4().hex[:8]}'
+    redis = outbox_relay.redis
+    await redis.xgroup_create(settings.events_stream, group, id='$')
+    try:
+        user = {
+            'login': f'outbox_{uuid.uuid4().hex[:8]}',
+            'password': 'secure_pass_1',
+            'first_name': 'Outbox',
+            'last_name': 'Group'
+        }
+        response = await app_client.post(REGISTER_URL, json=user)
+        user_id = response.json()['id']
+
+        response = await redis.xreadgroup(
+            group, 'consumer-1', {settings.events_stream: '>'},
+            count=100, block=5000
+        )
+        entries = [entry for _, stream in response for entry in stream]
+        assert any(
+            fields[b'aggregate_id'].decode() == user_id
+            for _, fields in entries
+        )
+        await redis.xack(
+            settings.events_stream, group,
+            *[entry_id for entry_id, _ in entries]
+        )
+        pending = await redis.xpending(settings.events_stream, group)
+        assert pending['pending'] == 0
+    finally:
+        await redis.xgroup_destroy(settings.events_stream, group)
@@ -0,0 +1,41 @@
+import base64
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from api.v1.pagination import decode_cursor, encode_cursor, naive_datetime
+
+
+def _raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode()
+
+
+def test_cursor_round_trip():
+    login_at, last_id = datetime(2024, 1, 1, 12, 30), uuid4()
+    cursor = encode_cursor(login_at.isoformat(), str(last_id))
+    assert decode_cursor(cursor, naive_datetime, UUID) == (login_at, last_id)
+
+
+@pytest.mark.parametrize('cursor', [
+    'не-base64',
+    _raw_cursor({'a': 1}),
+    _raw_cursor(['a']),
+    # Корректный JSON с нестроковыми значениями
+    _raw_cursor(['a', 1]),
+    _raw_cursor([None, str(uuid4())]),
+    # Время со смещением не сравнивается с колонкой без часового пояса
+    _raw_cursor(['2024-01-01T00:00:00+03:00', str(uuid4())]),
+])
+def test_malformed_cursor_is_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, naive_datetime, UUID)
+    assert error.value.status_code == 400
+
+
+def test_malformed_roles_cursor_is_bad_request():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(_raw_cursor(['admin', 1]), str, UUID)
+    assert error.value.status_code == 400
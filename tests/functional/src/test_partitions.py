@@ -0,0 +1,77 @@
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import delete, select, text
+
+from db.partitions import (
+    DEFAULT_PARTITION, add_months, create_partition, list_partitions,
+    maintain_partitions, partition_name, retention_start
+)
+
+
+def test_month_arithmetic():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert partition_name(date(2026, 1, 1)) == 'login_history_p202601'
+
+
+def test_retention_start_keeps_current_month():
+    now = datetime(2026, 10, 18, 12, 30)
+    assert retention_start(12, now) == datetime(2025, 10, 1)
+    assert retention_start(0, now) == datetime(2026, 10, 1)
+
+
+@pytest.mark.asyncio
+async def test_maintain_creates_future_partitions():
+    from db.postgres import async_session
+
+    async with async_session() as db:
+        created, expired = await maintain_partitions(
+            db, ahead=2, retention_months=1200
+        )
+        partitions = await list_partitions(db)
+
+    current = date.today().replace(day=1)
+    for offset in range(3):
+        assert add_months(current, offset) in partitions
+    assert expired == []
+
+
+@pytest.mark.asyncio
+async def test_rows_from_default_partition_are_moved():
+    from db.postgres import async_session
+    from models.user import LoginHistory, User
+
+    month = date(2099, 1, 1)
+    name = partition_name(month)
+    async with async_session() as db:
+        user = User(
+            login=f'partition_{uuid.uuid4().hex[:8]}', password='x',
+            first_name='Partition', last_name='Test'
+        )
+        db.add(user)
+        await db.flush()
+        user_id = user.id
+        db.add(LoginHistory(user_id=user_id, login_at=datetime(2099, 1, 15)))
+        await db.commit()
+        try:
+            await create_partition(db, month)
+            await db.commit()
+            in_default = await db.scalar(text(
+                f'SELECT count(*) FROM {DEFAULT_PARTITION} '
+                'WHERE user_id = :user_id'
+            ), {'user_id': user_id})
+            in_partition = await db.scalar(text(
+                f'SELECT count(*) FROM {name} WHERE user_id = :user_id'
+            ), {'user_id': user_id})
+            history = await db.scalars(
+                select(LoginHistory).where(LoginHistory.user_id == user_id)
+            )
+            assert (in_default, in_partition) == (0, 1)
+            assert len(history.all()) == 1
+        finally:
+            await db.rollback()
+            await db.execute(text(f'DROP TABLE IF EXISTS {name}'))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
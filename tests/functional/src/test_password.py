@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from werkzeug.security import generate_password_hash
+
+from tests.functional.src.constants import LOGIN_URL, REGISTER_URL
+from utils.password import PasswordHasher
+from utils.password_policy import LEGACY_PREFIXES, verify_and_update
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retry_after():
+    """Задача сверх пула и очереди отклоняется с 503 и Retry-After."""
+    hasher = PasswordHasher(max_workers=1, max_queue_size=0)
+    try:
+        running = asyncio.create_task(hasher.hash('first-password'))
+        # Задача занимает единственное место до первого переключения
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as error:
+            await hasher.hash('second-password')
+        assert error.value.status_code == 503
+        assert error.value.headers == {'Retry-After': '1'}
+
+        # После завершения задачи место освобождается
+        await running
+        assert await hasher.hash('third-password')
+    finally:
+        hasher.close()
+
+
+def test_legacy_hash_is_upgraded_on_verify():
+    legacy = generate_password_hash('legacy-password')
+    assert verify_and_update(legacy, 'wrong-password') == (False, None)
+    valid, new_hash = verify_and_update(legacy, 'legacy-password')
+    assert valid
+    assert not new_hash.startswith(LEGACY_PREFIXES)
+    # Свежий хеш по текущей политике обновлять не нужно
+    assert verify_and_update(new_hash, 'legacy-password') == (True, None)
+
+
+@pytest.mark.asyncio
+async def test_legacy_hash_is_upgraded_after_login(
+    make_post_request, new_user_data
+):
+    """Хеш werkzeug заменяется хешем текущей схемы при успешном входе."""
+    from db.postgres import async_session
+    from models.user import User
+
+    await make_post_request(REGISTER_URL, new_user_data)
+    login_data = {
+        'login': new_user_data['login'],
+        'password': new_user_data['password'],
+    }
+    async with async_session() as db:
+        await db.execute(
+            update(User)
+            .where(User.login == login_data['login'])
+            .values(password=generate_password_hash(login_data['password']))
+        )
+        await db.commit()
+
+    response = await make_post_request(LOGIN_URL, login_data)
+    assert response.status == 200
+
+    async with async_session() as db:
+        stored = await db.scalar(
+            select(User.password).where(User.login == login_data['login'])
+        )
+    assert not stored.startswith(LEGACY_PREFIXES)
+    assert verify_and_update(stored, login_data['password'])[0]
@@ -0,0 +1,153 @@
+import uuid
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+
+from tests.functional.src.constants import (
+    LOGIN_URL, REFRESH_URL, REGISTER_URL, ROLE_URL,
+    USER_LOGIN_HISTORY_URL, USER_LOGOUT_URL, USER_PROFILE_URL
+)
+
+
+# Ожидаемое число SQL-запросов на один вызов эндпоинта
+EXPECTED_STATEMENTS = {
+    'register': 4,
+    'login': 2,
+    'refresh (cold role cache)': 2,
+    'refresh (warm role cache)': 0,
+    'login-history': 2,
+    'profile': 1,
+    'roles': 0,
+    'logout': 0,
+}
+
+
+@pytest.fixture
+def statements():
+    """Список SQL-запросов, выполненных приложением во время теста."""
+    from sqlalchemy import event
+    from db.postgres import engine
+
+    executed = []
+
+    def _collect(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', _collect)
+    yield executed
+    event.remove(engine.sync_engine, 'before_cursor_execute', _collect)
+
+
+@pytest_asyncio.fixture
+async def history_writer(app_client):
+    """
+    Буфер истории входов и ретранслятор outbox без фоновой работы:
+    запросы, выполненные по таймеру, не должны попасть в подсчёт
+    запросов эндпоинта.
+    """
+    from services.login_history import login_history_writer
+    from services.outbox import outbox_relay
+
+    await login_history_writer.stop()
+    await outbox_relay.stop()
+    yield login_history_writer
+    await outbox_relay.start(outbox_relay.redis)
+    await login_history_writer.start()
+
+
+async def _count(statements, request):
+    statements.clear()
+    response = await request
+    return response, len(statements)
+
+
+@pytest.mark.asyncio
+async def test_statements_per_endpoint(
+    app_client, statements, history_writer
+):
+    from services.role_cache import role_cache
+
+    role_cache.clear()
+    suffix = uuid.uuid4().hex[:8]
+    user = {
+        'login': f'query_count_{suffix}',
+        'password': 'secure_pass_1',
+        'first_name': 'Query',
+        'last_name': 'Count'
+    }
+    counts = {}
+    form = {'username': user['login'], 'password': user['password']}
+
+    response, counts['register'] = await _count(
+        statements, app_client.post(REGISTER_URL, json=user)
+    )
+    assert response.status_code == HTTPStatus.CREATED
+
+    response, counts['login'] = await _count(
+        statements, app_client.post(LOGIN_URL, data=form)
+    )
+    assert response.status_code == HTTPStatus.OK
+    tokens = response.json()
+
+    for name in ('refresh (cold role cache)', 'refresh (warm role cache)'):
+        response, counts[name] = await _count(
+            statements, app_client.post(
+                REFRESH_URL,
+                headers={'Authorization': f"Bearer {tokens['refresh_token']}"}
+            )
+        )
+        assert response.status_code == HTTPStatus.OK
+        tokens = response.json()
+    headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+
+    await history_writer.flush()
+    response, counts['login-history'] = await _count(
+        statements, app_client.get(USER_LOGIN_HISTORY_URL, headers=headers)
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['total'] == 1
+
+    response, counts['profile'] = await _count(
+        statements, app_client.get(USER_PROFILE_URL, headers=headers)
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['login_summary']['login_count'] == 1
+
+    response, counts['roles'] = await _count(
+        statements, app_client.get(ROLE_URL, headers=headers)
+    )
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+    response, counts['logout'] = await _count(
+        statements, app_client.post(USER_LOGOUT_URL, headers=headers)
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    assert counts == EXPECTED_STATEMENTS
+
+
+@pytest.mark.asyncio
+async def test_login_statements_do_not_depend_on_history(
+    app_client, statements, history_writer
+):
+    suffix = uuid.uuid4().hex[:8]
+    user = {
+        'login': f'query_count_{suffix}',
+        'password': 'secure_pass_1',
+        'first_name': 'Query',
+        'last_name': 'Count'
+    }
+    form = {'username': user['login'], 'password': user['password']}
+    await app_client.post(REGISTER_URL, json=user)
+
+    counts = []
+    for _ in range(5):
+        response, count = await _count(
+            statements, app_client.post(LOGIN_URL, data=form)
+        )
+        assert response.status_code == HTTPStatus.OK
+        counts.append(count)
+
+    assert len(set(counts)) == 1
+    assert all('login_history' not in stmt for stmt in statements[:2])
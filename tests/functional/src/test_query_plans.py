@@ -0,0 +1,191 @@
+import uuid
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+
+# Узлы плана, которые означают, что горячему запросу не хватает индекса
+FORBIDDEN_NODES = {'Seq Scan', 'Sort', 'Incremental Sort'}
+
+SEED = """
+INSERT INTO users (id, login, password)
+SELECT gen_random_uuid(), 'plan_' || g, 'x' FROM generate_series(1, 500) g;
+
+INSERT INTO roles (id, name)
+SELECT gen_random_uuid(), 'plan_role_' || g FROM generate_series(1, 20) g;
+
+INSERT INTO user_agents (digest, value)
+SELECT sha256(convert_to('plan_agent_' || g, 'UTF8')), 'plan_agent_' || g
+FROM generate_series(1, 50) g;
+
+INSERT INTO login_history (id, user_id, user_agent_id, login_at)
+SELECT gen_random_uuid(), u.id,
+       (SELECT id FROM user_agents WHERE value = 'plan_agent_1'),
+       now() AT TIME ZONE 'UTC' - g * interval '1 hour'
+FROM users u, generate_series(1, 20) g
+WHERE u.login LIKE 'plan\\_%';
+
+INSERT INTO user_login_summary
+    (user_id, login_count, first_login_at, last_login_at, last_user_agent)
+SELECT user_id, count(*), min(login_at), max(login_at), 'agent'
+FROM login_history GROUP BY user_id
+ON CONFLICT (user_id) DO NOTHING;
+
+INSERT INTO user_roles (id, user_id, role_id)
+SELECT gen_random_uuid(), u.id, r.id
+FROM users u JOIN roles r ON r.name IN ('plan_role_1', 'plan_role_2')
+WHERE u.login LIKE 'plan\\_%';
+
+INSERT INTO outbox (event_type, aggregate_id, payload, created_at)
+SELECT 'user.registered', id, '{}', now() FROM users
+WHERE login LIKE 'plan\\_%';
+
+ANALYZE users, roles, user_agents, login_history, user_login_summary,
+    user_roles, outbox;
+"""
+
+
+@pytest_asyncio.fixture(scope='module')
+async def seeded_db():
+    """
+    Сессия с тестовыми данными в открытой транзакции: после тестов
+    транзакция откатывается и данные не остаются в БД.
+    """
+    from db.postgres import async_session
+
+    async with async_session() as db:
+        for statement in SEED.split(';'):
+            if statement.strip():
+                await db.execute(text(statement))
+        await db.execute(text('SET LOCAL enable_seqscan = off'))
+        yield db
+        await db.rollback()
+
+
+@pytest_asyncio.fixture(scope='module')
+async def ids(seeded_db):
+    from models import Role, User
+
+    user_id = await seeded_db.scalar(
+        select(User.id).where(User.login == 'plan_250')
+    )
+    role_id = await seeded_db.scalar(
+        select(Role.id).where(Role.name == 'plan_role_1')
+    )
+    return {'user_id': user_id, 'role_id': role_id}
+
+
+def _hot_queries(user_id, role_id) -> dict:
+    """Запросы сервиса в том виде, в котором их строят сервисы."""
+    from core.config import settings
+    from db.partitions import retention_start
+    from models import (
+        LoginHistory, OutboxEvent, Role, User, UserAgent, UserLoginSummary,
+        UserRole
+    )
+    from services.user import LOGIN_HISTORY_COLUMNS, LOGIN_HISTORY_JOINS
+
+    page = select(*(
+        getattr(LoginHistory, column) if isinstance(column, str) else column
+        for column in LOGIN_HISTORY_COLUMNS
+    ))
+    for target, onclause in LOGIN_HISTORY_JOINS:
+        page = page.outerjoin(target, onclause)
+    history = (
+        LoginHistory.user_id == user_id,
+        LoginHistory.login_at >= retention_start(
+            settings.login_history_retention_months
+        ),
+    )
+    return {
+        'user by login': select(User).where(User.login == 'plan_250'),
+        'user by id': select(User).where(User.id == user_id),
+        'login history page': (
+            page.where(*history)
+            .order_by(LoginHistory.login_at.desc(), LoginHistory.id.desc())
+            .offset(10).limit(11)
+        ),
+        'login history cursor page': (
+            page.where(
+                *history,
+                tuple_(LoginHistory.login_at, LoginHistory.id)
+                < tuple_(datetime.utcnow(), uuid.UUID(int=0))
+            )
+            .order_by(LoginHistory.login_at.desc(), LoginHistory.id.desc())
+            .limit(11)
+        ),
+        # Ключ в SQL: байты не выводятся литералом в EXPLAIN
+        'user agent by digest': select(UserAgent.digest, UserAgent.id).where(
+            UserAgent.digest.in_([
+                func.sha256(func.convert_to('plan_agent_1', 'UTF8'))
+            ])
+        ),
+        'login summary': select(UserLoginSummary).where(
+            UserLoginSummary.user_id == user_id
+        ),
+        'user role ids': (
+            select(UserRole.role_id).where(UserRole.user_id == user_id)
+        ),
+        'user role exists': select(UserRole).where(
+            UserRole.user_id == user_id, UserRole.role_id == role_id
+        ),
+        'users with role': (
+            select(UserRole.user_id).where(UserRole.role_id == role_id)
+        ),
+        'role by name': select(Role).where(Role.name == 'plan_role_1'),
+        'outbox batch': (
+            select(OutboxEvent).order_by(OutboxEvent.id).limit(500)
+        ),
+    }
+
+
+def _plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _plan_nodes(child)
+
+
+async def _explain(db, stmt) -> dict:
+    sql = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}
+    )
+    result = await db.execute(text(f'EXPLAIN (FORMAT JSON) {sql}'))
+    return result.scalar()[0]['Plan']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('name', [
+    'user by login', 'user by id', 'login history page',
+    'login history cursor page', 'user agent by digest',
+    'login summary', 'user role ids', 'user role exists',
+    'users with role', 'role by name', 'outbox batch',
+])
+async def test_hot_query_uses_index(seeded_db, ids, name):
+    stmt = _hot_queries(**ids)[name]
+    plan = await _explain(seeded_db, stmt)
+    nodes = {node['Node Type'] for node in _plan_nodes(plan)}
+    assert not nodes & FORBIDDEN_NODES, f'{name}: {nodes}'
+
+
+@pytest.mark.asyncio
+async def test_login_history_prunes_old_partitions(seeded_db, ids):
+    from db.partitions import (
+        add_months, list_partitions, month_start, retention_start
+    )
+    from core.config import settings
+
+    oldest = month_start(
+        retention_start(settings.login_history_retention_months)
+    )
+    expired = {
+        name for month, name in (await list_partitions(seeded_db)).items()
+        if add_months(month, 1) <= oldest
+    }
+    plan = await _explain(
+        seeded_db, _hot_queries(**ids)['login history page']
+    )
+    scanned = {node.get('Relation Name') for node in _plan_nodes(plan)}
+    assert not scanned & expired
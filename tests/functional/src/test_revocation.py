@@ -0,0 +1,154 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from redis.asyncio import Redis
+
+from core.config import settings
+from db import redis_client
+from db.keys import revoked_key
+from db.tiered_cache import TieredCache
+from schemas.user import UserPrincipal
+from services.revocation import (
+    REVOCATION_STREAM, RevocationFilter, is_access_token_revoked,
+    revocation_filter
+)
+from tests.functional.src.constants import METRICS_URL
+from tests.settings import test_settings
+from utils.bloom import RotatingBloomFilter
+
+
+def _worker_filter() -> RevocationFilter:
+    """Фильтр отзыва, как у отдельного воркера."""
+    return RevocationFilter(
+        RotatingBloomFilter(
+            window=settings.access_token_expire_seconds,
+            buckets=settings.revocation_filter_buckets,
+            memory_bytes=64 * 1024,
+            fp_rate=settings.revocation_filter_fp_rate
+        )
+    )
+
+
+async def _wait(condition) -> None:
+    for _ in range(50):
+        if condition():
+            return
+        await asyncio.sleep(0.1)
+    assert condition()
+
+
+@pytest.mark.asyncio
+async def test_revocation_from_other_worker_is_replayed():
+    """Новый воркер вычитывает отзыв, сделанный до его запуска."""
+    redis = Redis(host=test_settings.redis.host, port=test_settings.redis.port)
+    worker_filter = _worker_filter()
+    revoked, live = uuid.uuid4().hex, uuid.uuid4().hex
+    try:
+        await redis.xadd(REVOCATION_STREAM, {'jti': revoked})
+        await worker_filter.start(redis)
+        await _wait(lambda: worker_filter.ready)
+        assert worker_filter.might_be_revoked(revoked)
+        assert not worker_filter.might_be_revoked(uuid.uuid4().hex)
+
+        # Отзыв после запуска приходит через XREAD
+        await redis.xadd(REVOCATION_STREAM, {'jti': live})
+        await _wait(lambda: worker_filter.might_be_revoked(live))
+    finally:
+        await worker_filter.stop()
+        await redis.aclose()
+
+
+@pytest.mark.asyncio
+async def test_replay_starts_at_token_lifetime():
+    """Чтение потока начинается с окна жизни токена, а не с 0-0."""
+    redis = Redis(host=test_settings.redis.host, port=test_settings.redis.port)
+    worker_filter = _worker_filter()
+    window_start = (time.time() - settings.access_token_expire_seconds) * 1000
+    try:
+        worker_filter.redis = redis
+        await worker_filter._load()
+        assert int(worker_filter._last_id.split('-')[0]) >= window_start - 1
+    finally:
+        await redis.aclose()
+
+
+@pytest.mark.asyncio
+async def test_filter_negative_skips_redis(monkeypatch):
+    """Отсутствие jti в фильтре отвечает без запроса к Redis."""
+    # Redis по этому адресу недоступен: любой запрос завершился бы ошибкой
+    cache = TieredCache(
+        Redis(host='127.0.0.1', port=1), max_size=100, local_ttl=60
+    )
+    monkeypatch.setattr(revocation_filter, 'ready', True)
+    avoided = revocation_filter.stats()['avoided']
+
+    assert not await is_access_token_revoked(cache, _principal(), 'token')
+
+    assert revocation_filter.stats()['avoided'] == avoided + 1
+    stats = cache.stats()
+    assert stats['l2_hits'] + stats['misses'] == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_expose_filter_counters(http_client):
+    url = test_settings.service_url + METRICS_URL
+    response = await http_client.get(url)
+    assert response.status == 401
+
+    response = await http_client.get(url, headers={
+        'X-Service-Token': test_settings.introspect_service_tokens[0]
+    })
+    assert response.status == 200
+    metrics = await response.json()
+    assert {'avoided', 'checked', 'false_positives'} <= set(
+        metrics['revocation_filter']
+    )
+    assert {'cache', 'login_history', 'outbox', 'user_agents'} <= set(metrics)
+
+
+@pytest.fixture
+def degraded(monkeypatch):
+    """Redis помечен недоступным, кеш отвечает только из L1."""
+    redis = Redis(host=test_settings.redis.host, port=test_settings.redis.port)
+    health = redis_client.RedisHealth(redis, interval=60)
+    health.mark_failed()
+    monkeypatch.setattr(redis_client, 'redis_health', health)
+    return TieredCache(redis, max_size=100, local_ttl=0, stale_ttl=60)
+
+
+def _principal(**kwargs) -> UserPrincipal:
+    return UserPrincipal(id=uuid.uuid4(), jti=uuid.uuid4().hex, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_degraded_answers_from_stale_local_cache(degraded):
+    """Истёкший ответ Redis из L1 используется, пока Redis недоступен."""
+    revoked = _principal()
+    degraded.local.set(revoked_key(revoked.id, revoked.jti), b'1')
+
+    assert await is_access_token_revoked(degraded, revoked, 'token')
+
+
+@pytest.mark.asyncio
+async def test_degraded_answers_from_filter(degraded):
+    """Токен, которого нет в фильтре отзыва, не отзывался."""
+    assert not await is_access_token_revoked(degraded, _principal(), 'token')
+
+
+@pytest.mark.asyncio
+async def test_degraded_without_local_answer_is_unavailable(degraded):
+    principal = _principal()
+    revocation_filter.bloom.add(principal.jti)
+    with pytest.raises(HTTPException) as error:
+        await is_access_token_revoked(degraded, principal, 'token')
+    assert error.value.status_code == 503
+
+    # Токены без jti фильтр не покрывает
+    with pytest.raises(HTTPException) as error:
+        await is_access_token_revoked(
+            degraded, _principal(legacy=True), 'token'
+        )
+    assert error.value.status_code == 503
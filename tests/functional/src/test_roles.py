@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from http import HTTPStatus
 
@@ -5,8 +6,9 @@ import pytest
 import pytest_asyncio
 
 from tests.functional.src.constants import (
-    ASSIGN_URL, REGISTER_URL, REMOVE_URL, ROLE_URL
+    ASSIGN_URL, LOGIN_URL, REGISTER_URL, REMOVE_URL, ROLE_URL
 )
+from tests.settings import test_settings
 
 @pytest_asyncio.fixture
 async def role_id(make_post_request_with_roles):
@@ -121,3 +123,82 @@ class TestRoleRemoval:
             'role_id': role_id
         })
         assert remove_resp.status == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_revoked_superuser_is_forbidden_with_same_token(
+    http_client, make_post_request, get_superuser_token, new_user_data
+):
+    """
+    Роль проверяется по текущим назначениям: после отзыва superuser
+    access-токен, выпущенный с этой ролью, больше не даёт доступа.
+    """
+    base = test_settings.service_url
+    admin = {'Authorization': f'Bearer {get_superuser_token}'}
+    roles = await http_client.get(base + ROLE_URL, headers=admin)
+    assert roles.status == HTTPStatus.OK
+    superuser_id = next(
+        role['id'] for role in await roles.json()
+        if role['name'] == 'superuser'
+    )
+
+    reg = await make_post_request(REGISTER_URL, new_user_data)
+    assert reg.status == HTTPStatus.CREATED
+    operation = {'user_id': (await reg.json())['id'], 'role_id': superuser_id}
+    assign = await http_client.post(
+        base + ASSIGN_URL, json=operation, headers=admin
+    )
+    assert assign.status == HTTPStatus.OK
+
+    login = await make_post_request(LOGIN_URL, new_user_data)
+    user = {'Authorization': f"Bearer {(await login.json())['access_token']}"}
+    allowed = await http_client.get(base + ROLE_URL, headers=user)
+    assert allowed.status == HTTPStatus.OK
+
+    remove = await http_client.post(
+        base + REMOVE_URL, json=operation, headers=admin
+    )
+    assert remove.status == HTTPStatus.OK
+    # Другие воркеры получают инвалидацию через pub/sub
+    for _ in range(20):
+        denied = await http_client.get(base + ROLE_URL, headers=user)
+        if denied.status == HTTPStatus.FORBIDDEN:
+            break
+        await asyncio.sleep(0.1)
+    assert denied.status == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_roles_cursor_pages_with_mixed_case_names(
+    http_client, get_superuser_token
+):
+    """
+    Страницы по курсору проходят весь список без пропусков и повторов,
+    даже если порядок названий зависит от регистра.
+    """
+    base = test_settings.service_url
+    headers = {'Authorization': f'Bearer {get_superuser_token}'}
+    suffix = uuid.uuid4().hex[:8]
+    for name in ('Alpha', 'alpha', 'BETA', 'beta', 'Gamma', '_gamma', 'a-b'):
+        resp = await http_client.post(
+            base + ROLE_URL, json={'name': f'{name}_{suffix}'}, headers=headers
+        )
+        assert resp.status == HTTPStatus.CREATED
+
+    resp = await http_client.get(base + ROLE_URL, headers=headers)
+    assert resp.status == HTTPStatus.OK
+    all_names = [role['name'] for role in await resp.json()]
+
+    names, params = [], {'page_size': 2}
+    while True:
+        resp = await http_client.get(
+            base + ROLE_URL, headers=headers, params=params
+        )
+        assert resp.status == HTTPStatus.OK
+        names += [role['name'] for role in await resp.json()]
+        cursor = resp.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+        params = {'page_size': 2, 'cursor': cursor}
+    assert names == all_names
+    assert len(set(names)) == len(names)
@@ -0,0 +1,63 @@
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from redis.asyncio import Redis
+
+from db.tiered_cache import TieredCache
+from tests.settings import test_settings
+
+
+@pytest_asyncio.fixture
+async def cache():
+    redis = Redis(host=test_settings.redis.host, port=test_settings.redis.port)
+    yield TieredCache(redis, max_size=100, local_ttl=60)
+    await redis.aclose()
+
+
+def _l2_reads(cache: TieredCache) -> int:
+    stats = cache.stats()
+    return stats['l2_hits'] + stats['misses']
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_read_redis_once(cache):
+    """Одновременные промахи L1 по одному ключу дают одно чтение из Redis."""
+    key = f'test:tiered:{uuid.uuid4().hex}'
+    await cache.redis.set(key, 'value', ex=60)
+
+    values = await asyncio.gather(*(cache.get(key) for _ in range(20)))
+
+    assert values == [b'value'] * 20
+    assert _l2_reads(cache) == 1
+    assert cache.stats()['coalesced'] == 19
+    # Следующее чтение обслуживает L1
+    assert await cache.get(key) == b'value'
+    assert _l2_reads(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_joins_pipeline_read(cache):
+    """get() во время get_many() ждёт конвейер, а не читает ключ заново."""
+    keys = [f'test:tiered:{uuid.uuid4().hex}' for _ in range(3)]
+
+    many, single = await asyncio.gather(cache.get_many(keys), cache.get(keys[0]))
+
+    assert many == [None, None, None]
+    assert single is None
+    assert _l2_reads(cache) == 3
+    assert cache.stats()['coalesced'] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_keys_are_not_cached_on_request(cache):
+    """Без кеширования отсутствия новый ключ виден сразу."""
+    key = f'test:tiered:{uuid.uuid4().hex}'
+    assert await cache.get_many([key], cache_missing=False) == [None]
+
+    await cache.redis.set(key, 'revoked', ex=60)
+    assert await cache.get_many([key], cache_missing=False) == [b'revoked']
+    # Найденное значение кешируется как обычно
+    assert await cache.get_many([key], cache_missing=False) == [b'revoked']
+    assert _l2_reads(cache) == 2
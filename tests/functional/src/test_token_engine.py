@@ -0,0 +1,111 @@
+import time
+import uuid
+
+import pytest
+from jose import jwt
+
+from utils.token_engine import (
+    AsymmetricBackend, TokenEngine, TokenError, create_backend,
+    generate_private_key
+)
+
+SECRET = 'test-secret'
+
+
+@pytest.fixture
+def engine():
+    return TokenEngine(
+        create_backend('HS256', SECRET), cache_size=10, cache_ttl=60
+    )
+
+
+@pytest.fixture
+def claims():
+    return {
+        'sub': str(uuid.uuid4()),
+        'type': 'access',
+        'device_id': str(uuid.uuid4()),
+        'roles': ['admin'],
+        'jti': 'abc',
+        'exp': int(time.time()) + 60,
+    }
+
+
+def test_roundtrip_restores_claims(engine, claims):
+    assert engine.decode(engine.encode(claims)) == claims
+
+
+def test_tokens_issued_by_jose_are_accepted(engine, claims):
+    token = jwt.encode(claims, SECRET, algorithm='HS256')
+    assert engine.decode(token) == claims
+
+
+def test_engine_tokens_are_valid_jwt(engine, claims):
+    payload = jwt.decode(engine.encode(claims), SECRET, algorithms=['HS256'])
+    assert payload['t'] == 'a'
+
+
+@pytest.mark.parametrize('token', ['', 'abc', 'a.b.c'])
+def test_malformed_token_rejected(engine, token):
+    with pytest.raises(TokenError):
+        engine.decode(token)
+
+
+def test_foreign_signature_rejected(engine, claims):
+    token = jwt.encode(claims, 'other-secret', algorithm='HS256')
+    with pytest.raises(TokenError):
+        engine.decode(token)
+
+
+def test_expired_token_rejected(engine, claims):
+    token = engine.encode({**claims, 'exp': int(time.time()) - 1})
+    with pytest.raises(TokenError):
+        engine.decode(token)
+    assert engine.decode(token, verify_exp=False)['sub'] == claims['sub']
+
+
+def test_verified_token_served_from_cache(engine, claims):
+    token = engine.encode(claims)
+    first = engine.decode(token)
+    engine.signer = None  # повторная проверка подписи упала бы
+    assert engine.decode(token) is first
+
+
+@pytest.mark.parametrize('algorithm', ['ES256', 'EdDSA'])
+def test_asymmetric_token_verified_with_jwks(algorithm, claims):
+    key = AsymmetricBackend.from_pem(generate_private_key(algorithm))
+    engine = TokenEngine(key, kid='k1')
+    token = engine.encode(claims)
+
+    assert jwt.get_unverified_header(token)['kid'] == 'k1'
+    assert engine.decode(token) == claims
+    [public_jwk] = engine.jwks()['keys']
+    assert public_jwk['kid'] == 'k1'
+    if algorithm == 'ES256':
+        payload = jwt.decode(token, public_jwk, algorithms=['ES256'])
+        assert payload['t'] == 'a'
+
+
+def test_rotation_accepts_previous_key(claims):
+    old = AsymmetricBackend.from_pem(generate_private_key('ES256'))
+    new = AsymmetricBackend.from_pem(generate_private_key('EdDSA'))
+    old_token = TokenEngine(old, kid='old').encode(claims)
+
+    engine = TokenEngine(new, kid='new', verifiers={'old': old})
+    assert engine.decode(old_token) == claims
+    assert {key['kid'] for key in engine.jwks()['keys']} == {'old', 'new'}
+
+    retired = TokenEngine(new, kid='new')
+    with pytest.raises(TokenError):
+        retired.decode(old_token)
+
+
+def test_kid_cannot_switch_algorithm(claims):
+    key = AsymmetricBackend.from_pem(generate_private_key('ES256'))
+    shared = create_backend('HS256', SECRET)
+    engine = TokenEngine(key, kid='k1', verifiers={None: shared})
+    token = jwt.encode(claims, SECRET, algorithm='HS256', headers={'kid': 'k1'})
+    with pytest.raises(TokenError):
+        engine.decode(token)
+    # Токены без kid по-прежнему проверяются общим секретом
+    assert engine.decode(jwt.encode(claims, SECRET, algorithm='HS256')) == claims
@@ -0,0 +1,49 @@
+import hashlib
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from core.constants import USER_AGENT_MAX_LENGTH
+from services.user_agents import (
+    UserAgentCache, agent_digest, normalize_agent
+)
+
+
+def test_agent_digest_is_sha256_of_utf8():
+    """Ключ совпадает с sha256(convert_to(value, 'UTF8')) из миграции."""
+    value = 'Mozilla/5.0 (Linux; Android 14) Яндекс'
+    assert agent_digest(value) == hashlib.sha256(value.encode()).digest()
+    assert len(agent_digest(value)) == 32
+
+
+def test_normalize_agent_truncates_to_column_length():
+    assert normalize_agent('a' * 1000) == 'a' * USER_AGENT_MAX_LENGTH
+    assert normalize_agent('curl/8.0') == 'curl/8.0'
+
+
+@pytest.mark.asyncio
+async def test_cached_agents_are_resolved_without_db():
+    cache = UserAgentCache(max_size=10)
+    cache.local.set('curl/8.0', 7)
+    assert await cache.resolve(['curl/8.0', 'curl/8.0']) == {'curl/8.0': 7}
+    assert cache.stats() == {'hits': 1, 'misses': 0, 'size': 1}
+
+
+@pytest.mark.asyncio
+async def test_agent_is_stored_once():
+    from db.postgres import async_session
+    from models.user import UserAgent
+
+    value = f'test-agent/{uuid.uuid4().hex}'
+    first, second = UserAgentCache(max_size=10), UserAgentCache(max_size=10)
+    # Второй кеш пустой и находит строку, добавленную первым
+    first_ids = await first.resolve([value])
+    second_ids = await second.resolve([value, value])
+    assert first_ids == second_ids
+    async with async_session() as db:
+        count = await db.scalar(
+            select(func.count()).select_from(UserAgent)
+            .where(UserAgent.digest == agent_digest(value))
+        )
+    assert count == 1
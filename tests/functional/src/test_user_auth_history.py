@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from http import HTTPStatus
 from datetime import datetime
@@ -7,8 +8,25 @@ from tests.functional.src.constants import (
     LOGIN_URL,
     USER_LOGIN_HISTORY_URL,
     USER_LOGOUT_URL,
+    USER_PROFILE_URL,
 )
 from tests.functional.testdata.test_model import UserData
+from tests.settings import test_settings
+
+
+async def _wait_history(http_client, headers: dict, total: int) -> None:
+    """
+    Ждёт, пока входы будут записаны из буфера воркера
+    (не дольше LOGIN_HISTORY_FLUSH_INTERVAL при доступной БД).
+    """
+    url = test_settings.service_url + USER_LOGIN_HISTORY_URL
+    for _ in range(50):
+        resp = await http_client.get(url, headers=headers)
+        if (await resp.json())['total'] >= total:
+            return
+        await asyncio.sleep(0.1)
+    raise AssertionError(f'В истории меньше {total} входов')
+
 
 @pytest.mark.asyncio
 async def test_get_user_login_history(make_post_request, new_user_data):
@@ -77,3 +95,76 @@ async def test_logout_user(
         headers=headers
     )
     assert response2.status == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_login_history_cursor_pagination(
+    http_client, make_post_request, new_user_data
+):
+    await make_post_request(REGISTER_URL, new_user_data)
+    credentials = {
+        'login': new_user_data['login'],
+        'password': new_user_data['password']
+    }
+    for _ in range(5):
+        login_resp = await make_post_request(LOGIN_URL, credentials)
+    tokens = await login_resp.json()
+    headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+    url = test_settings.service_url + USER_LOGIN_HISTORY_URL
+    await _wait_history(http_client, headers, 5)
+
+    resp = await http_client.get(
+        url, headers=headers, params={'page_size': 10}
+    )
+    all_ids = [item['id'] for item in (await resp.json())['items']]
+    assert len(all_ids) == 5
+
+    ids, params = [], {'page_size': 2}
+    while True:
+        resp = await http_client.get(url, headers=headers, params=params)
+        assert resp.status == HTTPStatus.OK
+        page = await resp.json()
+        ids += [item['id'] for item in page['items']]
+        if not page['next_cursor']:
+            break
+        assert page['total'] == 5
+        params = {'page_size': 2, 'cursor': page['next_cursor']}
+    assert ids == all_ids
+
+    resp = await http_client.get(
+        url, headers=headers, params={'cursor': 'not-a-cursor'}
+    )
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_profile_login_summary(
+    http_client, make_post_request, new_user_data
+):
+    await make_post_request(REGISTER_URL, new_user_data)
+    credentials = {
+        'login': new_user_data['login'],
+        'password': new_user_data['password']
+    }
+    for _ in range(2):
+        login_resp = await make_post_request(LOGIN_URL, credentials)
+    tokens = await login_resp.json()
+    headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+    await _wait_history(http_client, headers, 2)
+
+    resp = await http_client.get(
+        test_settings.service_url + USER_PROFILE_URL, headers=headers
+    )
+    assert resp.status == HTTPStatus.OK
+    profile = await resp.json()
+    assert profile['login'] == new_user_data['login']
+    summary = profile['login_summary']
+    assert summary['login_count'] == 2
+    assert summary['first_login_at'] <= summary['last_login_at']
+
+    resp = await http_client.get(
+        test_settings.service_url + USER_LOGIN_HISTORY_URL, headers=headers
+    )
+    history = await resp.json()
+    assert history['total'] == 2
+    assert history['summary'] == summary
@@ -0,0 +1,28 @@
+import time
+
+from utils.uuid7 import uuid7, uuid7_time
+
+
+def test_uuid7_version_and_variant():
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == 'specified in RFC 4122'
+
+
+def test_uuid7_is_monotonic_within_process():
+    values = [uuid7() for _ in range(20000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_uuid7_encodes_creation_time():
+    before = time.time()
+    value = uuid7()
+    assert before - 0.001 <= uuid7_time(value) <= time.time() + 0.001
+
+
+def test_login_history_uses_uuid7():
+    from models.user import LoginHistory, User
+
+    assert LoginHistory.__table__.c.id.default.arg.__name__ == 'uuid7'
+    assert User.__table__.c.id.default.arg.__name__ == 'uuid4'
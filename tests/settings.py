@@ -27,6 +27,9 @@ class TestSettings(BaseSettings):
 
     redis: Redis
     service_url: str = 'http://auth_service:8000'
+    grpc_address: str = 'auth_service:50051'
+    # Ключи сервисов для /auth/introspect, как у auth_service
+    introspect_service_tokens: list[str] = []
 
 
 test_settings = TestSettings()